@@ -0,0 +1,46 @@
+# bench/bench_decoders.py
+"""
+Micro-benchmark decoder JSON (core/decoders.py) pada payload chart-data.
+
+    python bench/bench_decoders.py --rows 50000 200000
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+from payloads import chart_payload_bytes
+from core.decoders import DECODERS, decode_json
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[50000, 200000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Decoder terpasang: {', '.join(DECODERS)}")
+    for rows in args.rows:
+        body = chart_payload_bytes(rows)
+        size_mb = len(body) / 1024 / 1024
+        # Jalur lama: response.json() = decode bytes ke str lalu json.loads
+        baseline = best_of(lambda: DECODERS["stdlib"](body.decode("utf-8")), args.repeat)
+        print(f"\n{rows} baris ({size_mb:.1f} MB)")
+        print(f"  {'str + json.loads (lama)':<26} {baseline * 1000:8.1f} ms  {size_mb / baseline:7.1f} MB/s")
+        for name in DECODERS:
+            elapsed = best_of(lambda: decode_json(body, name), args.repeat)
+            print(f"  {name:<26} {elapsed * 1000:8.1f} ms  {size_mb / elapsed:7.1f} MB/s  x{baseline / elapsed:.1f}")
+
+if __name__ == "__main__":
+    main()
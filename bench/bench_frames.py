@@ -0,0 +1,60 @@
+# bench/bench_frames.py
+"""
+Benchmark memori konversi hasil chart-data ke DataFrame (core/frames.py):
+pd.DataFrame(rows) lama dibandingkan build_frame dengan compact_dtypes.
+
+Payload (list of dict hasil decode JSON) dibuat sebelum pengukuran, sehingga yang
+terukur hanya alokasi selama konversi (puncak tracemalloc: objek Python dan array
+numpy) dan ukuran frame akhir (memory_usage(deep=True), termasuk kolom teks pyarrow).
+
+    python bench/bench_frames.py --rows 100000 500000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+from payloads import chart_result
+from core.frames import build_frame, storage_frame
+
+MODES = {
+    "pd.DataFrame (lama)": lambda result: build_frame(result, compact=False),
+    "compact_dtypes": lambda result: build_frame(result),
+    "compact_dtypes + parse_dates": lambda result: build_frame(result, parse_dates=True),
+}
+
+def measure(build, result):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    df = build(result)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, peak, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 500000])
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        result = chart_result(rows)
+        print(f"\n{rows} baris")
+        print(f"  {'mode':<30} {'puncak':>10} {'frame':>10} {'waktu':>9}  dtype parquet")
+        for label, build in MODES.items():
+            df, peak, elapsed = measure(build, result)
+            frame_mb = df.memory_usage(deep=True).sum() / 1024 / 1024
+            # Skema yang ditulis ke parquet harus sama untuk semua mode tanpa parse_dates
+            schema = ",".join(str(dtype) for dtype in storage_frame(df).dtypes)
+            print(f"  {label:<30} {peak / 1024 / 1024:8.1f} MB {frame_mb:8.1f} MB {elapsed * 1000:7.0f} ms  {schema}")
+            del df
+
+if __name__ == "__main__":
+    main()
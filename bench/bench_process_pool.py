@@ -0,0 +1,87 @@
+# bench/bench_process_pool.py
+"""
+Benchmark end-to-end: waktu satu run ekstraksi dengan process_workers = 0
+(decode + tulis CSV di thread I/O) dibandingkan dengan process pool.
+
+    python bench/bench_process_pool.py --reports 8 --rows 200000 --process-workers 0 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+from mock_server import serve
+
+def write_config(profile_dir, base_url, max_workers, process_workers):
+    with open(os.path.join(profile_dir, "config.ini"), "w", encoding="utf-8") as f:
+        f.write(
+            "[SETTINGS]\n"
+            f"output_dir = {os.path.join(profile_dir, 'output')}\n"
+            f"max_workers = {max_workers}\n"
+            f"process_workers = {process_workers}\n"
+            f"base_url = {base_url}\n"
+            f"state_dir = {os.path.join(profile_dir, '.state')}\n\n"
+            "[LOGIN]\nusername = bench\npassword = bench\n"
+        )
+
+def run_once(reports):
+    from PyQt6.QtCore import QCoreApplication
+    from gui.extractor import ExtractorWorker
+    from core.commands import CommandExecutor
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    output_dir = os.path.abspath("output")
+    os.makedirs(output_dir, exist_ok=True)
+    worker = ExtractorWorker(reports, output_dir, CommandExecutor())
+    errors = []
+    worker.signals.message.connect(lambda msg: errors.append(msg) if "Error" in msg or "ERROR" in msg else None)
+    started = time.perf_counter()
+    # run() dipanggil langsung (bukan lewat QThreadPool) agar waktu yang diukur = satu run penuh
+    worker.run()
+    elapsed = time.perf_counter() - started
+    app.processEvents()
+    return elapsed, errors
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reports", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--max-workers", type=int, default=8)
+    parser.add_argument("--process-workers", type=int, nargs="+", default=[0, os.cpu_count() or 2])
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    server = serve(rows=args.rows)
+    reports = {
+        f"bench_{i:02d}": {"request_url": "/api/v1/chart/data", "payload": {"queries": [{"row_limit": args.rows}]}}
+        for i in range(args.reports)
+    }
+    print(f"CPU: {os.cpu_count()} | {args.reports} report x {args.rows} baris | max_workers={args.max_workers}")
+
+    cwd = os.getcwd()
+    try:
+        for process_workers in args.process_workers:
+            with tempfile.TemporaryDirectory(prefix="linkdl-bench-") as profile_dir:
+                os.chdir(profile_dir)
+                write_config(profile_dir, server.base_url, args.max_workers, process_workers)
+                timings = []
+                for _ in range(args.repeat):
+                    elapsed, errors = run_once(reports)
+                    if errors:
+                        raise SystemExit(f"Run gagal: {errors[0]}")
+                    timings.append(elapsed)
+                os.chdir(cwd)
+            print(f"process_workers={process_workers:<3} terbaik {min(timings):7.2f} s  (semua: {', '.join(f'{t:.2f}' for t in timings)})")
+    finally:
+        os.chdir(cwd)
+        server.shutdown()
+
+if __name__ == "__main__":
+    from multiprocessing import freeze_support
+    freeze_support()
+    main()
@@ -0,0 +1,93 @@
+# bench/bench_rowdiff.py
+"""
+Benchmark file delta per baris (core/rowdiff.py): biaya tambahan di atas write_frame
+untuk menghitung insert/update/delete terhadap indeks run sebelumnya.
+
+Run pertama membangun indeks dari N baris. Run kedua menghapus 1% baris pertama,
+mengubah 1% baris, dan menambah 1% baris baru, lalu diukur:
+
+- write_frame saja  : menulis CSV output seperti tanpa diff
+- delta + indeks    : write_delta ke file delta lalu commit indeks baru
+- puncak delta      : puncak tracemalloc selama delta + indeks, diukur pada ulangan
+                      terpisah karena tracemalloc memperlambat (objek Python dan array
+                      numpy; indeks lama dibaca memory-mapped per chunk dan tidak terhitung)
+
+    python bench/bench_rowdiff.py --rows 1000000 3000000
+"""
+import argparse
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+import pandas as pd
+
+from payloads import chart_result
+from core.frames import build_frame
+from core.output import write_frame
+from core.rowdiff import RowDiff
+from core.tee import TeeOutput
+
+KEY = ["order_date"] # Unik per baris di payload benchmark
+
+def next_run(df):
+    """Hasil run berikutnya: 1% baris lama hilang, 1% berubah, 1% baris baru."""
+    step = max(1, len(df) // 100)
+    df = df.iloc[step:].copy()
+    df.iloc[::100, df.columns.get_loc("qty")] += 1
+    added = df.iloc[-step:].copy()
+    added["order_date"] += int(df["order_date"].max()) + 60000
+    return pd.concat([df, added], ignore_index=True)
+
+def delta(df, state_dir, path):
+    row_diff = RowDiff(state_dir, "bench", KEY)
+    with TeeOutput(path) as out:
+        row_diff.write_delta(df, out)
+    row_diff.commit()
+    return row_diff
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000000, 3000000])
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        first = build_frame(chart_result(rows))
+        second = next_run(first)
+        with tempfile.TemporaryDirectory() as workdir:
+            state_dir = os.path.join(workdir, ".state")
+            delta(first, state_dir, os.path.join(workdir, "first.delta.csv"))
+            del first
+            # Indeks run pertama disalin untuk ulangan pengukuran memori
+            shutil.copytree(state_dir, os.path.join(workdir, ".state-peak"))
+
+            started = time.perf_counter()
+            write_frame(second, os.path.join(workdir, "report.csv"))
+            write_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            row_diff = delta(second, state_dir, os.path.join(workdir, "report.delta.csv"))
+            delta_seconds = time.perf_counter() - started
+
+            gc.collect()
+            tracemalloc.start()
+            delta(second, os.path.join(workdir, ".state-peak"), os.path.join(workdir, "peak.delta.csv"))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            index_mb = sum(os.path.getsize(os.path.join(state_dir, "row_index", f)) for f in os.listdir(os.path.join(state_dir, "row_index"))) / 1024 / 1024
+            frame_mb = second.memory_usage(deep=True).sum() / 1024 / 1024
+        print(f"\n{rows} baris (frame {frame_mb:.0f} MB)")
+        print(f"  write_frame saja  {write_seconds * 1000:8.0f} ms")
+        print(f"  delta + indeks    {delta_seconds * 1000:8.0f} ms  ({row_diff.inserted} baru, {row_diff.updated} berubah, {row_diff.deleted} dihapus)")
+        print(f"  puncak delta      {peak / 1024 / 1024:8.1f} MB  ({peak / rows:.0f} bytes/baris; indeks di disk {index_mb:.1f} MB)")
+
+if __name__ == "__main__":
+    main()
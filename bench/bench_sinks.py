@@ -0,0 +1,98 @@
+# bench/bench_sinks.py
+"""
+Benchmark throughput sink database (core/sinks.py) dibandingkan alur lama
+"tulis CSV lalu impor ke database" yang dijalankan job downstream.
+
+Semua mode mulai dari hasil chart-data yang sudah di-decode (list of dict), dan
+diakhiri dengan tabel report yang sudah terisi di database:
+
+- CSV lalu impor (csv)    : write_frame CSV, lalu csv.reader + executemany ke SQLite
+- CSV lalu impor (pandas) : write_frame CSV, lalu pd.read_csv + to_sql ke SQLite
+- CSV + sink SQLite       : write_frame CSV dan SQLiteSink.write_frame dari DataFrame yang sama
+- sink SQLite saja        : hanya SQLiteSink.write_frame
+- sink DuckDB saja        : hanya DuckDBSink.write_frame (jika paket duckdb terpasang)
+
+    python bench/bench_sinks.py --rows 100000 500000
+"""
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+import pandas as pd
+
+from payloads import chart_result
+from core.frames import build_frame
+from core.output import write_frame
+from core.sinks import SQLiteSink, DuckDBSink, duckdb
+
+TABLE = "Fact Sales"
+
+def csv_then_import_csv(result, workdir):
+    csv_path = os.path.join(workdir, "report.csv")
+    write_frame(build_frame(result), csv_path)
+    conn = sqlite3.connect(os.path.join(workdir, "import_csv.db"))
+    with open(csv_path, "r", encoding="utf-8", newline="") as f, conn:
+        reader = csv.reader(f)
+        header = next(reader)
+        conn.execute(f'DROP TABLE IF EXISTS "{TABLE}"')
+        conn.execute(f'CREATE TABLE "{TABLE}" ({", ".join(f"{column!r} TEXT" for column in header)})')
+        conn.executemany(f'INSERT INTO "{TABLE}" VALUES ({", ".join("?" * len(header))})', reader)
+    conn.close()
+
+def csv_then_import_pandas(result, workdir):
+    csv_path = os.path.join(workdir, "report.csv")
+    write_frame(build_frame(result), csv_path)
+    conn = sqlite3.connect(os.path.join(workdir, "import_pandas.db"))
+    pd.read_csv(csv_path).to_sql(TABLE, conn, if_exists="replace", index=False, chunksize=10000)
+    conn.close()
+
+def csv_and_sqlite_sink(result, workdir):
+    df = build_frame(result)
+    write_frame(df, os.path.join(workdir, "report.csv"))
+    SQLiteSink(os.path.join(workdir, "sink_csv.db")).write_frame(TABLE, df)
+
+def sqlite_sink(result, workdir):
+    SQLiteSink(os.path.join(workdir, "sink.db")).write_frame(TABLE, build_frame(result))
+
+def duckdb_sink(result, workdir):
+    DuckDBSink(os.path.join(workdir, "sink.duckdb")).write_frame(TABLE, build_frame(result))
+
+MODES = {
+    "CSV lalu impor (csv)": csv_then_import_csv,
+    "CSV lalu impor (pandas)": csv_then_import_pandas,
+    "CSV + sink SQLite": csv_and_sqlite_sink,
+    "sink SQLite saja": sqlite_sink,
+}
+if duckdb is not None:
+    MODES["sink DuckDB saja"] = duckdb_sink
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 500000])
+    parser.add_argument("--repeat", type=int, default=2, help="ambil waktu terbaik dari beberapa ulangan")
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        result = chart_result(rows)
+        print(f"\n{rows} baris")
+        print(f"  {'mode':<26} {'waktu':>9} {'baris/detik':>13}")
+        for label, load in MODES.items():
+            best = None
+            for _ in range(args.repeat):
+                with tempfile.TemporaryDirectory() as workdir:
+                    started = time.perf_counter()
+                    load(result, workdir)
+                    elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"  {label:<26} {best * 1000:7.0f} ms {rows / best:13,.0f}")
+
+if __name__ == "__main__":
+    main()
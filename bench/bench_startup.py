@@ -0,0 +1,93 @@
+# bench/bench_startup.py
+"""
+Benchmark startup dengan `python -X importtime`, plus budget regresi.
+
+Dua fase diukur di proses baru masing-masing:
+  lock    - `import main`: semua yang dimuat sebelum pengecekan single-instance lock
+  window  - main + gui.view + gui.controller: siap menampilkan jendela utama
+
+Skrip keluar dengan kode 1 jika waktu import melebihi budget atau jika modul berat
+(pandas, dialog, dst.) ikut dimuat di fase yang seharusnya tidak membutuhkannya.
+
+    python bench/bench_startup.py
+    python bench/bench_startup.py --repeat 5 --lock-budget-ms 300 --window-budget-ms 1200
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PHASES = {
+    "lock": "import main",
+    "window": "import main, gui.view, gui.controller",
+}
+
+# Modul yang tidak boleh dimuat pada fase tersebut (di-import lazy di tempat dipakai)
+FORBIDDEN = {
+    "lock": ("requests", "pandas", "gui.view", "gui.controller", "gui.dialogs", "core.commands"),
+    "window": ("pandas", "pyarrow", "gui.dialogs", "core.frames", "core.sinks", "core.rowdiff"),
+}
+
+DEFAULT_BUDGET_MS = {"lock": 400, "window": 1500}
+
+def measure(statement):
+    """Jalankan statement di interpreter baru; kembalikan (total_ms, {modul: (self_us, cumulative_us)})."""
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Gagal menjalankan '{statement}':\n{result.stderr[-2000:]}")
+
+    modules = {}
+    top_level_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # Modul level teratas ditulis dengan satu spasi indentasi, modul bersarang lebih dalam
+        if not name.startswith("  "):
+            top_level_us += int(cumulative_us)
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return top_level_us / 1000, modules
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--lock-budget-ms", type=float, default=DEFAULT_BUDGET_MS["lock"])
+    parser.add_argument("--window-budget-ms", type=float, default=DEFAULT_BUDGET_MS["window"])
+    args = parser.parse_args()
+    budgets = {"lock": args.lock_budget_ms, "window": args.window_budget_ms}
+
+    failures = []
+    for phase, statement in PHASES.items():
+        # Run pertama memanaskan cache .pyc dan disk; hasil terbaik dari --repeat run berikutnya dipakai
+        measure(statement)
+        runs = [measure(statement) for _ in range(args.repeat)]
+        total_ms, modules = min(runs, key=lambda run: run[0])
+
+        print(f"\n[{phase}] {statement}")
+        print(f"  total import: {total_ms:.0f} ms (budget {budgets[phase]:.0f} ms), {len(modules)} modul")
+        print(f"  {args.top} modul dengan self time terbesar:")
+        for name, (self_us, cumulative_us) in sorted(modules.items(), key=lambda item: -item[1][0])[:args.top]:
+            print(f"    {self_us / 1000:7.1f} ms  (kumulatif {cumulative_us / 1000:7.1f} ms)  {name}")
+
+        if total_ms > budgets[phase]:
+            failures.append(f"[{phase}] {total_ms:.0f} ms melebihi budget {budgets[phase]:.0f} ms")
+        for name in FORBIDDEN[phase]:
+            if name in modules:
+                failures.append(f"[{phase}] modul '{name}' dimuat saat startup")
+
+    if failures:
+        print("\nREGRESI:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nOK: semua fase dalam budget.")
+
+if __name__ == "__main__":
+    main()
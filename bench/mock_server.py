@@ -0,0 +1,180 @@
+# bench/mock_server.py
+"""
+Server tiruan Superset untuk benchmark lokal.
+
+Melayani /api/v1/security/csrf_token/, /login/, POST /api/v1/chart/data dan
+GET *.csv. Body dibuat sekali per ukuran lalu di-cache, sehingga yang diukur
+adalah sisi klien, bukan pembuatan payload.
+
+Dengan --auth, server memeriksa cookie session dan header X-CSRFToken seperti
+Superset (401 jika session tidak ada/kedaluwarsa, 400 jika token CSRF tidak cocok),
+dan --session-ttl membuat session login kedaluwarsa setelah sekian detik.
+
+    python bench/mock_server.py --port 8765 --rows 200000
+"""
+import argparse
+import itertools
+import os
+import sys
+import threading
+import time
+import urllib.parse
+from http.cookies import SimpleCookie
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import json
+from payloads import chart_result, csv_bytes
+
+class MockSuperset(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, rows=100000, csv_rows=100000, csv_charset=None, latency=0.0,
+                 csv_content_type="text/csv", auth=False, session_ttl=None):
+        super().__init__(address, MockHandler)
+        self.rows = rows
+        self.csv_rows = csv_rows
+        self.csv_charset = csv_charset
+        self.latency = latency
+        self.csv_content_type = csv_content_type
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self.cached_queries = set() # Query yang sudah pernah dihitung (cache hasil tiruan)
+        self.auth = auth
+        self.session_ttl = session_ttl
+        self.sessions = {} # cookie session -> {"token", "login", "expires"}
+        self._ids = itertools.count(1)
+        self.stats = {"logins": 0, "expired": 0, "csrf_mismatch": 0, "authorized": 0}
+
+    def new_session(self, token, login):
+        with self._lock:
+            session_id = f"s{next(self._ids)}"
+            expires = time.monotonic() + self.session_ttl if login and self.session_ttl else None
+            self.sessions[session_id] = {"token": token, "login": login, "expires": expires}
+            if login:
+                self.stats["logins"] += 1
+            return session_id
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def body(self, key, factory):
+        with self._lock:
+            if key not in self._bodies:
+                self._bodies[key] = factory()
+            return self._bodies[key]
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body, content_type="application/json", status=200, cookie=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if cookie:
+            self.send_header("Set-Cookie", f"session={cookie}; Path=/; HttpOnly")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _session(self):
+        cookie = SimpleCookie(self.headers.get("Cookie") or "").get("session")
+        return self.server.sessions.get(cookie.value) if cookie else None
+
+    def _authorized(self):
+        """Dalam mode --auth: periksa session login dan token CSRF; jika gagal, error sudah dikirim."""
+        if not self.server.auth:
+            return True
+        session = self._session()
+        if session is None or not session["login"] or (session["expires"] and time.monotonic() > session["expires"]):
+            self.server.count("expired")
+            self._send(b'{"msg": "Token has expired"}', status=401)
+            return False
+        if self.command == "POST" and self.headers.get("X-CSRFToken") != session["token"]:
+            self.server.count("csrf_mismatch")
+            self._send(b'{"errors": [{"message": "400 Bad Request: The CSRF token is invalid."}]}', status=400)
+            return False
+        self.server.count("authorized")
+        return True
+
+    def do_GET(self):
+        if self.path.startswith("/api/v1/security/csrf_token/"):
+            if not self.server.auth:
+                return self._send(b'{"result": "bench-token"}')
+            token = f"token-{next(self.server._ids)}"
+            cookie = self.server.new_session(token, login=False)
+            return self._send(json.dumps({"result": token}).encode("utf-8"), cookie=cookie)
+        if not self._authorized():
+            return
+        if self.path.lower().endswith(".csv"):
+            charset = self.server.csv_charset
+            body = self.server.body(("csv", charset), lambda: csv_bytes(self.server.csv_rows, charset or "utf-8"))
+            # Tanpa charset dan tanpa tipe text/*, requests menebak encoding dari seluruh body
+            # (apparent_encoding) saat response.text dipanggil
+            content_type = self.server.csv_content_type
+            if charset:
+                content_type = f"{content_type}; charset={charset}"
+            return self._send(body, content_type)
+        self._send(b"{}", status=404)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path.startswith("/login/"):
+            if not self.server.auth:
+                return self._send(b"ok", "text/html")
+            # Seperti Flask-WTF: token di form dan header harus cocok dengan token milik session
+            session = self._session()
+            form = urllib.parse.parse_qs(body.decode("utf-8"))
+            token = session["token"] if session else None
+            if token is None or form.get("csrf_token") != [token] or self.headers.get("X-CSRFToken") != token:
+                self.server.count("csrf_mismatch")
+                return self._send(b"The CSRF token is invalid.", "text/html", status=400)
+            return self._send(b"ok", "text/html", cookie=self.server.new_session(token, login=True))
+        if not self._authorized():
+            return
+        if self.path.startswith("/api/v1/chart/data"):
+            if self.server.latency:
+                time.sleep(self.server.latency)
+            # Satu elemen `result` per entri `queries`, seperti Superset
+            try:
+                queries = [json.dumps(query, sort_keys=True) for query in json.loads(body).get("queries") or [{}]]
+            except (ValueError, AttributeError):
+                queries = ["{}"]
+            results = []
+            for query in queries:
+                with self.server._lock:
+                    cached = query in self.server.cached_queries
+                    self.server.cached_queries.add(query)
+                results.append(self.server.body(("chart", cached), lambda: json.dumps(
+                    {**chart_result(self.server.rows), "is_cached": cached}).encode("utf-8")))
+            return self._send(b'{"result": [' + b", ".join(results) + b"]}")
+        self._send(b"{}", status=404)
+
+def serve(port=0, **kwargs):
+    """Jalankan server di thread background; kembalikan objek server (hentikan dengan shutdown())."""
+    server = MockSuperset(("127.0.0.1", port), **kwargs)
+    threading.Thread(target=server.serve_forever, name="mock-superset", daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--csv-rows", type=int, default=100000)
+    parser.add_argument("--csv-charset", default=None)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--csv-content-type", default="text/csv")
+    parser.add_argument("--auth", action="store_true", help="wajibkan cookie session dan header X-CSRFToken")
+    parser.add_argument("--session-ttl", type=float, default=None, help="detik sampai session login kedaluwarsa")
+    args = parser.parse_args()
+    server = MockSuperset(("127.0.0.1", args.port), args.rows, args.csv_rows, args.csv_charset, args.latency,
+                          args.csv_content_type, args.auth, args.session_ttl)
+    print(f"Mock Superset berjalan di {server.base_url}")
+    server.serve_forever()
@@ -0,0 +1,65 @@
+# bench/payloads.py
+import json
+import random
+
+# Kolom mengikuti bentuk hasil /api/v1/chart/data Superset (coltypes: 0=numeric, 1=string, 2=temporal)
+COLUMNS = [
+    ("order_date", 2),
+    ("region", 1),
+    ("branch", 1),
+    ("product", 1),
+    ("customer_id", 1),
+    ("qty", 0),
+    ("price", 0),
+    ("amount", 0),
+    ("note", 1),
+]
+
+REGIONS = ["Jawa", "Sumatra", "Kalimantan", "Sulawesi", "Bali", "Papua"]
+
+def chart_rows(rows, seed=1):
+    rng = random.Random(seed)
+    branches = [f"Cabang {i:03d}" for i in range(120)]
+    products = [f"Produk {i:04d}" for i in range(2500)]
+    data = []
+    for i in range(rows):
+        qty = rng.randint(1, 400)
+        price = rng.choice([1500.0, 2750.0, 12500.0, 99000.0, 125.5])
+        data.append({
+            "order_date": 1704067200000 + i * 60000,
+            "region": rng.choice(REGIONS),
+            "branch": rng.choice(branches),
+            "product": rng.choice(products),
+            "customer_id": f"C{rng.randint(0, 99999):07d}",
+            "qty": qty,
+            "price": price,
+            "amount": qty * price,
+            "note": f"order {i} / ref {rng.getrandbits(32):08x}",
+        })
+    return data
+
+def chart_result(rows, seed=1):
+    """Satu elemen `result` chart-data (data + colnames + coltypes)."""
+    data = chart_rows(rows, seed)
+    return {
+        "data": data,
+        "colnames": [name for name, _ in COLUMNS],
+        "coltypes": [coltype for _, coltype in COLUMNS],
+        "rowcount": len(data),
+        "is_cached": False,
+    }
+
+def chart_payload(rows, seed=1):
+    return {"result": [chart_result(rows, seed)]}
+
+def chart_payload_bytes(rows, seed=1):
+    return json.dumps(chart_payload(rows, seed)).encode("utf-8")
+
+def csv_bytes(rows, encoding="utf-8", seed=1):
+    """Body CSV dengan teks non-ASCII (nama kota/pelanggan) untuk jalur CSV langsung."""
+    rng = random.Random(seed)
+    names = ["Pâtisserie Müller", "Café Señor", "Tōkyō Ramen", "Łódź Trading", "Ñandú Kopi", "Søren & Zoë"]
+    lines = ["id,tanggal,pelanggan,kota,jumlah"]
+    for i in range(rows):
+        lines.append(f"{i},2024-01-{i % 28 + 1:02d},{rng.choice(names)},Bandung – Jawa Barat,{rng.randint(1, 999)}")
+    return ("\n".join(lines) + "\n").encode(encoding, errors="replace")
@@ -0,0 +1,90 @@
+# bench/profile_csv_passthrough.py
+"""
+Profil CPU unduhan CSV langsung: jalur lama (response.text lalu tulis ulang sebagai UTF-8)
+dibandingkan jalur byte passthrough (FetchReportCommand + SaveReportCommand).
+
+File CSV berisi teks non-ASCII dan dikirim tanpa charset dengan Content-Type
+application/octet-stream, sehingga jalur lama menjalankan deteksi encoding
+(apparent_encoding) di seluruh body.
+
+    python bench/profile_csv_passthrough.py --rows 300000
+    python bench/profile_csv_passthrough.py --rows 300000 --charset cp1252 --encoding cp1252
+"""
+import argparse
+import cProfile
+import io
+import os
+import pstats
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+from mock_server import serve
+
+def old_path(url, output_dir):
+    import requests
+    response = requests.get(url)
+    # Sama dengan kode sebelum byte passthrough: response.text lalu ditulis sebagai UTF-8
+    with open(os.path.join(output_dir, "old.csv"), "w", encoding="utf-8") as f:
+        f.write(response.text)
+
+def new_path(url, output_dir, encoding):
+    from core.commands import CommandExecutor, FetchReportCommand, SaveReportCommand
+    executor = CommandExecutor()
+    data = executor.execute_command(FetchReportCommand(), "new", url, {}, encoding=encoding)
+    executor.execute_command(SaveReportCommand(), "new", data)
+
+def profile(label, func, top):
+    profiler = cProfile.Profile()
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    profiler.runcall(func)
+    cpu = time.process_time() - cpu_started
+    wall = time.perf_counter() - wall_started
+    print(f"\n== {label}: CPU {cpu:.2f} s, wall {wall:.2f} s")
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats("tottime").print_stats(top)
+    # Lewati ringkasan pstats, tampilkan tabel fungsi mulai dari header "ncalls"
+    report = stream.getvalue()
+    print(report[report.find("   ncalls"):].rstrip())
+    return cpu
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=300000)
+    parser.add_argument("--charset", default=None, help="encoding body di server (default utf-8, tidak dideklarasikan)")
+    parser.add_argument("--encoding", default=None, help="`encoding` report untuk jalur baru")
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    from payloads import csv_bytes
+    server = serve(csv_rows=args.rows, csv_charset=None, csv_content_type="application/octet-stream")
+    # Body dibuat di muka; dengan --charset body di-encode dengan charset itu tetapi tetap tidak dideklarasikan
+    body = server.body(("csv", None), lambda: csv_bytes(args.rows, args.charset or "utf-8"))
+    # Import dilakukan sebelum profiling agar yang terukur hanya unduh + tulis
+    import requests
+    import core.commands
+    url = f"{server.base_url}/export/bench.csv"
+
+    cwd = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory(prefix="linkdl-bench-") as work_dir:
+            os.chdir(work_dir)
+            with open("config.ini", "w", encoding="utf-8") as f:
+                f.write(f"[SETTINGS]\noutput_dir = {work_dir}\nbase_url = {server.base_url}\n")
+            size_mb = len(body) / 1024 / 1024
+            print(f"CSV {args.rows} baris, {size_mb:.1f} MB, tanpa charset di header")
+            old_cpu = profile("lama: response.text + tulis UTF-8", lambda: old_path(url, work_dir), args.top)
+            new_cpu = profile("baru: byte passthrough" + (f" + transcode {args.encoding}" if args.encoding else ""),
+                              lambda: new_path(url, work_dir, args.encoding), args.top)
+            print(f"\nCPU dihemat: {old_cpu - new_cpu:.2f} s ({(1 - new_cpu / old_cpu) * 100:.0f}%)")
+    finally:
+        os.chdir(cwd)
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
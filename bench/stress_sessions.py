@@ -0,0 +1,80 @@
+# bench/stress_sessions.py
+"""
+Uji beban session per thread (core/sessions.py) terhadap mock server dengan --auth.
+
+Banyak thread mengirim POST chart-data lewat satu CommandExecutor bersamaan, sementara
+session login di server kedaluwarsa setiap --session-ttl detik. Setiap request harus
+berhasil: cookie session dan header X-CSRFToken tidak boleh tertukar antar thread, dan
+login ulang harus terjadi satu kali per kedaluwarsa, bukan sekali per thread.
+Keluar dengan kode 1 jika ada request gagal.
+
+    python bench/stress_sessions.py --threads 64 --requests 200 --session-ttl 5
+"""
+import argparse
+import concurrent.futures
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+from mock_server import serve
+
+PAYLOAD = {"queries": [{"columns": ["id"], "row_limit": 10}]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=200, help="request per thread")
+    parser.add_argument("--rows", type=int, default=50, help="baris per response chart-data")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--session-ttl", type=float, default=5.0, help="harus jauh lebih lama dari satu request (termasuk login ulang) di bawah beban")
+    args = parser.parse_args()
+
+    server = serve(rows=args.rows, latency=args.latency, auth=True, session_ttl=args.session_ttl)
+    # CommandExecutor membaca config.ini dari folder kerja
+    os.chdir(tempfile.mkdtemp(prefix="linkdl-stress-"))
+    with open("config.ini", "w", encoding="utf-8") as f:
+        f.write(f"[SETTINGS]\nbase_url = {server.base_url}\n")
+
+    from core.commands import CommandExecutor, FetchCSRFTokenCommand, LoginCommand, _json_headers
+
+    executor = CommandExecutor()
+    executor.execute_command(FetchCSRFTokenCommand())
+    executor.execute_command(LoginCommand(), "bench", "bench")
+    url = f"{server.base_url}/api/v1/chart/data"
+
+    def hammer(_):
+        failures = []
+        for _ in range(args.requests):
+            try:
+                response = executor.request("POST", url, json=PAYLOAD, headers=_json_headers(executor))
+                if response.status_code != 200 or not response.json().get("result"):
+                    failures.append(f"HTTP {response.status_code}")
+            except Exception as e:
+                failures.append(str(e))
+        return failures
+
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.threads) as pool:
+        failures = [failure for result in pool.map(hammer, range(args.threads)) for failure in result]
+    elapsed = time.perf_counter() - started
+    executor.sessions.close()
+    server.shutdown()
+
+    total = args.threads * args.requests
+    stats = server.stats
+    print(f"{args.threads} thread x {args.requests} request = {total} request dalam {elapsed:.2f} s ({total / elapsed:,.0f} request/detik)")
+    print(f"  gagal di klien     : {len(failures)}")
+    print(f"  login              : {stats['logins']} (termasuk login awal; {elapsed / args.session_ttl:.0f} periode TTL)")
+    print(f"  401 session habis  : {stats['expired']} (dikirim ulang setelah login ulang)")
+    print(f"  400 token CSRF     : {stats['csrf_mismatch']}")
+    for failure in sorted(set(failures))[:10]:
+        print(f"  - {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
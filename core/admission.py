@@ -0,0 +1,166 @@
+# core/admission.py
+import json
+import os
+import threading
+import time
+
+from core.commands import CHUNK_SIZE, is_direct_csv_url
+
+# Perkiraan ukuran body report yang belum pernah tercatat dan belum ada Content-Length
+DEFAULT_REPORT_BYTES = 8 * 1024 * 1024
+
+# CSV langsung dialirkan ke disk per chunk, memorinya tidak bergantung ukuran file
+STREAMING_BYTES = 4 * CHUNK_SIZE
+
+# Report yang menunggu lebih lama dari ini tidak lagi boleh didahului report yang lebih kecil
+STARVATION_SECONDS = 30.0
+
+class Reservation:
+    """Jatah memori satu report yang sedang berjalan; bisa diperbarui saat ukuran sebenarnya diketahui."""
+    def __init__(self, budget, name, nbytes):
+        self.budget = budget
+        self.name = name
+        self.nbytes = nbytes
+
+    def update(self, nbytes):
+        """
+        Sesuaikan jatah dengan ukuran sebenarnya (mis. dari Content-Length). Tidak pernah
+        memblokir: jika jatah naik melewati budget, report baru yang menunggu sampai cukup.
+        """
+        self.budget._resize(self, nbytes)
+
+class MemoryBudget:
+    """
+    Admission control berdasarkan perkiraan memori report yang sedang berjalan.
+
+    Report boleh mulai jika total jatah yang sedang dipakai + perkiraannya <= `limit_bytes`,
+    sehingga banyak report kecil berjalan paralel sementara report besar tidak berjalan
+    bersamaan sampai kehabisan RAM. Report yang lebih besar dari budget tetap dijalankan
+    jika tidak ada report lain yang berjalan. Report kecil boleh mendahului report besar
+    yang menunggu, kecuali report besar itu sudah menunggu lebih dari STARVATION_SECONDS.
+    Report yang belum muat mengantre di sini (admit), bukan di thread worker: thread pool
+    hanya menerima report yang jatahnya sudah diberikan.
+
+    Perkiraan memori = ukuran body (Content-Length, atau ukuran run sebelumnya dari
+    `sizes`) x `factor`, karena JSON yang sudah di-decode dan DataFrame-nya jauh lebih
+    besar dari bytes yang diterima.
+    """
+    def __init__(self, limit_bytes, sizes=None, factor=8.0, clock=time.monotonic):
+        self.limit_bytes = limit_bytes
+        self.sizes = sizes
+        self.factor = factor
+        self.clock = clock
+        self.in_use = 0
+        self.running = 0
+        # Report yang belum muat: (waktu mulai menunggu, id unik, nama, nbytes, start) urut kedatangan
+        self._waiting = []
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def estimate(self, name, url, nbytes=None):
+        """Perkiraan memori report; tanpa `nbytes`, dari ukuran run sebelumnya."""
+        if is_direct_csv_url(url):
+            return STREAMING_BYTES
+        if not nbytes and self.sizes is not None:
+            nbytes = self.sizes.get(name)
+        return int((nbytes or DEFAULT_REPORT_BYTES) * self.factor)
+
+    def record(self, name, nbytes):
+        """Simpan ukuran body yang benar-benar diterima untuk perkiraan run berikutnya."""
+        if self.sizes is not None and nbytes:
+            self.sizes.set(name, nbytes)
+
+    def _may_start(self, ticket, nbytes):
+        if self.running == 0:
+            return True
+        if self.in_use + nbytes > self.limit_bytes:
+            return False
+        oldest_since, oldest = self._waiting[0][:2]
+        return oldest == ticket or self.clock() - oldest_since < STARVATION_SECONDS
+
+    def _drain(self):
+        """Keluarkan report antrean yang kini muat, urut kedatangan. Dipanggil di bawah lock."""
+        ready = []
+        for entry in list(self._waiting):
+            _, ticket, name, nbytes, start = entry
+            if self._may_start(ticket, nbytes):
+                self._waiting.remove(entry)
+                self.in_use += nbytes
+                self.running += 1
+                ready.append((start, Reservation(self, name, nbytes)))
+        return ready
+
+    @staticmethod
+    def _start(ready):
+        # Di luar lock: start() boleh langsung memakai budget lagi (mis. submit ke thread pool)
+        for start, reservation in ready:
+            start(reservation)
+
+    def admit(self, name, nbytes, start, on_wait=None):
+        """
+        Panggil `start(reservation)` begitu jatah `nbytes` muat, tanpa memblokir pemanggil:
+        langsung di thread pemanggil jika muat sekarang, selain itu dari thread yang nanti
+        melepas atau memperkecil jatahnya. `on_wait()` dipanggil jika report harus mengantre.
+        Jatah dilepas dengan release(reservation).
+        """
+        with self._lock:
+            self._counter += 1
+            ticket = self._counter
+            self._waiting.append((self.clock(), ticket, name, nbytes, start))
+            ready = self._drain()
+            queued = any(entry[1] == ticket for entry in self._waiting)
+        if queued and on_wait is not None:
+            on_wait()
+        self._start(ready)
+
+    def _resize(self, reservation, nbytes):
+        with self._lock:
+            self.in_use += nbytes - reservation.nbytes
+            reservation.nbytes = nbytes
+            ready = self._drain()
+        self._start(ready)
+
+    def release(self, reservation):
+        with self._lock:
+            self.in_use -= reservation.nbytes
+            self.running -= 1
+            reservation.nbytes = 0
+            ready = self._drain()
+        self._start(ready)
+
+class SizeHistory:
+    """Ukuran body (bytes) run terakhir per report, untuk perkiraan sebelum Content-Length diketahui."""
+    def __init__(self, path):
+        self.path = path
+        self._sizes = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._sizes = {name: int(size) for name, size in json.load(f).items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            print(f"[WARNING] Riwayat ukuran report tidak bisa dibaca ({path}): {e}")
+
+    def get(self, name):
+        with self._lock:
+            return self._sizes.get(name)
+
+    def set(self, name, nbytes):
+        with self._lock:
+            if self._sizes.get(name) != nbytes:
+                self._sizes[name] = nbytes
+                self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            sizes = dict(self._sizes)
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(sizes, f)
+        os.replace(tmp_path, self.path)
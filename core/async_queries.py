@@ -0,0 +1,104 @@
+# core/async_queries.py
+import threading
+import time
+
+ASYNC_EVENT_PATH = "/api/v1/async_event/"
+
+# Status job Superset yang menandakan job sudah selesai (berhasil atau gagal)
+DONE_STATUSES = ("done", "error")
+
+# Batas event job yang datang sebelum sempat didaftarkan lewat watch()
+MAX_UNCLAIMED_EVENTS = 1000
+
+class AsyncQueryPoller:
+    """
+    Memantau job query async Superset lewat endpoint /api/v1/async_event/.
+
+    watch(job_id, callback) mendaftarkan job; callback(event) dipanggil dari thread
+    poller sekali saat job berstatus done/error, atau dengan status "timeout" jika job
+    tidak selesai dalam `timeout_seconds`. Event dibaca berurutan memakai last_id,
+    sehingga setiap polling hanya mengambil event baru.
+    """
+    def __init__(self, executor, poll_seconds=1.0, timeout_seconds=1800, clock=time.monotonic):
+        self.executor = executor
+        self.poll_seconds = poll_seconds
+        self.timeout_seconds = timeout_seconds
+        self.clock = clock
+        self.last_id = None
+        self.last_error = None
+        self._jobs = {}
+        self._unclaimed = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def pending(self):
+        with self._lock:
+            return len(self._jobs)
+
+    def watch(self, job_id, callback):
+        with self._lock:
+            event = self._unclaimed.pop(job_id, None)
+            if event is None:
+                self._jobs[job_id] = (callback, self.clock())
+        if event is not None:
+            callback(event)
+        self._wake.set()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="async-query-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            if self.pending():
+                try:
+                    self.poll_once()
+                    self.last_error = None
+                except Exception as e:
+                    # Gangguan sementara (jaringan, breaker terbuka): coba lagi di polling berikutnya
+                    self.last_error = e
+                self._expire()
+                self._stopped.wait(self.poll_seconds)
+            else:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+
+    def poll_once(self):
+        params = {"last_id": self.last_id} if self.last_id else None
+        response = self.executor.request("GET", f"{self.executor.base_url}{ASYNC_EVENT_PATH}", params=params)
+        response.raise_for_status()
+        for event in response.json().get("result", []):
+            self.last_id = event.get("id", self.last_id)
+            if event.get("status") in DONE_STATUSES:
+                self._dispatch(event)
+
+    def _dispatch(self, event):
+        job_id = event.get("job_id")
+        with self._lock:
+            entry = self._jobs.pop(job_id, None)
+            if entry is None:
+                # Job belum didaftarkan (atau milik sesi lain); simpan sebentar untuk watch() berikutnya
+                if len(self._unclaimed) < MAX_UNCLAIMED_EVENTS:
+                    self._unclaimed[job_id] = event
+                return
+        entry[0](event)
+
+    def _expire(self):
+        now = self.clock()
+        with self._lock:
+            expired = [job_id for job_id, (_, started) in self._jobs.items() if now - started >= self.timeout_seconds]
+            callbacks = [(job_id, self._jobs.pop(job_id)[0]) for job_id in expired]
+        for job_id, callback in callbacks:
+            callback({
+                "job_id": job_id,
+                "status": "timeout",
+                "errors": [{"message": f"Query async tidak selesai dalam {self.timeout_seconds} detik"}],
+            })
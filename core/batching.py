@@ -0,0 +1,71 @@
+# core/batching.py
+import json
+
+from core.commands import is_direct_csv_url
+
+# Format hasil yang bisa dipecah kembali per query (CSV/XLSX multi-query dikirim server sebagai zip)
+SPLITTABLE_FORMATS = (None, "json")
+
+def batch_key(info):
+    """
+    Kunci pengelompokan report: report dengan kunci sama bisa digabung menjadi satu
+    request chart-data dengan beberapa entri `queries`. None jika report tidak bisa digabung.
+
+    Semua bagian payload selain `queries` (datasource, result_format, result_type, force,
+    form_data, ...) harus identik, karena hanya daftar query yang bisa berbeda per report.
+    """
+    url = info.get("request_url") or ""
+    payload = info.get("payload")
+    if is_direct_csv_url(url) or not isinstance(payload, dict):
+        return None
+    queries = payload.get("queries")
+    if not isinstance(queries, list) or not queries or not payload.get("datasource"):
+        return None
+    if payload.get("result_format") not in SPLITTABLE_FORMATS:
+        return None
+    shared = {key: value for key, value in payload.items() if key != "queries"}
+    return url, json.dumps(shared, sort_keys=True)
+
+def plan_batches(reports, max_queries=10):
+    """
+    Kelompokkan report (nama -> definisi) per datasource. Mengembalikan list grup nama;
+    grup berisi satu nama berarti report diambil sendiri seperti biasa. Satu grup memuat
+    paling banyak `max_queries` query. Urutan report dipertahankan.
+    """
+    groups = {}
+    plan = []
+    for name, info in reports.items():
+        key = batch_key(info)
+        if key is None:
+            plan.append([name])
+            continue
+        size = len(info["payload"]["queries"])
+        group = groups.get(key)
+        if group is None or group["size"] + size > max_queries:
+            group = groups[key] = {"names": [], "size": 0}
+            plan.append(group["names"])
+        group["names"].append(name)
+        group["size"] += size
+    return plan
+
+def merge_payloads(payloads):
+    """
+    Gabungkan payload report dengan kunci batch sama. Mengembalikan (payload, spans), di mana
+    spans[i] = (awal, akhir) indeks `result` milik payload ke-i di response gabungan.
+    """
+    merged = {key: value for key, value in payloads[0].items() if key != "queries"}
+    merged["queries"] = []
+    spans = []
+    for payload in payloads:
+        start = len(merged["queries"])
+        merged["queries"].extend(payload["queries"])
+        spans.append((start, len(merged["queries"])))
+    return merged, spans
+
+def split_result(data, span):
+    """Potongan response gabungan untuk satu report, dalam bentuk response miliknya sendiri."""
+    start, end = span
+    results = data.get("result")
+    if not isinstance(results, list) or len(results) < end:
+        raise ValueError(f"Response batch hanya berisi {len(results or [])} hasil, dibutuhkan {end}")
+    return {**data, "result": results[start:end]}
@@ -0,0 +1,113 @@
+# core/breaker.py
+import threading
+import time
+from urllib.parse import urlsplit
+
+class CircuitOpenError(RuntimeError):
+    """Request ditolak tanpa menghubungi server karena circuit breaker sedang terbuka."""
+    def __init__(self, key, retry_at):
+        self.key = key
+        self.retry_at = retry_at
+        seconds = max(0, int(retry_at - time.time()))
+        super().__init__(f"Circuit breaker terbuka untuk {key[0]}{key[1]}, server dianggap tidak sehat. Coba lagi dalam ~{seconds} detik.")
+
+class CircuitBreaker:
+    """
+    Circuit breaker sederhana: closed -> open setelah `failure_threshold` kegagalan
+    berturut-turut, lalu half-open setelah `reset_seconds` untuk satu request percobaan.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, key, failure_threshold=3, reset_seconds=300, clock=time.time):
+        self.key = key
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def retry_at(self):
+        """Waktu (epoch detik) breaker boleh dicoba lagi, None jika tidak terbuka."""
+        if self.state == self.CLOSED or self.opened_at is None:
+            return None
+        return self.opened_at + self.reset_seconds
+
+    def before_call(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN and self.clock() >= self.retry_at():
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                # Hanya satu request percobaan; request lain tetap ditolak sampai hasilnya diketahui
+                self._probe_in_flight = True
+                return
+            raise CircuitOpenError(self.key, self.retry_at())
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+            self._probe_in_flight = False
+
+class BreakerRegistry:
+    """Kumpulan circuit breaker, satu per (host, endpoint)."""
+    def __init__(self, failure_threshold=3, reset_seconds=300, clock=time.time):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(url):
+        parts = urlsplit(url)
+        return (parts.netloc, parts.path)
+
+    def get(self, url):
+        key = self.key_for(url)
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(key, self.failure_threshold, self.reset_seconds, self.clock)
+            return self._breakers[key]
+
+    def retry_at(self):
+        """Waktu paling awal salah satu breaker yang terbuka boleh dicoba lagi (None jika semua tertutup)."""
+        with self._lock:
+            times = [b.retry_at() for b in self._breakers.values() if b.retry_at() is not None]
+        return min(times) if times else None
+
+    def snapshot(self):
+        """Status semua breaker, untuk dipindahkan antar proses (mis. proses ekstraksi terpisah)."""
+        with self._lock:
+            return {key: (b.state, b.failures, b.opened_at) for key, b in self._breakers.items()}
+
+    def restore(self, snapshot):
+        """Terapkan status dari snapshot(); breaker yang tidak ada di snapshot tidak diubah."""
+        with self._lock:
+            for key, (state, failures, opened_at) in snapshot.items():
+                breaker = self._breakers.get(key)
+                if breaker is None:
+                    breaker = self._breakers[key] = CircuitBreaker(key, self.failure_threshold, self.reset_seconds, self.clock)
+                with breaker._lock:
+                    breaker.state, breaker.failures, breaker.opened_at = state, failures, opened_at
+                    breaker._probe_in_flight = False
+
+    def open_breakers(self):
+        with self._lock:
+            return [b for b in self._breakers.values() if b.state != CircuitBreaker.CLOSED]
@@ -0,0 +1,112 @@
+# core/catalog.py
+import json
+import os
+import sqlite3
+
+class ReportCatalog:
+    """
+    Penyimpanan definisi report di SQLite.
+
+    Setiap report adalah satu baris (nama + definisi JSON), sehingga tambah/edit/hapus
+    hanya menyentuh baris tersebut, bukan menulis ulang seluruh request.json.
+    Urutan report mengikuti urutan penambahan (rowid).
+    """
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS reports ("
+            " name TEXT PRIMARY KEY,"
+            " definition TEXT NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT)"
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+    def names(self):
+        return [row[0] for row in self.conn.execute("SELECT name FROM reports ORDER BY rowid")]
+
+    def get(self, name):
+        row = self.conn.execute("SELECT definition FROM reports WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def all(self):
+        # Setiap pemanggilan menghasilkan dict baru dari JSON, jadi tidak perlu deepcopy
+        return {
+            name: json.loads(definition)
+            for name, definition in self.conn.execute("SELECT name, definition FROM reports ORDER BY rowid")
+        }
+
+    def upsert(self, name, definition):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO reports (name, definition) VALUES (?, ?)"
+                " ON CONFLICT(name) DO UPDATE SET definition = excluded.definition",
+                (name, json.dumps(definition)),
+            )
+
+    def rename(self, old_name, new_name, definition):
+        """Ganti nama + definisi tanpa mengubah posisi report dalam daftar."""
+        with self.conn:
+            if old_name != new_name:
+                self.conn.execute("DELETE FROM reports WHERE name = ?", (new_name,))
+            updated = self.conn.execute(
+                "UPDATE reports SET name = ?, definition = ? WHERE name = ?",
+                (new_name, json.dumps(definition), old_name),
+            ).rowcount
+            if not updated:
+                self.conn.execute(
+                    "INSERT INTO reports (name, definition) VALUES (?, ?)",
+                    (new_name, json.dumps(definition)),
+                )
+
+    def delete(self, name):
+        with self.conn:
+            self.conn.execute("DELETE FROM reports WHERE name = ?", (name,))
+
+    def bulk_import(self, reports, replace=False):
+        """
+        Impor banyak definisi report dalam satu transaksi.
+        replace=True mengosongkan katalog terlebih dahulu (sinkron penuh dengan sumber).
+        """
+        with self.conn:
+            if replace:
+                self.conn.execute("DELETE FROM reports")
+            self.conn.executemany(
+                "INSERT INTO reports (name, definition) VALUES (?, ?)"
+                " ON CONFLICT(name) DO UPDATE SET definition = excluded.definition",
+                ((name, json.dumps(definition)) for name, definition in reports.items()),
+            )
+        return len(reports)
+
+    def import_json(self, path, replace=False):
+        with open(path, "r", encoding="utf-8") as f:
+            reports = json.load(f)
+        return self.bulk_import(reports, replace=replace)
+
+    def export_json(self, path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.all(), f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def get_meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, str(value)),
+            )
@@ -0,0 +1,212 @@
+# core/cluster.py
+import json
+import os
+import socket
+import threading
+import time
+
+def default_node_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class LeaseDirectory:
+    """
+    Koordinasi job antar node lewat file lease di filesystem bersama.
+
+    Setiap report punya satu file `<nama>.lease` berisi pemilik, status, slot jadwal
+    dan waktu kedaluwarsa. Pembuatan memakai O_CREAT|O_EXCL. Lease yang diubah (ambil
+    alih, perpanjang, selesai, lepas) lebih dulu dipindahkan dengan os.rename lalu
+    isinya dicek ulang; jika ternyata bukan lease yang dimaksud, file dikembalikan.
+    Dengan begitu dua node tidak pernah sama-sama memegang satu job.
+
+    `slot` (epoch detik jadwal yang jatuh tempo) membuat lease "done" hanya menahan
+    slot yang sama: slot berikutnya boleh langsung diambil node mana pun.
+    """
+    def __init__(self, lease_dir, node_id=None, lease_seconds=300, clock=time.time):
+        self.lease_dir = lease_dir
+        self.node_id = node_id or default_node_id()
+        self.lease_seconds = lease_seconds
+        self.clock = clock
+        self._held = set()
+        self._lock = threading.Lock()
+        os.makedirs(lease_dir, exist_ok=True)
+
+    def _path(self, name):
+        safe_name = "".join(c if c.isalnum() or c in "-_. " else "_" for c in name)
+        return os.path.join(self.lease_dir, f"{safe_name}.lease")
+
+    def _read(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, OSError):
+            # File sedang ditulis node lain atau rusak: anggap masih dipegang
+            return {"node": None, "expires": self.clock() + self.lease_seconds}
+
+    def _lease(self, state, expires, slot):
+        return {"node": self.node_id, "state": state, "slot": slot, "expires": expires}
+
+    def _create(self, path, slot=None):
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self._lease("running", self.clock() + self.lease_seconds, slot), f)
+        return True
+
+    def _install(self, src, path):
+        """Pindahkan src ke path tanpa menimpa file yang sudah ada. False jika path sudah terisi."""
+        try:
+            os.link(src, path)
+        except FileExistsError:
+            os.remove(src)
+            return False
+        except OSError:
+            # Filesystem tanpa hard link (mis. sebagian share SMB)
+            if os.path.exists(path):
+                os.remove(src)
+                return False
+            os.rename(src, path)
+            return True
+        os.remove(src)
+        return True
+
+    def _grab(self, path, suffix):
+        """Pindahkan lease ke nama pribadi node ini. Kembalikan (path_baru, isi) atau (None, None)."""
+        grabbed = f"{path}.{self.node_id}.{suffix}"
+        try:
+            os.rename(path, grabbed)
+        except OSError:
+            return None, None
+        return grabbed, self._read(grabbed)
+
+    def _claimable(self, lease, slot):
+        if lease is None:
+            return True
+        if lease.get("node") == self.node_id and lease.get("state") == "running":
+            # Lease yang ditinggal proses sebelumnya dengan node_id yang sama (mis. proses engine
+            # yang di-restart setelah crash) diambil kembali tanpa menunggu kedaluwarsa
+            return True
+        lease_slot = lease.get("slot")
+        if slot is not None and lease_slot is not None and lease.get("state") == "done":
+            # Lease selesai hanya menahan slot-nya sendiri (dan slot yang lebih lama)
+            return lease_slot < slot
+        return lease.get("expires", 0) <= self.clock()
+
+    def claim(self, name, slot=None):
+        """Coba ambil job (untuk slot jadwal tertentu). True jika node ini sekarang pemegang lease."""
+        path = self._path(name)
+        if not self._create(path, slot):
+            lease = self._read(path)
+            if not self._claimable(lease, slot):
+                return False
+            # Ambil alih: rename atomik, lalu pastikan yang terambil memang lease yang dinilai tadi.
+            # Jika node lain sudah lebih dulu mengambil alih, lease barunya dikembalikan.
+            grabbed, taken = self._grab(path, "stale")
+            if grabbed is None:
+                return False
+            if taken != lease:
+                self._install(grabbed, path)
+                return False
+            os.remove(grabbed)
+            if not self._create(path, slot):
+                return False
+        with self._lock:
+            self._held.add(name)
+        return True
+
+    def _replace_own(self, name, state, expires):
+        """Tulis ulang lease milik node ini. False (tanpa mengubah apa pun) jika lease milik node lain."""
+        path = self._path(name)
+        tmp_path = f"{path}.{self.node_id}.tmp"
+        lease = self._read(path)
+        if (lease and lease.get("node") == self.node_id and lease.get("state") == "running"
+                and lease.get("expires", 0) - self.clock() > self.lease_seconds / 10):
+            # Lease running milik sendiri yang belum mendekati kedaluwarsa tidak bisa diambil
+            # alih node lain, jadi aman ditimpa langsung (tanpa jeda file hilang)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._lease(state, expires, lease.get("slot")), f)
+            os.replace(tmp_path, path)
+            return True
+
+        # Mendekati/lewat kedaluwarsa: pindahkan dulu, cek pemiliknya, baru tulis ulang
+        grabbed, lease = self._grab(path, "own")
+        if grabbed is None:
+            return False
+        if not lease or lease.get("node") != self.node_id:
+            self._install(grabbed, path)
+            return False
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._lease(state, expires, lease.get("slot")), f)
+        os.remove(grabbed)
+        return self._install(tmp_path, path)
+
+    def renew(self, name):
+        """Perpanjang lease (heartbeat). False jika lease sudah diambil node lain."""
+        if self._replace_own(name, "running", self.clock() + self.lease_seconds):
+            return True
+        with self._lock:
+            self._held.discard(name)
+        return False
+
+    def renew_all(self):
+        with self._lock:
+            held = list(self._held)
+        for name in held:
+            self.renew(name)
+
+    def complete(self, name, hold_seconds=0):
+        """
+        Tandai job selesai. Lease dibiarkan hingga `hold_seconds` agar node lain
+        tidak mengulang job yang sama di siklus yang sama.
+        """
+        with self._lock:
+            self._held.discard(name)
+        if hold_seconds > 0:
+            self._replace_own(name, "done", self.clock() + hold_seconds)
+        else:
+            self.release(name)
+
+    def release(self, name):
+        """Lepas lease (mis. job gagal) sehingga node lain boleh mencoba lagi."""
+        with self._lock:
+            self._held.discard(name)
+        path = self._path(name)
+        grabbed, lease = self._grab(path, "release")
+        if grabbed is None:
+            return
+        if lease and lease.get("node") == self.node_id:
+            os.remove(grabbed)
+        else:
+            self._install(grabbed, path)
+
+class LeaseHeartbeat(threading.Thread):
+    """Thread latar yang memperpanjang semua lease milik node ini secara berkala."""
+    def __init__(self, leases, interval_seconds=None):
+        super().__init__(name="lease-heartbeat", daemon=True)
+        self.leases = leases
+        self.interval_seconds = interval_seconds or max(1, leases.lease_seconds / 3)
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            self.leases.renew_all()
+
+    def stop(self):
+        self._stop_event.set()
+
+def leases_from_config(config, node_id=None):
+    """
+    Buat LeaseDirectory dari section [CLUSTER], None jika mode cluster tidak aktif.
+    `[CLUSTER] node_id` diutamakan, lalu `node_id` dari pemanggil (mis. id yang dibuat proses
+    induk untuk proses engine), baru default_node_id().
+    """
+    if not config.getboolean("CLUSTER", "enabled", fallback=False):
+        return None
+    return LeaseDirectory(
+        config.get("CLUSTER", "lease_dir", fallback=os.path.join(".state", "leases")),
+        node_id=config.get("CLUSTER", "node_id", fallback="") or node_id,
+        lease_seconds=config.getint("CLUSTER", "lease_seconds", fallback=300),
+    )
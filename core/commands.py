@@ -1,9 +1,26 @@
 # core/commands.py
 import requests
-import pandas as pd
 import configparser
 import os
 import json
+import tempfile
+import codecs
+from email.message import Message
+from core.decoders import decode_json
+from core.watermark import save_watermark, merge_with_existing, max_watermark
+from core.output import OutputLayout, write_frame
+from core.tee import TeeOutput, targets_from_config
+from core.breaker import BreakerRegistry
+from core.profiling import RunTracer
+from core.fixtures import fixtures_from_config
+from core.load_profile import load_history_from_config, is_query_request
+from core.sessions import AuthStore, SessionPool
+
+# Ukuran chunk saat menulis body response ke file sementara
+CHUNK_SIZE = 1024 * 1024
+
+# Endpoint autentikasi: tidak pernah memicu login ulang otomatis
+AUTH_URL_PARTS = ("/login/", "/security/csrf_token/")
 
 # --- Command Base Class ---
 class Command:
@@ -13,8 +30,10 @@ class Command:
 # --- Command Executor ---
 class CommandExecutor:
     def __init__(self):
-        self.session = requests.Session()
-        self.csrf_token = None
+        # Cookie dan token CSRF disimpan bersama; setiap thread memakai requests.Session sendiri
+        self.auth = AuthStore()
+        self.sessions = SessionPool(self.auth)
+        self._credentials = None # (username, password) login terakhir, untuk login ulang otomatis
         
         # Load config untuk BASE_URL jika diperlukan
         config = configparser.ConfigParser(interpolation=None)
@@ -24,30 +43,144 @@ class CommandExecutor:
         else:
             self.base_url = "https://dashboard.ecocare.co.id"
 
+        # Decoder JSON untuk response chart-data (auto = orjson/simdjson jika terpasang)
+        self.json_decoder = config.get('SETTINGS', 'json_decoder', fallback='auto')
+
+        # Folder untuk state antar-run (watermark, dll)
+        self.state_dir = config.get('SETTINGS', 'state_dir', fallback='.state')
+
+        # Circuit breaker per (host, endpoint): berhenti menghubungi server yang sedang tidak sehat
+        self.breakers = BreakerRegistry(
+            failure_threshold=config.getint('SERVER', 'breaker_failures', fallback=3),
+            reset_seconds=config.getint('SERVER', 'breaker_reset_seconds', fallback=300),
+        )
+
+        # Tracer profiling (no-op kecuali diaktifkan per run oleh ExtractorWorker)
+        self.tracer = RunTracer()
+
+        # Rekam/putar ulang response HTTP untuk benchmark offline ([FIXTURES] mode = off|record|replay)
+        self.fixture_mode, self.fixtures = fixtures_from_config(config)
+
+        # Riwayat latensi/error per jam dalam seminggu untuk belajar jam sibuk server (None jika tidak aktif)
+        self.load_history = load_history_from_config(config, self.state_dir)
+
+    @property
+    def session(self):
+        """requests.Session milik thread pemanggil."""
+        return self.sessions.session()
+
+    @property
+    def csrf_token(self):
+        return self.sessions.csrf_token
+
+    @csrf_token.setter
+    def csrf_token(self, token):
+        self.sessions.set_login_token(token)
+
     def execute_command(self, command: Command, *args, **kwargs):
         return command.execute(self, *args, **kwargs)
 
+    def request(self, method, url, **kwargs):
+        """
+        Kirim request lewat session thread pemanggil dengan perlindungan circuit breaker.
+        Error koneksi/timeout, 5xx dan 429 dihitung sebagai kegagalan server;
+        selama breaker terbuka, CircuitOpenError langsung dilempar tanpa request.
+        Jika session login kedaluwarsa (401, atau 400 karena token CSRF), login diulang
+        satu kali untuk semua thread lalu request dikirim ulang.
+        Dalam mode replay, response diambil dari fixture tanpa akses jaringan.
+        """
+        if self.fixture_mode == "replay":
+            with self.tracer.span(f"{method} {url} (replay)", "server"):
+                return self.fixtures.replay(method, url, kwargs)
+
+        response = self._send(method, url, kwargs)
+        logins = self.sessions.logins # Login yang cookie-nya dipakai request tadi
+        if self._credentials is None or any(part in url for part in AUTH_URL_PARTS) or not _auth_expired(response):
+            return response
+        response.close()
+        self._reauthenticate(logins)
+        return self._send(method, url, kwargs)
+
+    def _reauthenticate(self, logins):
+        """
+        Login ulang, kecuali thread lain sudah menyelesaikan login sejak request ini dikirim,
+        atau login ulang thread lain yang ditunggu tadi gagal (tidak diulang oleh setiap thread).
+        """
+        failed_logins = self.auth.failed_logins
+        with self.auth.refresh_lock:
+            if self.auth.logins != logins or self.auth.failed_logins != failed_logins:
+                return
+            # FetchCSRFTokenCommand dan LoginCommand membatalkan login thread ini sendiri jika gagal
+            self.execute_command(FetchCSRFTokenCommand())
+            self.execute_command(LoginCommand(), *self._credentials)
+
+    def _send(self, method, url, kwargs):
+        session = self.sessions.session()
+        logins = self.sessions.logins
+        token = self.sessions.csrf_token
+        if token:
+            # Token dikirim per request; header default session tidak diubah
+            kwargs = {**kwargs, "headers": {**(kwargs.get("headers") or {}), "X-CSRFToken": token}}
+        breaker = self.breakers.get(url)
+        breaker.before_call()
+        history = self.load_history if self.load_history is not None and is_query_request(url) else None
+        try:
+            # Dengan stream=True, span ini = waktu tunggu server sampai header diterima
+            with self.tracer.span(f"{method} {breaker.key[1]}", "server"):
+                response = session.request(method, url, **kwargs)
+        except requests.RequestException:
+            breaker.record_failure()
+            if history is not None:
+                history.record(error=True)
+            raise
+        if response.status_code >= 500 or response.status_code == 429:
+            breaker.record_failure()
+            if history is not None:
+                history.record(error=True)
+        else:
+            breaker.record_success()
+            if history is not None:
+                history.record(response.elapsed.total_seconds())
+        self.sessions.publish(response, logins)
+        if self.fixture_mode == "record":
+            return self.fixtures.record(method, url, kwargs, response)
+        return response
+
+def _auth_expired(response):
+    """Session login atau token CSRF sudah tidak berlaku (Superset: 401, atau 400 dengan pesan CSRF)."""
+    if response.status_code == 401:
+        return True
+    return response.status_code == 400 and "csrf" in response.text.lower()
+
 # --- Concrete Commands ---
 class FetchCSRFTokenCommand(Command):
     def execute(self, executor: CommandExecutor):
         # Perubahan: Menggunakan base_url dari executor dan get 'result' bukan 'csrf_token'
         url = f"{executor.base_url}/api/v1/security/csrf_token/"
-        response = executor.session.get(url)
-        response.raise_for_status()
-        data = response.json()
-
-        # Simpan token ke executor agar reusable
-        executor.csrf_token = data.get("result")  # PERUBAHAN: mendapatkan 'result' bukan 'csrf_token'
+        # Login baru dimulai dengan cookie sendiri; thread lain memakai session lama sampai login selesai
+        executor.sessions.begin_login()
+        try:
+            response = executor.request("GET", url)
+            response.raise_for_status()
+            data = response.json()
 
-        # Set header default ke session (jika API butuh secara global)
-        executor.session.headers.update({
-            "X-CSRFToken": executor.csrf_token
-        })
+            # Simpan token untuk login; CommandExecutor.request mengirimnya sebagai header X-CSRFToken
+            executor.csrf_token = data.get("result")  # PERUBAHAN: mendapatkan 'result' bukan 'csrf_token'
+        except Exception:
+            executor.sessions.abort_login()
+            raise
 
         return executor.csrf_token
 
 class LoginCommand(Command):
     def execute(self, executor: CommandExecutor, username=None, password=None):
+        try:
+            return self._login(executor, username, password)
+        finally:
+            # Tanpa efek setelah commit_login; jika login gagal, thread ini tidak tertinggal di mode login
+            executor.sessions.abort_login()
+
+    def _login(self, executor, username, password):
         if username is None or password is None:
             raise ValueError("Username atau password harus diberikan saat execute!")
 
@@ -68,49 +201,257 @@ class LoginCommand(Command):
         }
 
         login_url = f"{executor.base_url}/login/"
-        response = executor.session.post(login_url, data=payload, headers=headers)
+        response = executor.request("POST", login_url, data=payload, headers=headers)
         response.raise_for_status()
+        # Cookie session dan token CSRF hasil login dipakai semua thread mulai sekarang
+        executor.sessions.commit_login()
+        executor._credentials = (username, password)
         
         # PERUBAHAN: Return status code check
         return response.status_code == 200
 
-class FetchReportCommand(Command):
-    def execute(self, executor: CommandExecutor, name, url, payload):
-        # PERUBAHAN: Gunakan base_url jika URL tidak lengkap
-        if not url.startswith(("http://", "https://")):
-            complete_url = f"{executor.base_url}{url}"
+def _iter_body(response, progress=None):
+    """
+    Iterasi body response (stream=True) per chunk.
+    `progress(received, total)` dipanggil setiap chunk; total diambil dari Content-Length (None jika tidak ada).
+    """
+    total = int(response.headers.get("Content-Length") or 0) or None
+    # Dengan Content-Encoding (gzip/br) Content-Length adalah ukuran terkompresi, sedangkan
+    # iter_content menghasilkan bytes hasil dekompresi: progress memakai posisi baca di socket
+    wire_position = None
+    if response.headers.get("Content-Encoding", "identity").strip().lower() != "identity":
+        tell = getattr(response.raw, "tell", None)
+        if callable(tell):
+            wire_position = tell
         else:
-            complete_url = url
+            total = None
+    received = 0
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        if chunk:
+            received = wire_position() if wire_position is not None else received + len(chunk)
+            if progress is not None:
+                progress(received, total)
+            yield chunk
+
+def _stream_to_tempfile(response, suffix=".json", progress=None):
+    """Tulis body response (stream=True) ke file sementara dan kembalikan path-nya."""
+    fd, path = tempfile.mkstemp(prefix="linkdl-", suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in _iter_body(response, progress):
+                f.write(chunk)
+    except Exception:
+        os.remove(path)
+        raise
+    finally:
+        response.close()
+    return path
+
+class _CsvRecordCounter:
+    """
+    Hitung record CSV dari bytes secara streaming. Newline di dalam field ber-quote
+    tidak dihitung, dan baris terakhir tanpa newline penutup tetap terhitung.
+    """
+    def __init__(self):
+        self.records = 0
+        self.in_quote = False
+        self.pending = False
+
+    def feed(self, chunk):
+        if not chunk:
+            return
+        if not self.in_quote and b'"' not in chunk:
+            self.records += chunk.count(b"\n")
+        else:
+            # Segmen genap berada di luar quote jika chunk dimulai di luar quote ("" = dua toggle)
+            parts = chunk.split(b'"')
+            outside = 1 if self.in_quote else 0
+            self.records += sum(part.count(b"\n") for part in parts[outside::2])
+            self.in_quote ^= (len(parts) - 1) % 2 == 1
+        self.pending = not chunk.endswith(b"\n")
+
+    def close(self):
+        return self.records + (1 if self.pending else 0)
+
+def copy_csv_bytes(src_path, dst, encoding=None):
+    """
+    Salin body CSV mentah ke file biner `dst` yang sudah terbuka (mis. TeeOutput) per chunk.
+    Tanpa `encoding` (atau sudah UTF-8) bytes ditulis apa adanya; jika encoding
+    sumber dideklarasikan, isi ditranscode ke UTF-8 secara streaming.
+    Mengembalikan jumlah baris data (tanpa header).
+    """
+    passthrough = not encoding or codecs.lookup(encoding).name == "utf-8"
+    decoder = None if passthrough else codecs.getincrementaldecoder(encoding)(errors="replace")
+    counter = _CsvRecordCounter()
+    with open(src_path, "rb") as src:
+        while True:
+            chunk = src.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            # Dihitung pada bytes UTF-8 yang ditulis, bukan bytes sumber
+            out = chunk if passthrough else decoder.decode(chunk).encode("utf-8")
+            counter.feed(out)
+            dst.write(out)
+        if decoder is not None:
+            out = decoder.decode(b"", final=True).encode("utf-8")
+            counter.feed(out)
+            dst.write(out)
+    return max(0, counter.close() - 1)
+
+def declared_charset(response):
+    """
+    Charset yang dideklarasikan server di header Content-Type, None jika tidak ada.
+    Berbeda dengan response.encoding, tidak ada tebakan (ISO-8859-1 default/apparent_encoding).
+    """
+    content_type = response.headers.get("Content-Type")
+    if not content_type:
+        return None
+    message = Message()
+    message["Content-Type"] = content_type
+    charset = message.get_param("charset")
+    if not isinstance(charset, str) or not charset.strip("'\" "):
+        return None
+    try:
+        return codecs.lookup(charset.strip("'\" ")).name
+    except LookupError:
+        # Charset tidak dikenal Python: bytes disalin apa adanya
+        return None
+
+def _complete_url(executor, url):
+    # Gunakan base_url jika URL tidak lengkap
+    if not url.startswith(("http://", "https://")):
+        return f"{executor.base_url}{url}"
+    return url
+
+def _json_headers(executor):
+    # X-CSRFToken ditambahkan CommandExecutor.request dari token terbaru (juga saat dikirim ulang)
+    return {
+        "Content-Type": "application/json",
+    }
+
+def is_direct_csv_url(url):
+    return url.lower().endswith('.csv')
+
+class SubmitReportQueryCommand(Command):
+    """
+    Kirim query chart-data tanpa menunggu hasilnya (Superset GLOBAL_ASYNC_QUERIES).
+    Server menjawab 202 + job_id jika query dijalankan async. Jika server menjawab 200
+    (async tidak aktif atau hasil sudah di-cache), `response` dikembalikan tanpa dibaca:
+    body-nya diunduh FetchReportCommand di thread worker, di bawah budget memori report.
+    """
+    def execute(self, executor: CommandExecutor, name, url, payload):
+        with executor.tracer.span("submit", "server", report=name):
+            response = executor.request("POST", _complete_url(executor, url), json=payload, headers=_json_headers(executor), stream=True)
+        if response.status_code != 202:
+            try:
+                response.raise_for_status()
+            except Exception:
+                response.close()
+                raise
+            return {"is_async_job": False, "response": response}
+        try:
+            job = response.json()
+        finally:
+            response.close()
+        return {
+            "is_async_job": True,
+            "job_id": job["job_id"],
+            "channel_id": job.get("channel_id"),
+            "result_url": job.get("result_url"),
+        }
+
+class WarmReportCacheCommand(Command):
+    """
+    Jalankan query report agar hasilnya masuk cache server, tanpa mengunduh body.
+    Superset menghitung seluruh hasil (dan menyimpannya ke cache) sebelum mengirim
+    header, jadi koneksi cukup ditutup setelah status diterima.
+    """
+    def execute(self, executor: CommandExecutor, name, url, payload):
+        payload = {**payload, "force": False}
+        with executor.tracer.span("warmup", "server", report=name):
+            response = executor.request("POST", _complete_url(executor, url), json=payload, headers=_json_headers(executor), stream=True)
+        try:
+            response.raise_for_status()
+            return response.status_code
+        finally:
+            response.close()
+
+def cache_status(data):
+    """True/False jika server melaporkan `is_cached` untuk semua hasil, None jika tidak diketahui."""
+    results = data.get("result") if isinstance(data, dict) else None
+    if not isinstance(results, list) or not results:
+        return None
+    flags = [result.get("is_cached") for result in results if isinstance(result, dict)]
+    if not flags or any(flag is None for flag in flags):
+        return None
+    return all(flags)
+
+class FetchReportCommand(Command):
+    def execute(self, executor: CommandExecutor, name, url, payload, raw=False, encoding=None, progress=None,
+                result_url=None, response=None):
+        """
+        Ambil data report. Untuk query async, `result_url` (dari event job selesai) diambil
+        dengan GET, atau body `response` 200 dari SubmitReportQueryCommand diunduh langsung.
+        """
+        complete_url = _complete_url(executor, url)
         
         # Deteksi jika URL langsung ke file CSV (tanpa perlu CSRF dan payload)
-        is_direct_csv = complete_url.lower().endswith('.csv')
+        is_direct_csv = is_direct_csv_url(complete_url)
         
         if is_direct_csv:
             # Untuk file CSV langsung, gunakan GET request biasa tanpa header khusus
-            response = executor.session.get(complete_url)
+            response = executor.request("GET", complete_url, stream=True)
             response.raise_for_status()
             
-            # Simpan data CSV mentah
+            # Simpan bytes CSV mentah apa adanya ke file sementara, tanpa response.text
+            # (menghindari deteksi charset di seluruh body dan decode/encode ulang).
+            # Tanpa `encoding` di report, charset dari header server yang dipakai untuk transcode.
+            encoding = encoding or declared_charset(response)
+            with executor.tracer.span("transfer", "transfer", report=name):
+                body_path = _stream_to_tempfile(response, suffix=".csv", progress=progress)
             return {
                 "is_raw_csv": True,
-                "csv_content": response.text,
+                "body_path": body_path,
+                "encoding": encoding,
                 "result": []  # Placeholder untuk format output yang konsisten
             }
         else:
-            # Untuk API call regular yang membutuhkan CSRF dan payload JSON
-            headers = {
-                "Content-Type": "application/json",
-                "X-CSRFToken": executor.csrf_token
-            }
-            
-            response = executor.session.post(complete_url, json=payload, headers=headers)
+            # Untuk API call regular yang membutuhkan CSRF dan payload JSON.
+            # `response` sudah ada jika server menjawab 200 saat submit (bukan 202); body-nya belum dibaca
+            if response is None and result_url:
+                # Hasil query async sudah siap di server; cukup diunduh
+                response = executor.request("GET", _complete_url(executor, result_url), stream=True)
+            elif response is None:
+                response = executor.request("POST", complete_url, json=payload, headers=_json_headers(executor), stream=True)
             response.raise_for_status()
+
+            if raw:
+                # Mode raw: thread I/O hanya mengambil bytes, decode dilakukan di process pool
+                with executor.tracer.span("transfer", "transfer", report=name):
+                    body_path = _stream_to_tempfile(response, progress=progress)
+                return {
+                    "is_raw_json": True,
+                    "body_path": body_path,
+                    "decoder": executor.json_decoder,
+                }
             
-            # Kembalikan response JSON normal
-            return response.json()
+            # Decode langsung dari bytes, tanpa membuat response.text
+            try:
+                with executor.tracer.span("transfer", "transfer", report=name):
+                    body = b"".join(_iter_body(response, progress))
+            finally:
+                response.close()
+            with executor.tracer.span("decode", "decode", report=name, bytes=len(body)):
+                return decode_json(body, executor.json_decoder)
 
 class SaveReportCommand(Command):
-    def execute(self, executor: CommandExecutor, name, data):
+    def __init__(self):
+        # Jumlah baris data yang ditulis run terakhir (None jika disimpan sebagai JSON)
+        self.rows_written = None
+        # Apakah hasil dilayani dari cache server (None jika server tidak melaporkannya)
+        self.cache_hit = None
+
+    def execute(self, executor: CommandExecutor, name, data, watermark=None, diff=None):
         # Baca output_dir dari config.ini
         config = configparser.ConfigParser(interpolation=None)
         config.read('config.ini')
@@ -120,32 +461,76 @@ class SaveReportCommand(Command):
         else:
             # Fallback ke direktori "output" di lokasi saat ini
             output_dir = "output"
-        
-        # Membuat direktori output jika belum ada
-        os.makedirs(output_dir, exist_ok=True)
+        state_dir = config.get('SETTINGS', 'state_dir', fallback='.state')
+
+        # Layout output (flat atau partisi per tanggal/run) dari section [OUTPUT]
+        layout = OutputLayout.from_config(config, output_dir)
+        # Tujuan tambahan (mirror/arsip) ditulis dalam satu pass bersama file lokal
+        targets = targets_from_config(config)
+        self.cache_hit = cache_status(data)
         
         # Kasus khusus: file CSV mentah
         if isinstance(data, dict) and data.get("is_raw_csv", False):
-            csv_content = data.get("csv_content", "")
-            path = os.path.join(output_dir, f"{name}.csv")
-            
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(csv_content)
+            path = layout.new_path(name, "csv")
+            try:
+                # Pointer `latest` diperbarui begitu file lokal selesai, tanpa menunggu mirror/arsip
+                with TeeOutput(path, targets, os.path.relpath(path, layout.output_dir),
+                               publish=lambda: self._publish(layout, name, path)) as out:
+                    self.rows_written = copy_csv_bytes(data["body_path"], out, data.get("encoding"))
+            finally:
+                os.remove(data["body_path"])
+            notes = out.notes + self._write_sinks(config, name, csv_path=path)
+            if diff:
+                # CSV mentah disalin per chunk tanpa di-parse; membuat delta butuh membaca ulang file
+                notes.append("delta dilewati: diff hanya didukung untuk report chart-data")
                 
-            return f"Report CSV '{name}' berhasil disimpan ke {path}"
+            return f"Report CSV '{name}' berhasil disimpan ke {path}{_format_notes(notes)}"
         
         # Memproses JSON ke CSV menggunakan pandas
         try:
             # Mencoba mendapatkan data dari format yang diharapkan
             if "result" in data and isinstance(data["result"], list) and len(data["result"]) > 0:
                 if "data" in data["result"][0]:
-                    df = pd.DataFrame(data["result"][0]["data"])
-                    path = os.path.join(output_dir, f"{name}.csv")
-                    df.to_csv(path, index=False)
-                    return f"Report '{name}' berhasil disimpan ke {path} sebagai CSV"
+                    # Import pandas hanya saat DataFrame benar-benar dibutuhkan (startup lebih cepat)
+                    from core.frames import build_frame
+                    # dtype ringkas (category, downcast) dibangun per kolom; kolom watermark tidak diubah
+                    df = build_frame(
+                        data["result"][0],
+                        compact=config.getboolean('OUTPUT', 'compact_dtypes', fallback=True),
+                        keep_columns=(watermark["column"],) if watermark else (),
+                        parse_dates=config.getboolean('OUTPUT', 'parse_dates', fallback=False),
+                    )
+                    fmt = layout.format
+                    label = fmt.upper()
+                    previous_path = layout.latest_path(name, fmt)
+                    path = layout.new_path(name, fmt)
+
+                    if watermark:
+                        # Ekstraksi delta: gabungkan baris baru ke file lama, lalu simpan high-water mark
+                        column = watermark["column"]
+                        new_rows = len(df)
+                        new_mark = max_watermark(df, column)
+                        df = merge_with_existing(previous_path, df, watermark.get("key"))
+                        notes = write_frame(df, path, fmt, targets, os.path.relpath(path, layout.output_dir),
+                                            publish=lambda: self._publish(layout, name, path))
+                        self.rows_written = len(df)
+                        if new_mark is not None:
+                            save_watermark(state_dir, name, column, new_mark)
+                        if diff:
+                            notes += self._write_delta(state_dir, name, diff, df, path, layout, targets)
+                        notes += self._write_sinks(config, name, df=df)
+                        return f"Report '{name}' berhasil disimpan ke {path} sebagai {label} ({new_rows} baris baru, watermark {column}={new_mark}){_format_notes(notes)}"
+
+                    notes = write_frame(df, path, fmt, targets, os.path.relpath(path, layout.output_dir),
+                                        publish=lambda: self._publish(layout, name, path))
+                    self.rows_written = len(df)
+                    if diff:
+                        notes += self._write_delta(state_dir, name, diff, df, path, layout, targets)
+                    notes += self._write_sinks(config, name, df=df)
+                    return f"Report '{name}' berhasil disimpan ke {path} sebagai {label}{_format_notes(notes)}"
             
             # Simpan juga sebagai JSON untuk backup
-            path_json = os.path.join(output_dir, f"{name}.json")
+            path_json = layout.new_path(name, "json")
             with open(path_json, "w", encoding="utf-8") as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
             
@@ -153,7 +538,79 @@ class SaveReportCommand(Command):
             
         except Exception as e:
             # Fallback ke JSON jika ada error dalam pemrosesan
-            path = os.path.join(output_dir, f"{name}.json")
+            path = layout.new_path(name, "json")
             with open(path, "w", encoding="utf-8") as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
-            return f"Report '{name}' berhasil disimpan ke {path} dengan format JSON (error: {str(e)})"
\ No newline at end of file
+            return f"Report '{name}' berhasil disimpan ke {path} dengan format JSON (error: {str(e)})"
+
+    def _write_sinks(self, config, name, df=None, csv_path=None):
+        """
+        Muat hasil report ke sink tambahan ([OUTPUT] database) langsung dari DataFrame yang
+        sudah di-decode, atau dari CSV mentah yang baru ditulis. File output sudah tersimpan,
+        jadi kegagalan sink hanya dicatat (list catatan per sink) dan tidak menggagalkan report.
+        """
+        # sqlite3/duckdb hanya dimuat jika dipakai (startup lebih cepat)
+        from core.sinks import sinks_from_config
+
+        notes = []
+        try:
+            sinks = sinks_from_config(config)
+        except ValueError as e:
+            return [f"database gagal: {e}"]
+        for sink in sinks:
+            try:
+                rows = sink.write_frame(name, df) if df is not None else sink.write_csv(name, csv_path)
+                notes.append(f"{sink}: {rows} baris")
+            except Exception as e:
+                notes.append(f"{sink} gagal: {e}")
+        return notes
+
+    def _write_delta(self, state_dir, name, diff, df, path, layout, targets):
+        """
+        Tulis file delta (insert/update/delete dibanding run sebelumnya) di samping file output,
+        dari DataFrame yang sama, ke tujuan lokal dan mirror/arsip sekaligus. Indeks hash baris
+        hanya diperbarui jika delta berhasil ditulis. Kegagalan dicatat dan tidak menggagalkan report.
+        """
+        # numpy untuk indeks diff hanya dimuat jika dipakai
+        from core.rowdiff import RowDiff, delta_path
+
+        if not diff.get("key"):
+            return ["delta gagal: opsi diff membutuhkan 'key'"]
+        row_diff = RowDiff(state_dir, name, diff["key"])
+        path = delta_path(path)
+        try:
+            with TeeOutput(path, targets, os.path.relpath(path, layout.output_dir)) as out:
+                row_diff.write_delta(df, out)
+            row_diff.commit()
+        except Exception as e:
+            return [f"delta gagal: {e}"]
+        note = f"delta {path}: {row_diff.inserted} baru, {row_diff.updated} berubah, {row_diff.deleted} dihapus"
+        if row_diff.duplicates:
+            note += f" ({row_diff.duplicates} key ganda, versi terakhir dipakai)"
+        return [note] + out.notes
+
+    def _publish(self, layout, name, path):
+        # Pointer `latest` diperbarui hanya setelah file baru lengkap, lalu partisi lama dipangkas di background
+        layout.publish(name, path)
+        layout.prune_in_background(name)
+
+def _format_notes(notes):
+    """Catatan tujuan tambahan (mirror, arsip, database) untuk pesan hasil report."""
+    return f" [{'; '.join(notes)}]" if notes else ""
+
+def process_raw_report(name, fetched, watermark=None, diff=None):
+    """
+    Decode body JSON mentah dari file sementara lalu simpan report.
+    Dipanggil di dalam ProcessPoolExecutor, jadi harus berupa fungsi top-level
+    dan tidak boleh bergantung pada session milik CommandExecutor.
+    Mengembalikan (pesan, jumlah baris yang ditulis, status cache server).
+    """
+    body_path = fetched["body_path"]
+    try:
+        with open(body_path, "rb") as f:
+            data = decode_json(f.read(), fetched.get("decoder", "auto"))
+    finally:
+        os.remove(body_path)
+    command = SaveReportCommand()
+    msg = command.execute(None, name, data, watermark=watermark, diff=diff)
+    return msg, command.rows_written, command.cache_hit
@@ -0,0 +1,80 @@
+# core/decoders.py
+import json
+import re
+
+# Decoder JSON yang tersedia. Semua menerima bytes mentah dari response,
+# sehingga tidak perlu membangun response.text (str) terlebih dahulu.
+DECODERS = {
+    "stdlib": json.loads,
+}
+
+try:
+    import orjson
+    DECODERS["orjson"] = orjson.loads
+except ImportError:
+    pass
+
+try:
+    import simdjson
+    DECODERS["simdjson"] = simdjson.loads
+except ImportError:
+    pass
+
+# Urutan preferensi untuk mode "auto": yang tercepat lebih dulu
+AUTO_ORDER = ("orjson", "simdjson", "stdlib")
+
+def get_decoder(name="auto"):
+    """
+    Kembalikan fungsi decode untuk nama decoder yang diminta.
+    Jika decoder tidak terpasang, fallback ke decoder tercepat yang ada.
+    """
+    name = (name or "auto").strip().lower()
+    if name in DECODERS:
+        return DECODERS[name]
+    for candidate in AUTO_ORDER:
+        if candidate in DECODERS:
+            return DECODERS[candidate]
+    return json.loads
+
+# orjson mengubah diam-diam integer di luar rentang int64/uint64 menjadi float,
+# sedangkan json stdlib mempertahankan int
+_INT_MIN, _INT_MAX = -2**63, 2**64 - 1
+# Literal integer 19+ digit (boleh negatif), bukan bagian pecahan/eksponen atau token lain
+_WIDE_INT = re.compile(rb"(?<![\w.+\-])-?\d{19,}(?![\d.eE])")
+# Literal terpanjang yang masih dalam rentang: "-" + 19 digit atau 20 digit
+_INT_MAX_CHARS = 20
+# Pra-saring cepat: semua digit -> "0", karakter lain -> spasi, lalu cari 19 digit berturut-turut
+_DIGIT_MASK = bytes(ord("0") if chr(i).isdigit() and i < 128 else ord(" ") for i in range(256))
+_DIGIT_RUN = b"0" * 19
+# Body dipindai per window agar pra-saring tidak menyalin seluruh body sekaligus. Window
+# saling tumpang tindih _SCAN_OVERLAP bytes: literal yang terpotong batas window muncul utuh
+# di window berikutnya, atau lebih panjang dari _INT_MAX_CHARS sehingga pasti lebar
+_SCAN_WINDOW = 256 * 1024
+_SCAN_OVERLAP = 64
+
+def _has_wide_int(data):
+    for start in range(0, len(data), _SCAN_WINDOW):
+        window = data[max(0, start - _SCAN_OVERLAP):start + _SCAN_WINDOW]
+        if _DIGIT_RUN not in window.translate(_DIGIT_MASK):
+            continue
+        for match in _WIDE_INT.finditer(window):
+            literal = match.group()
+            if len(literal) > _INT_MAX_CHARS or not _INT_MIN <= int(literal) <= _INT_MAX:
+                return True
+    return False
+
+def decode_json(data, decoder="auto"):
+    """
+    Decode bytes JSON menggunakan decoder yang dipilih.
+    Hasilnya selalu sama dengan json stdlib: body dengan integer lebar atau NaN/Infinity
+    (ditolak orjson) di-decode ulang dengan json.loads.
+    """
+    decode = get_decoder(decoder)
+    if decode is json.loads:
+        return decode(data)
+    if _has_wide_int(data):
+        return json.loads(data)
+    try:
+        return decode(data)
+    except ValueError:
+        return json.loads(data)
@@ -0,0 +1,139 @@
+# core/fixtures.py
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Field form/JSON yang berubah tiap sesi atau rahasia; tidak ikut menentukan kunci fixture
+VOLATILE_FIELDS = {"csrf_token", "password"}
+
+class FixtureNotFoundError(LookupError):
+    pass
+
+class _ThrottledReader:
+    """Objek `raw` untuk Response replay: mengirim body per chunk dengan kecepatan rekaman."""
+    def __init__(self, body, duration):
+        self._buffer = io.BytesIO(body)
+        self._size = max(1, len(body))
+        self._duration = duration
+
+    def read(self, amount=None, **kwargs):
+        chunk = self._buffer.read(amount)
+        if chunk and self._duration > 0:
+            time.sleep(self._duration * len(chunk) / self._size)
+        return chunk
+
+    def close(self):
+        self._buffer.close()
+
+class FixtureStore:
+    """
+    Rekam/putar ulang response HTTP untuk benchmark dan uji regresi offline.
+
+    Body disimpan terkompresi gzip dan dialamatkan dengan sha256 isinya
+    (blobs/<2 huruf>/<sha256>.gz), sehingga body yang sama hanya disimpan sekali.
+    index.json memetakan kunci request (method + URL + params + body request) ke status,
+    header, hash body dan waktu server/transfer saat direkam.
+    """
+    def __init__(self, root, speed=1.0):
+        self.root = root
+        self.speed = speed
+        self.index_path = os.path.join(root, "index.json")
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, "blobs"), exist_ok=True)
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.index = {}
+
+    @staticmethod
+    def request_key(method, url, kwargs):
+        body = kwargs.get("json")
+        if body is None:
+            body = kwargs.get("data")
+        if isinstance(body, dict):
+            body = {k: v for k, v in body.items() if k not in VOLATILE_FIELDS}
+        # Query string ikut menentukan kunci (mis. last_id saat polling /api/v1/async_event/)
+        canonical = json.dumps([method.upper(), url, kwargs.get("params"), body], sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _blob_path(self, digest):
+        return os.path.join(self.root, "blobs", digest[:2], f"{digest}.gz")
+
+    def _save_blob(self, body):
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        return digest
+
+    def _save_index(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=1)
+        os.replace(tmp_path, self.index_path)
+
+    def record(self, method, url, kwargs, response):
+        """Simpan response; body dibaca penuh sehingga response tetap bisa dipakai pemanggil."""
+        started = time.perf_counter()
+        body = response.content
+        transfer_seconds = time.perf_counter() - started
+
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in ("content-encoding", "transfer-encoding")}
+        headers["Content-Length"] = str(len(body))
+        entry = {
+            "method": method.upper(),
+            "url": url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": headers,
+            "body": self._save_blob(body),
+            "server_seconds": response.elapsed.total_seconds(),
+            "transfer_seconds": transfer_seconds,
+        }
+        with self._lock:
+            self.index[self.request_key(method, url, kwargs)] = entry
+            self._save_index()
+        return response
+
+    def replay(self, method, url, kwargs):
+        """Bangun requests.Response dari fixture; speed 0 = secepat mungkin, 2 = dua kali lebih cepat."""
+        entry = self.index.get(self.request_key(method, url, kwargs))
+        if entry is None:
+            raise FixtureNotFoundError(f"Fixture tidak ditemukan untuk {method.upper()} {url}. Rekam dulu dengan [FIXTURES] mode = record.")
+
+        with gzip.open(self._blob_path(entry["body"]), "rb") as f:
+            body = f.read()
+
+        scale = 0.0 if self.speed <= 0 else 1.0 / self.speed
+        if scale:
+            time.sleep(entry["server_seconds"] * scale)
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry.get("reason")
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.url = url
+        response.raw = _ThrottledReader(body, entry["transfer_seconds"] * scale)
+        return response
+
+def fixtures_from_config(config):
+    """Kembalikan (mode, FixtureStore) dari section [FIXTURES]; store None jika mode off."""
+    mode = config.get("FIXTURES", "mode", fallback="off").strip().lower()
+    if mode not in ("record", "replay"):
+        return "off", None
+    store = FixtureStore(
+        config.get("FIXTURES", "dir", fallback=os.path.join(".state", "fixtures")),
+        speed=config.getfloat("FIXTURES", "speed", fallback=1.0),
+    )
+    return mode, store
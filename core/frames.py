@@ -0,0 +1,107 @@
+# core/frames.py
+import numpy as np
+import pandas as pd
+
+# GenericDataType Superset pada field `coltypes` di hasil /api/v1/chart/data
+COLTYPE_NUMERIC = 0
+COLTYPE_STRING = 1
+COLTYPE_TEMPORAL = 2
+COLTYPE_BOOLEAN = 3
+
+# Kolom teks dijadikan category jika nilai uniknya <= rasio ini dari jumlah baris
+CATEGORY_MAX_RATIO = 0.5
+
+def _downcast_numeric(series):
+    if series.dtype.kind in "iu":
+        return pd.to_numeric(series, downcast="integer" if series.dtype.kind == "i" else "unsigned")
+    if series.dtype.kind == "f":
+        # float32 hanya jika semua nilai tetap persis sama, agar tidak ada presisi yang hilang
+        compact = series.astype(np.float32)
+        if (compact.astype(np.float64) == series)[series.notna()].all():
+            return compact
+    return series
+
+def _to_category(series, max_ratio):
+    if pd.api.types.infer_dtype(series, skipna=True) != "string":
+        return series
+    if series.nunique() > max(1, int(len(series) * max_ratio)):
+        return series
+    return series.astype("category")
+
+def _to_datetime(series):
+    try:
+        if pd.api.types.infer_dtype(series, skipna=True) in ("integer", "floating", "mixed-integer-float"):
+            # Superset mengirim kolom temporal sebagai epoch milidetik
+            return pd.to_datetime(series, unit="ms")
+        return pd.to_datetime(series)
+    except (ValueError, TypeError, OverflowError):
+        return series
+
+def compact_column(values, coltype=None, max_ratio=CATEGORY_MAX_RATIO, parse_dates=False):
+    """Bangun satu kolom dengan dtype sekecil mungkin tanpa mengubah nilainya."""
+    series = pd.Series(values)
+    if coltype == COLTYPE_TEMPORAL:
+        # Tanpa parse_dates nilai temporal (mis. epoch ms) ditulis persis seperti dari server
+        return _to_datetime(series) if parse_dates else series
+    if series.dtype.kind in "iuf":
+        return _downcast_numeric(series)
+    if pd.api.types.is_string_dtype(series.dtype) and coltype in (None, COLTYPE_STRING):
+        return _to_category(series, max_ratio)
+    return series
+
+def build_frame(result, compact=True, keep_columns=(), max_ratio=CATEGORY_MAX_RATIO, parse_dates=False):
+    """
+    Ubah satu elemen `result` Superset (data + colnames + coltypes) menjadi DataFrame.
+
+    Dengan compact=True kolom dibangun satu per satu: teks berulang menjadi category dan
+    integer/float di-downcast. Jadi tidak ada DataFrame penuh ber-dtype object yang dibuat
+    terlebih dahulu. Kolom temporal hanya di-parse menjadi datetime jika parse_dates=True.
+    `keep_columns` (mis. kolom watermark) dibiarkan apa adanya.
+    """
+    rows = result["data"]
+    colnames = result.get("colnames")
+    if not compact or not colnames:
+        return pd.DataFrame(rows)
+
+    coltypes = result.get("coltypes") or []
+    columns = {}
+    for index, column in enumerate(colnames):
+        values = [row.get(column) for row in rows]
+        if column in keep_columns:
+            columns[column] = pd.Series(values)
+        else:
+            coltype = coltypes[index] if index < len(coltypes) else None
+            columns[column] = compact_column(values, coltype, max_ratio, parse_dates)
+        del values
+
+    # Kolom di luar colnames (jarang terjadi) tetap ikut disimpan
+    extra = [key for key in (rows[0] if rows else {}) if key not in columns]
+    for column in extra:
+        columns[column] = pd.Series([row.get(column) for row in rows])
+
+    return pd.DataFrame(columns, copy=False)
+
+def storage_frame(df, keep_categories=False):
+    """
+    dtype tetap untuk file output: integer -> int64, float -> float64, category -> dtype
+    nilainya. Lebar hasil downcast bergantung pada data run tersebut (int8 di satu run,
+    int16 di run berikutnya), sehingga tanpa ini skema parquet berubah-ubah antar run,
+    dan float32 ditulis ke CSV dengan format lain (2.2869e+07, bukan 22869000.0).
+    keep_categories=True untuk CSV, di mana category ditulis sebagai teks yang sama.
+    """
+    columns = {}
+    for column, series in df.items():
+        kind = series.dtype.kind
+        if isinstance(series.dtype, pd.CategoricalDtype) and not keep_categories:
+            columns[column] = series.astype(series.cat.categories.dtype)
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            columns[column] = series
+        elif kind == "i":
+            columns[column] = series.astype(np.int64)
+        elif kind == "u":
+            columns[column] = series.astype(np.uint64)
+        elif kind == "f":
+            columns[column] = series.astype(np.float64)
+        else:
+            columns[column] = series
+    return pd.DataFrame(columns, copy=False)
@@ -0,0 +1,213 @@
+# core/load_profile.py
+import datetime
+import json
+import os
+import threading
+import zlib
+
+HOURS_PER_WEEK = 7 * 24
+
+# Setiap error dihitung seolah latensinya (1 + ERROR_PENALTY) kali rata-rata
+ERROR_PENALTY = 4.0
+
+# Sampel per jam dibatasi; jika terlampaui, semua jumlah di jam itu dibagi dua
+# (riwayat lama memudar, profil mengikuti perubahan pola beban server)
+MAX_SAMPLES_PER_HOUR = 200
+
+# Jam sibuk yang tidak mendapat sampel baru selama ini tidak lagi dianggap sibuk. Jam yang
+# di-blackout tidak pernah dijalankan, jadi tanpa batas ini satu jam buruk (mis. error
+# beruntun, skor tak hingga) akan di-blackout selamanya; setelah kedaluwarsa jam itu
+# dijalankan lagi sebagai percobaan dan dipelajari ulang dari sampel barunya.
+LEARNED_BLACKOUT_DAYS = 14
+
+# Offset interval yang skornya <= toleransi ini dari offset terbaik dianggap setara
+OFFSET_TOLERANCE = 1.1
+
+def hour_of_week(dt):
+    """0 = Senin 00:00-00:59, 167 = Minggu 23:00-23:59 (waktu lokal, sama dengan scheduler)."""
+    return dt.weekday() * 24 + dt.hour
+
+class LoadHistory:
+    """
+    Riwayat latensi dan error request query ke server, diringkas per jam dalam seminggu
+    (168 slot: jumlah sampel, total latensi, jumlah error), disimpan sebagai JSON.
+
+    Dari riwayat ini dihitung jam sibuk server (skor jauh di atas median) dan offset
+    interval tercepat untuk setiap report, menggantikan aturan tetap "jam genap".
+    Aman dipanggil dari banyak thread; save() dipanggil setelah setiap run.
+    """
+    def __init__(self, path, min_samples=5, busy_factor=1.5, clock=None):
+        self.path = path
+        self.min_samples = min_samples
+        self.busy_factor = busy_factor
+        self.clock = clock or datetime.datetime.now
+        self.hours = [[0.0, 0.0, 0.0] for _ in range(HOURS_PER_WEEK)] # sampel, total latensi, error
+        self.last_sample = [None] * HOURS_PER_WEEK # timestamp sampel terakhir per jam
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            stored = data.get("hours", {})
+            last = data.get("last", {})
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"[WARNING] Riwayat beban server tidak bisa dibaca ({self.path}): {e}")
+            return
+        # Riwayat versi 1 tidak menyimpan waktu sampel: dianggap baru saat dimuat
+        loaded_at = self.clock().timestamp()
+        with self._lock:
+            for hour, values in stored.items():
+                if 0 <= int(hour) < HOURS_PER_WEEK and len(values) == 3:
+                    self.hours[int(hour)] = [float(value) for value in values]
+                    self.last_sample[int(hour)] = float(last.get(hour, loaded_at))
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            hours = {str(hour): values for hour, values in enumerate(self.hours) if values[0]}
+            last = {str(hour): self.last_sample[hour] for hour in range(HOURS_PER_WEEK) if self.hours[hour][0] and self.last_sample[hour] is not None}
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 2, "hours": hours, "last": last}, f)
+        os.replace(tmp_path, self.path)
+
+    def record(self, latency_seconds=None, error=False, at=None):
+        """Catat satu request: latensi sampai header diterima, atau error (tanpa latensi)."""
+        at = at or self.clock()
+        hour = hour_of_week(at)
+        with self._lock:
+            self.last_sample[hour] = at.timestamp()
+            values = self.hours[hour]
+            if values[0] >= MAX_SAMPLES_PER_HOUR:
+                values[:] = [value / 2 for value in values]
+            values[0] += 1
+            if error:
+                values[2] += 1
+            else:
+                values[1] += latency_seconds or 0.0
+            self._dirty = True
+
+    def _scores(self):
+        """Skor per jam (latensi rata-rata + penalti error); None jika sampel belum cukup."""
+        with self._lock:
+            hours = [list(values) for values in self.hours]
+        scores = []
+        for samples, latency_sum, errors in hours:
+            successes = samples - errors
+            if samples < self.min_samples or successes <= 0:
+                scores.append(None if samples < self.min_samples else float("inf"))
+                continue
+            scores.append(latency_sum / successes * (1 + ERROR_PENALTY * errors / samples))
+        return scores
+
+    def profile(self):
+        """
+        Ringkasan untuk UI dan scheduler: list 168 dict (samples, latency, error_rate, score, busy, stale).
+        Jam tanpa sampel cukup diberi skor median (netral) dan tidak pernah dianggap sibuk.
+        Jam sibuk tanpa sampel baru selama LEARNED_BLACKOUT_DAYS (`stale`) juga dianggap
+        netral, agar jam itu dijalankan lagi dan dipelajari ulang.
+        """
+        scores = self._scores()
+        known = sorted(score for score in scores if score is not None)
+        median = known[len(known) // 2] if known else None
+        expired_before = self.clock().timestamp() - LEARNED_BLACKOUT_DAYS * 86400
+        with self._lock:
+            hours = [list(values) for values in self.hours]
+            last_sample = list(self.last_sample)
+        result = []
+        for (samples, latency_sum, errors), score, last in zip(hours, scores, last_sample):
+            successes = samples - errors
+            busy = score is not None and median is not None and score > median * self.busy_factor
+            stale = busy and last is not None and last < expired_before
+            result.append({
+                "samples": int(samples),
+                "latency": latency_sum / successes if successes > 0 else None,
+                "error_rate": errors / samples if samples else None,
+                "score": score if score is not None and not stale else median,
+                "busy": busy and not stale,
+                "stale": stale,
+            })
+        return result
+
+    def has_data(self):
+        return any(score is not None for score in self._scores())
+
+class LearnedBlackout:
+    """
+    Blackout window dari riwayat beban: jam-jam (per jam dalam seminggu) yang skornya
+    jauh di atas median. Punya method matches(dt) seperti CronExpression, sehingga bisa
+    dipakai Scheduler bersama blackout cron. Jam sibuk dihitung ulang paling sering
+    sekali per jam, karena riwayat terus bertambah setiap run. Selama riwayat belum
+    cukup, blackout `fallback` (mis. aturan lama jam genap) yang dipakai.
+    """
+    def __init__(self, history, fallback=()):
+        self.history = history
+        self.fallback = list(fallback)
+        self._busy = frozenset()
+        self._learned = False
+        self._computed_for = None
+
+    def busy_hours(self):
+        key = self.history.clock().replace(minute=0, second=0, microsecond=0)
+        if key != self._computed_for:
+            self._learned = self.history.has_data()
+            self._busy = frozenset(hour for hour, info in enumerate(self.history.profile()) if info["busy"])
+            self._computed_for = key
+        return self._busy
+
+    def matches(self, dt):
+        busy = self.busy_hours()
+        if not self._learned:
+            return any(blackout.matches(dt) for blackout in self.fallback)
+        return hour_of_week(dt) in busy
+
+    def __repr__(self):
+        return f"LearnedBlackout({sorted(self.busy_hours())})"
+
+def best_offset(history, name, interval, step=datetime.timedelta(minutes=5), now=None):
+    """
+    Offset interval (dari epoch, seperti grid Scheduler) yang run-nya selama seminggu ke
+    depan paling sering jatuh di jam cepat. Di antara offset yang setara (dalam
+    OFFSET_TOLERANCE), pilihan ditentukan crc32(nama), sehingga report tetap tersebar dan
+    semua node memilih offset yang sama selama riwayatnya sama. None jika riwayat belum cukup.
+    """
+    if not history.has_data():
+        return None
+    profile = history.profile()
+    now = (now or history.clock()).timestamp()
+    interval_seconds = int(interval.total_seconds())
+    step_seconds = max(60, min(int(step.total_seconds()), interval_seconds))
+    runs_per_week = max(1, HOURS_PER_WEEK * 3600 // interval_seconds)
+    candidates = []
+    for offset in range(0, interval_seconds, step_seconds):
+        first = (now - offset) // interval_seconds * interval_seconds + offset
+        total = 0.0
+        for k in range(1, runs_per_week + 1):
+            total += profile[hour_of_week(datetime.datetime.fromtimestamp(first + k * interval_seconds))]["score"]
+        candidates.append((total / runs_per_week, offset))
+    best = min(score for score, _ in candidates)
+    good = [offset for score, offset in candidates if score <= best * OFFSET_TOLERANCE]
+    return datetime.timedelta(seconds=good[zlib.crc32(name.encode("utf-8")) % len(good)])
+
+def is_query_request(url):
+    """Request yang membebani server (query/unduhan), bukan login, CSRF atau polling event async."""
+    return not any(part in url for part in ("/login/", "/security/csrf_token/", "/async_event/"))
+
+def load_history_from_config(config, state_dir=".state"):
+    """LoadHistory jika [SCHEDULE] learn_busy_windows aktif, selain itu None."""
+    if not config.getboolean("SCHEDULE", "learn_busy_windows", fallback=False):
+        return None
+    path = config.get("SCHEDULE", "load_history", fallback="").strip() or os.path.join(state_dir, "load_history.json")
+    return LoadHistory(
+        path,
+        min_samples=config.getint("SCHEDULE", "busy_min_samples", fallback=5),
+        busy_factor=config.getfloat("SCHEDULE", "busy_factor", fallback=1.5),
+    )
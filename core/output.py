@@ -0,0 +1,147 @@
+# core/output.py
+import datetime
+import os
+import shutil
+import threading
+from core.tee import TeeOutput, temp_path
+
+LATEST_FILE = "latest"
+
+class OutputLayout:
+    """
+    Menentukan lokasi file output sebuah report.
+
+    - flat        : {output_dir}/{name}.{ext} (ditimpa setiap run)
+    - partitioned : {output_dir}/{name}/date=YYYY-MM-DD/run=HHMMSS-ffffff.{ext}
+                    ditambah file pointer {output_dir}/{name}/latest
+    """
+    def __init__(self, output_dir, layout="flat", fmt="csv", retention_days=0):
+        self.output_dir = output_dir
+        self.layout = layout
+        self.format = fmt
+        self.retention_days = retention_days
+
+    @classmethod
+    def from_config(cls, config, output_dir):
+        return cls(
+            output_dir,
+            layout=config.get("OUTPUT", "layout", fallback="flat").strip().lower(),
+            fmt=config.get("OUTPUT", "format", fallback="csv").strip().lower(),
+            retention_days=config.getint("OUTPUT", "retention_days", fallback=0),
+        )
+
+    @property
+    def is_partitioned(self):
+        return self.layout == "partitioned"
+
+    def new_path(self, name, ext, now=None):
+        """
+        Path tujuan untuk hasil run saat ini (folder partisi dibuat otomatis). Di layout
+        partitioned path-nya unik: tidak pernah sama dengan file run lain, termasuk file
+        `latest` yang dibaca untuk penggabungan watermark/diff.
+        """
+        if not self.is_partitioned:
+            os.makedirs(self.output_dir, exist_ok=True)
+            return os.path.join(self.output_dir, f"{name}.{ext}")
+
+        now = now or datetime.datetime.now()
+        partition = os.path.join(self.output_dir, name, f"date={now:%Y-%m-%d}")
+        os.makedirs(partition, exist_ok=True)
+        # Mikrodetik, plus akhiran jika file itu tetap sudah ada (run lain di mikrodetik yang sama)
+        stem = os.path.join(partition, f"run={now:%H%M%S-%f}")
+        path = f"{stem}.{ext}"
+        suffix = 1
+        while os.path.exists(path):
+            path = f"{stem}-{suffix}.{ext}"
+            suffix += 1
+        return path
+
+    def latest_path(self, name, ext):
+        """Path file hasil run terakhir yang berhasil, None jika belum ada."""
+        if not self.is_partitioned:
+            path = os.path.join(self.output_dir, f"{name}.{ext}")
+            return path if os.path.exists(path) else None
+
+        try:
+            with open(os.path.join(self.output_dir, name, LATEST_FILE), "r", encoding="utf-8") as f:
+                relative = f.read().strip()
+        except FileNotFoundError:
+            return None
+        path = os.path.join(self.output_dir, name, relative)
+        return path if relative.endswith(f".{ext}") and os.path.exists(path) else None
+
+    def publish(self, name, path):
+        """Perbarui pointer `latest` secara atomik agar menunjuk ke file yang baru ditulis."""
+        if not self.is_partitioned:
+            return
+        report_dir = os.path.join(self.output_dir, name)
+        relative = os.path.relpath(path, report_dir).replace(os.sep, "/")
+        pointer = os.path.join(report_dir, LATEST_FILE)
+        tmp_pointer = temp_path(pointer)
+        with open(tmp_pointer, "w", encoding="utf-8") as f:
+            f.write(relative)
+        os.replace(tmp_pointer, pointer)
+
+    def prune(self, name, today=None):
+        """Hapus partisi date=... yang lebih tua dari retention_days (partisi `latest` tidak pernah dihapus)."""
+        if not self.is_partitioned or self.retention_days <= 0:
+            return []
+
+        report_dir = os.path.join(self.output_dir, name)
+        today = today or datetime.date.today()
+        cutoff = today - datetime.timedelta(days=self.retention_days)
+
+        latest_partition = None
+        try:
+            with open(os.path.join(report_dir, LATEST_FILE), "r", encoding="utf-8") as f:
+                latest_partition = f.read().strip().split("/")[0]
+        except FileNotFoundError:
+            pass
+
+        removed = []
+        for entry in os.listdir(report_dir):
+            if not entry.startswith("date=") or entry == latest_partition:
+                continue
+            try:
+                partition_date = datetime.date.fromisoformat(entry[len("date="):])
+            except ValueError:
+                continue
+            if partition_date < cutoff:
+                shutil.rmtree(os.path.join(report_dir, entry), ignore_errors=True)
+                removed.append(entry)
+        return removed
+
+    def prune_in_background(self, name):
+        if not self.is_partitioned or self.retention_days <= 0:
+            return None
+        thread = threading.Thread(target=self.prune, args=(name,), name=f"prune-{name}")
+        thread.start()
+        return thread
+
+def write_frame(df, path, fmt="csv", targets=(), relative=None, publish=None):
+    """
+    Tulis DataFrame ke file sementara lalu os.replace ke path akhir,
+    sehingga file hasil run sebelumnya tetap utuh jika penulisan gagal.
+    Dengan `targets` (core/tee.py), bytes yang sama sekaligus ditulis ke mirror/arsip;
+    `publish()` dipanggil begitu file lokal selesai, sebelum menunggu tujuan tambahan.
+    Mengembalikan catatan hasil per tujuan tambahan.
+    """
+    # dtype ringkas di memori dilebarkan lagi agar isi/skema file sama di setiap run
+    from core.frames import storage_frame
+
+    with TeeOutput(path, targets, relative, publish=publish) as out:
+        if fmt == "parquet":
+            storage_frame(df).to_parquet(out, index=False)
+        else:
+            storage_frame(df, keep_categories=True).to_csv(out, index=False)
+    return out.notes
+
+def read_frame(path, as_text=False):
+    """Baca file output; as_text=True membaca CSV sebagai teks mentah (tanpa inferensi tipe/NaN)."""
+    import pandas as pd
+
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    if as_text:
+        return pd.read_csv(path, dtype=str, keep_default_na=False)
+    return pd.read_csv(path)
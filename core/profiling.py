@@ -0,0 +1,168 @@
+# core/profiling.py
+import contextlib
+import datetime
+import json
+import os
+import sys
+import threading
+import time
+
+class RunTracer:
+    """
+    Profiling opsional untuk satu run ekstraksi.
+
+    - span(): mencatat durasi tiap fase (login, antre, server, transfer, decode, save)
+      sebagai event Chrome trace (buka dengan chrome://tracing atau Perfetto).
+    - cprofile: satu cProfile untuk seluruh proses (Python 3.12+, semua thread) atau
+      cProfile per ReportWorker di versi lama; hasilnya satu file .prof.
+    - tracemalloc: alokasi memori terbesar dan puncak pemakaian memori run.
+
+    Jika tidak aktif, semua method menjadi no-op sehingga hampir tanpa overhead.
+    """
+    def __init__(self, enabled=False, cprofile=False, tracemalloc=False):
+        self.enabled = enabled
+        self.cprofile = enabled and cprofile
+        self.tracemalloc = enabled and tracemalloc
+        self.events = []
+        self.started_at = None
+        self._origin = time.perf_counter()
+        self._profiles = []
+        self._process_profile = None
+        self._thread_names = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        # Dibaca ulang setiap run, sehingga bisa diaktifkan dari config.ini tanpa restart
+        return cls(
+            enabled=config.getboolean("PROFILING", "enabled", fallback=False),
+            cprofile=config.getboolean("PROFILING", "cprofile", fallback=False),
+            tracemalloc=config.getboolean("PROFILING", "tracemalloc", fallback=False),
+        )
+
+    def _now_us(self):
+        return (time.perf_counter() - self._origin) * 1_000_000
+
+    def add_span(self, name, category, start_us, end_us, **args):
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start_us,
+            "dur": max(0.0, end_us - start_us),
+            "pid": os.getpid(),
+            "tid": thread.ident,
+            "args": args,
+        }
+        with self._lock:
+            self._thread_names[thread.ident] = thread.name
+            self.events.append(event)
+
+    @contextlib.contextmanager
+    def _span(self, name, category, args):
+        start_us = self._now_us()
+        try:
+            yield
+        finally:
+            self.add_span(name, category, start_us, self._now_us(), **args)
+
+    def span(self, name, category="run", **args):
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._span(name, category, args)
+
+    def mark(self):
+        """Timestamp (mikrodetik) untuk span yang awal dan akhirnya di thread berbeda (mis. antrean)."""
+        return self._now_us() if self.enabled else None
+
+    def start(self):
+        if not self.enabled:
+            return
+        self.started_at = datetime.datetime.now()
+        if self.tracemalloc:
+            import tracemalloc
+            tracemalloc.start()
+
+    def enable_profiler(self):
+        """
+        Aktifkan satu cProfile untuk seluruh proses. Sejak Python 3.12 cProfile memakai
+        sys.monitoring yang berlaku untuk semua thread, dan hanya satu profiler boleh aktif:
+        enable() di beberapa thread sekaligus akan gagal dengan ValueError. Di versi lama
+        profil diambil per thread lewat profile_call().
+        """
+        if not self.cprofile or sys.version_info < (3, 12):
+            return
+        import cProfile
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Profiler lain sudah aktif di proses ini (mis. aplikasi dijalankan di bawah cProfile)
+            print(f"[WARNING] cProfile tidak diaktifkan: {e}")
+            self.cprofile = False
+            return
+        self._process_profile = profile
+
+    def disable_profiler(self):
+        profile, self._process_profile = self._process_profile, None
+        if profile is None:
+            return
+        profile.disable()
+        with self._lock:
+            self._profiles.append(profile)
+
+    def profile_call(self, func, *args, **kwargs):
+        """Jalankan func di bawah cProfile per thread (Python < 3.12) jika diaktifkan."""
+        if not self.cprofile or sys.version_info >= (3, 12):
+            # Di 3.12+ thread ini sudah tercakup profiler proses dari enable_profiler()
+            return func(*args, **kwargs)
+        import cProfile
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            with self._lock:
+                self._profiles.append(profile)
+
+    def finish(self, output_dir):
+        """Tulis hasil profiling ke {output_dir}/_profiling/. Mengembalikan path trace atau None."""
+        if not self.enabled:
+            return None
+        self.disable_profiler()
+
+        profiling_dir = os.path.join(output_dir, "_profiling")
+        os.makedirs(profiling_dir, exist_ok=True)
+        prefix = os.path.join(profiling_dir, f"run-{self.started_at or datetime.datetime.now():%Y%m%d-%H%M%S}")
+
+        with self._lock:
+            events = list(self.events)
+            events.extend(
+                {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+                for tid, name in self._thread_names.items()
+            )
+            profiles = list(self._profiles)
+
+        trace_path = f"{prefix}.trace.json"
+        with open(trace_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+        if profiles:
+            import pstats
+            stats = pstats.Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(f"{prefix}.prof")
+
+        if self.tracemalloc:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                top_stats = tracemalloc.take_snapshot().statistics("lineno")[:25]
+                tracemalloc.stop()
+                with open(f"{prefix}.memory.txt", "w", encoding="utf-8") as f:
+                    f.write(f"Current: {current / 1024 / 1024:.1f} MB, Peak: {peak / 1024 / 1024:.1f} MB\n\n")
+                    for stat in top_stats:
+                        f.write(f"{stat}\n")
+
+        return trace_path
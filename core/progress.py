@@ -0,0 +1,115 @@
+# core/progress.py
+import threading
+import time
+
+# Bobot default (bytes) untuk report yang ukurannya belum diketahui
+DEFAULT_WEIGHT_BYTES = 1024 * 1024
+
+class ReportProgress:
+    def __init__(self, name, clock):
+        self.name = name
+        self.clock = clock
+        self.started_at = clock()
+        self.bytes_received = 0
+        self.bytes_total = None
+        self.rows_written = None
+        self.done = False
+        self.success = None
+
+    def fraction(self):
+        if self.done:
+            return 1.0
+        if self.bytes_total:
+            return min(1.0, self.bytes_received / self.bytes_total)
+        return 0.0
+
+    def throughput(self):
+        """Bytes per detik sejak report mulai."""
+        elapsed = self.clock() - self.started_at
+        return self.bytes_received / elapsed if elapsed > 0 else 0.0
+
+    def eta_seconds(self):
+        if self.done or not self.bytes_total:
+            return None
+        rate = self.throughput()
+        if rate <= 0:
+            return None
+        return max(0.0, (self.bytes_total - self.bytes_received) / rate)
+
+    def snapshot(self):
+        return {
+            "bytes_received": self.bytes_received,
+            "bytes_total": self.bytes_total,
+            "rows_written": self.rows_written,
+            "throughput": self.throughput(),
+            "eta_seconds": self.eta_seconds(),
+            "percent": int(self.fraction() * 100),
+            "done": self.done,
+            "success": self.success,
+        }
+
+class ProgressTracker:
+    """
+    Mengumpulkan progres per report (bytes, baris, throughput, ETA) dan menghitung
+    progres keseluruhan yang dibobot dengan ukuran report.
+
+    Event diteruskan ke callback paling sering setiap `min_interval` detik per report,
+    agar event loop Qt tidak kebanjiran sinyal dari thread download.
+    """
+    def __init__(self, names, on_report=None, on_overall=None, min_interval=0.25, clock=time.monotonic):
+        self.clock = clock
+        self.reports = {name: ReportProgress(name, clock) for name in names}
+        self.on_report = on_report
+        self.on_overall = on_overall
+        self.min_interval = min_interval
+        self._last_emit = {}
+        self._last_overall = None
+        self._lock = threading.Lock()
+
+    def start(self, name):
+        with self._lock:
+            self.reports[name].started_at = self.clock()
+
+    def bytes_progress(self, name, received, total=None):
+        with self._lock:
+            report = self.reports[name]
+            report.bytes_received = received
+            if total:
+                report.bytes_total = total
+        self._emit(name)
+
+    def finish(self, name, success, rows_written=None):
+        with self._lock:
+            report = self.reports[name]
+            report.done = True
+            report.success = success
+            if rows_written is not None:
+                report.rows_written = rows_written
+        self._emit(name, force=True)
+
+    def overall_percent(self):
+        with self._lock:
+            known = [r.bytes_total for r in self.reports.values() if r.bytes_total]
+            default_weight = sorted(known)[len(known) // 2] if known else DEFAULT_WEIGHT_BYTES
+            total_weight = 0.0
+            done_weight = 0.0
+            for report in self.reports.values():
+                weight = report.bytes_total or max(report.bytes_received, default_weight)
+                total_weight += weight
+                done_weight += weight * report.fraction()
+        return int(done_weight / total_weight * 100) if total_weight else 100
+
+    def _emit(self, name, force=False):
+        now = self.clock()
+        with self._lock:
+            if not force and now - self._last_emit.get(name, 0) < self.min_interval:
+                return
+            self._last_emit[name] = now
+            snapshot = self.reports[name].snapshot()
+        if self.on_report:
+            self.on_report(name, snapshot)
+        if self.on_overall:
+            overall = self.overall_percent()
+            if overall != self._last_overall:
+                self._last_overall = overall
+                self.on_overall(overall)
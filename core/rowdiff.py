@@ -0,0 +1,163 @@
+# core/rowdiff.py
+import json
+import os
+import numpy as np
+
+# Entri indeks lama yang dibandingkan sekaligus; indeks lama dibaca memory-mapped per chunk
+DIFF_CHUNK_ROWS = 1000000
+
+# Baris yang di-hash sekaligus; kolom teks diubah sementara menjadi objek Python per chunk
+HASH_CHUNK_ROWS = 100000
+
+# Satu entri per baris: hash kolom key dan hash seluruh baris (16 bytes), urut menurut key
+INDEX_DTYPE = np.dtype([("key", "<u8"), ("row", "<u8")])
+
+# Kolom pertama file delta: insert, update atau delete
+OP_COLUMN = "_op"
+
+def delta_path(path):
+    """File delta di samping file output: {stem}.delta.csv."""
+    return f"{os.path.splitext(path)[0]}.delta.csv"
+
+class RowDiff:
+    """
+    Indeks hash baris per report untuk menghasilkan file delta (baris baru, berubah,
+    dihapus) dibandingkan run sebelumnya, tanpa membaca ulang file output lama.
+
+    Indeks disimpan di {state_dir}/row_index/{name}: array hash (.npy, 16 bytes per baris)
+    dan nilai kolom key sebagai teks (.keys.csv, hanya dibaca untuk baris yang dihapus),
+    plus .json yang ditulis paling akhir sebagai tanda indeks lengkap. Indeks lama dibaca
+    memory-mapped per chunk, sehingga memori tambahan hanya sebanding dengan hash hasil
+    run ini, bukan dengan seluruh isi report.
+
+    Pemakaian: write_delta(df, out) lalu commit() setelah delta berhasil ditulis. Tanpa
+    commit, run berikutnya dibandingkan lagi dengan indeks lama, sehingga delta yang gagal
+    tidak membuat perubahan hilang.
+    """
+    def __init__(self, state_dir, name, key):
+        self.key = [key] if isinstance(key, str) else list(key)
+        base = os.path.join(state_dir, "row_index", name)
+        self.index_path = f"{base}.npy"
+        self.keys_path = f"{base}.keys.csv"
+        self.meta_path = f"{base}.json"
+        self.inserted = self.updated = self.deleted = self.duplicates = 0
+        self._keys = self._rows = self._order = None
+        self._key_frame = None
+
+    def _load_index(self):
+        """Indeks lama (memory-mapped), None jika belum ada, tidak lengkap, atau key-nya berbeda."""
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            index = np.load(self.index_path, mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            return None
+        if meta.get("key") != self.key or meta.get("rows") != len(index) or index.dtype != INDEX_DTYPE:
+            return None
+        if not os.path.exists(self.keys_path) or os.path.getsize(self.keys_path) != meta.get("keys_bytes"):
+            return None
+        return index
+
+    def _hash(self, df):
+        import pandas as pd
+        from core.frames import storage_frame
+
+        missing = [column for column in self.key if column not in df.columns]
+        if missing:
+            raise ValueError(f"kolom key diff tidak ditemukan: {', '.join(missing)}")
+        keys = np.empty(len(df), dtype=np.uint64)
+        rows = np.empty(len(df), dtype=np.uint64)
+        for start in range(0, len(df), HASH_CHUNK_ROWS):
+            # dtype sama seperti di file output, agar hash tidak berubah karena lebar hasil downcast
+            chunk = storage_frame(df.iloc[start:start + HASH_CHUNK_ROWS], keep_categories=True)
+            stop = start + len(chunk)
+            keys[start:stop] = pd.util.hash_pandas_object(chunk[self.key], index=False).to_numpy()
+            rows[start:stop] = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        # Key ganda: versi terakhir yang dipakai (sama seperti penggabungan watermark)
+        last = np.ones(len(keys), dtype=bool)
+        last[:-1] = keys[1:] != keys[:-1]
+        self.duplicates = int(len(keys) - last.sum())
+        if self.duplicates:
+            keys, order = keys[last], order[last]
+        self._keys, self._rows, self._order = keys, rows[order], order
+        self._key_frame = df[self.key]
+
+    def write_delta(self, df, out):
+        """
+        Bandingkan `df` dengan indeks lama dan tulis delta CSV ke file biner `out`
+        (mis. TeeOutput): kolom `_op` lalu semua kolom report. Baris delete hanya berisi
+        kolom key. Tanpa indeks lama, semua baris ditulis sebagai insert.
+        """
+        from core.frames import storage_frame
+
+        self._hash(df)
+        keys, rows = self._keys, self._rows
+        count = len(keys)
+        seen = np.zeros(count, dtype=bool)
+        changed = np.zeros(count, dtype=bool)
+        deleted = []
+        old = self._load_index()
+        if old is not None:
+            for start in range(0, len(old), DIFF_CHUNK_ROWS):
+                chunk = np.asarray(old[start:start + DIFF_CHUNK_ROWS])
+                positions = np.searchsorted(keys, chunk["key"])
+                found = positions < count
+                found[found] = keys[positions[found]] == chunk["key"][found]
+                deleted.append(np.flatnonzero(~found) + start)
+                positions = positions[found]
+                seen[positions] = True
+                changed[positions] = rows[positions] != chunk["row"][found]
+        deleted = np.concatenate(deleted) if deleted else np.empty(0, dtype=np.int64)
+
+        inserts = self._order[~seen]
+        updates = self._order[seen & changed]
+        self.inserted, self.updated, self.deleted = len(inserts), len(updates), len(deleted)
+
+        # Insert/update dalam urutan baris aslinya, dengan dtype yang sama seperti file output
+        positions = np.concatenate([inserts, updates])
+        ops = np.concatenate([np.full(len(inserts), "insert", dtype=object), np.full(len(updates), "update", dtype=object)])
+        arrangement = np.argsort(positions, kind="stable")
+        upserts = storage_frame(df.iloc[positions[arrangement]], keep_categories=True)
+        upserts.insert(0, OP_COLUMN, ops[arrangement])
+        upserts.to_csv(out, index=False)
+        if len(deleted):
+            self._write_deletes(old, deleted, list(df.columns), out)
+
+    def _write_deletes(self, old, deleted, columns, out):
+        """Baris delete: nilai key dibaca dari .keys.csv lama per chunk, hanya posisi yang dihapus."""
+        import pandas as pd
+
+        offset = 0
+        for chunk in pd.read_csv(self.keys_path, dtype=str, keep_default_na=False, chunksize=DIFF_CHUNK_ROWS):
+            lo, hi = np.searchsorted(deleted, [offset, offset + len(chunk)])
+            if hi > lo:
+                picked = chunk.iloc[deleted[lo:hi] - offset].reset_index(drop=True)
+                rows = pd.DataFrame({OP_COLUMN: "delete", **{column: picked[column] if column in self.key else "" for column in columns}})
+                rows.to_csv(out, index=False, header=False)
+            offset += len(chunk)
+        if offset != len(old):
+            raise ValueError(f"indeks diff rusak: {offset} key untuk {len(old)} baris")
+
+    def commit(self):
+        """Simpan indeks run ini; .json ditulis terakhir sebagai tanda indeks lengkap."""
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        if os.path.exists(self.meta_path):
+            os.remove(self.meta_path)
+        index = np.empty(len(self._keys), dtype=INDEX_DTYPE)
+        index["key"] = self._keys
+        index["row"] = self._rows
+        with open(f"{self.index_path}.tmp", "wb") as f:
+            np.save(f, index)
+        del index
+        # Nilai key ditulis sebagai teks seperti di file output, urut sesuai indeks
+        from core.frames import storage_frame
+
+        storage_frame(self._key_frame.iloc[self._order], keep_categories=True).to_csv(f"{self.keys_path}.tmp", index=False)
+        os.replace(f"{self.index_path}.tmp", self.index_path)
+        os.replace(f"{self.keys_path}.tmp", self.keys_path)
+        meta = {"key": self.key, "rows": len(self._keys), "keys_bytes": os.path.getsize(self.keys_path)}
+        with open(f"{self.meta_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(f"{self.meta_path}.tmp", self.meta_path)
@@ -0,0 +1,293 @@
+# core/scheduler.py
+import datetime
+import heapq
+import math
+import zlib
+from core.load_profile import LearnedBlackout, best_offset
+
+# Seberapa sering antrean diperiksa oleh timer Qt
+SCHEDULER_TICK_MS = 15 * 1000
+
+# Batas atas pencarian waktu cron berikutnya (satu tahun + 1 hari)
+MAX_LOOKAHEAD_MINUTES = 367 * 24 * 60
+
+class CronExpression:
+    """
+    Ekspresi cron 5 field: menit jam hari-bulan bulan hari-minggu.
+    Mendukung `*`, `*/n`, `a-b`, `a-b/n` dan daftar `a,b,c`. Hari-minggu 0/7 = Minggu.
+    """
+    RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression):
+        self.expression = expression.strip()
+        fields = self.expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Ekspresi cron harus 5 field: '{expression}'")
+
+        parsed = [self._parse_field(field, low, high) for field, (low, high) in zip(fields, self.RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # Normalisasi: 7 juga berarti Minggu
+        self.weekdays = {0 if d == 7 else d for d in weekdays}
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse_field(field, low, high):
+        values = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step_text = part.split("/", 1)
+                step = int(step_text)
+                if step < 1:
+                    raise ValueError(f"Step cron tidak valid: '{field}'")
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start_text, end_text = part.split("-", 1)
+                start, end = int(start_text), int(end_text)
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+            if start < low or end > high or start > end:
+                raise ValueError(f"Nilai cron di luar jangkauan {low}-{high}: '{field}'")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, dt):
+        # cron: jika kedua field hari dibatasi, cukup salah satu yang cocok
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.isoweekday() % 7) in self.weekdays
+        if self.any_day:
+            return weekday_ok
+        if self.any_weekday:
+            return day_ok
+        return day_ok or weekday_ok
+
+    def matches(self, dt):
+        return (
+            dt.minute in self.minutes
+            and dt.hour in self.hours
+            and dt.month in self.months
+            and self._day_matches(dt)
+        )
+
+    def next_after(self, dt):
+        """Menit pertama setelah `dt` yang cocok dengan ekspresi ini."""
+        candidate = dt.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        for _ in range(MAX_LOOKAHEAD_MINUTES):
+            if candidate.month not in self.months or not self._day_matches(candidate):
+                candidate = (candidate + datetime.timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + datetime.timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += datetime.timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Ekspresi cron tidak pernah cocok: '{self.expression}'")
+
+    def __repr__(self):
+        return f"CronExpression('{self.expression}')"
+
+def load_blackouts(config, history=None):
+    """
+    Baca blackout window dari [SCHEDULE] blackout (beberapa ekspresi cron dipisah ';').
+    Jika tidak diset, gunakan aturan lama: `busy_minutes` pertama di setiap jam genap.
+    Dengan `history` (LoadHistory), jam sibuk hasil belajar menggantikan aturan lama
+    begitu riwayatnya cukup; blackout cron eksplisit tetap berlaku.
+    """
+    text = config.get("SCHEDULE", "blackout", fallback="").strip()
+    if text:
+        blackouts = [CronExpression(part) for part in text.split(";") if part.strip()]
+        return blackouts + [LearnedBlackout(history)] if history is not None else blackouts
+    busy_minutes = config.getint("SERVER", "busy_minutes", fallback=35)
+    fallback = [CronExpression(f"0-{busy_minutes - 1} */2 * * *")] if busy_minutes > 0 else []
+    if history is not None:
+        return [LearnedBlackout(history, fallback)]
+    return fallback
+
+class Scheduler:
+    """
+    Penjadwal per report berbasis priority queue.
+
+    Report dengan opsi `schedule` (ekspresi cron) berjalan sesuai cron-nya.
+    Report lain berjalan setiap `interval_minutes`, dengan offset tetap per
+    nama report sehingga beban tersebar merata di sepanjang interval.
+    Slot interval dihitung dari epoch, bukan dari waktu proses dimulai, sehingga
+    semua node cluster menghitung slot yang sama untuk report yang sama.
+    Dengan `history` (LoadHistory), offset dipilih dari jam-jam tercepat server
+    (dihitung ulang sekali sehari); tanpa riwayat yang cukup, offset dari nama report.
+    `clock` bisa diganti dengan jam simulasi untuk pengujian.
+    """
+    def __init__(self, interval_minutes=120, blackouts=None, clock=None, history=None):
+        self.interval = datetime.timedelta(minutes=max(1, interval_minutes))
+        self.blackouts = list(blackouts or [])
+        self.clock = clock or datetime.datetime.now
+        self._queue = []      # heap berisi (waktu_jatuh_tempo, urutan, nama)
+        self._jobs = {}       # nama -> (schedule, urutan entry aktif)
+        self._counter = 0
+        self.slots = {}       # nama -> waktu jatuh tempo slot yang terakhir diambil pop_due()
+        self._deferred = {}   # nama -> slot asli report yang ditunda lewat defer()
+        self._warmed = {}     # nama -> waktu jatuh tempo yang cache-nya sudah dipanaskan
+        self.history = history
+        self._offsets = {}    # nama -> offset hasil belajar, berlaku untuk _offsets_day
+        self._offsets_day = None
+
+    def _push(self, name, due, schedule):
+        self._counter += 1
+        self._jobs[name] = (schedule, self._counter)
+        heapq.heappush(self._queue, (due, self._counter, name))
+
+    def _stagger_offset(self, name):
+        if self.history is not None:
+            offset = self._learned_offset(name)
+            if offset is not None:
+                return offset
+        # crc32 stabil antar proses (hash() bawaan Python diacak per proses)
+        seconds = int(self.interval.total_seconds())
+        return datetime.timedelta(seconds=zlib.crc32(name.encode("utf-8")) % seconds)
+
+    def _learned_offset(self, name):
+        # Dihitung dari tengah malam lokal agar semua node dengan riwayat sama memilih offset sama
+        midnight = datetime.datetime.combine(self.clock().date(), datetime.time())
+        if self._offsets_day != midnight:
+            self._offsets = {}
+            self._offsets_day = midnight
+        if name not in self._offsets:
+            self._offsets[name] = best_offset(self.history, name, self.interval, now=midnight)
+        return self._offsets[name]
+
+    def _grid_due(self, name, after):
+        """Slot interval pertama setelah `after`: epoch + offset report + kelipatan interval."""
+        step = self.interval.total_seconds()
+        offset = self._stagger_offset(name).total_seconds()
+        index = math.floor((after.timestamp() - offset) / step) + 1
+        return datetime.datetime.fromtimestamp(index * step + offset)
+
+    def _first_due(self, name, schedule, now):
+        if schedule:
+            return CronExpression(schedule).next_after(now - datetime.timedelta(minutes=1))
+        return self._grid_due(name, now)
+
+    def _next_due(self, name, schedule, previous_due, now):
+        if schedule:
+            return CronExpression(schedule).next_after(now)
+        # Slot berikutnya di grid; jika tertinggal (mis. komputer sleep atau job ditunda), lompat ke depan
+        return self._grid_due(name, max(previous_due, now))
+
+    def sync(self, reports):
+        """Samakan antrean dengan daftar report: tambah yang baru, buang yang dihapus/berubah jadwal."""
+        now = self.clock()
+        for name, info in reports.items():
+            schedule = (info or {}).get("schedule") or None
+            if name not in self._jobs or self._jobs[name][0] != schedule:
+                self._push(name, self._first_due(name, schedule, now), schedule)
+        for name in list(self._jobs):
+            if name not in reports:
+                del self._jobs[name]
+
+    def _discard_stale(self):
+        while self._queue:
+            due, counter, name = self._queue[0]
+            if name in self._jobs and self._jobs[name][1] == counter:
+                return
+            heapq.heappop(self._queue)
+
+    def in_blackout(self, dt=None):
+        dt = dt or self.clock()
+        return any(blackout.matches(dt) for blackout in self.blackouts)
+
+    def blackout_end(self, dt=None):
+        """Waktu pertama (dibulatkan ke menit) setelah blackout yang sedang berlangsung selesai."""
+        dt = dt or self.clock()
+        if not self.in_blackout(dt):
+            return dt
+        candidate = dt.replace(second=0, microsecond=0)
+        for _ in range(MAX_LOOKAHEAD_MINUTES):
+            candidate += datetime.timedelta(minutes=1)
+            if not self.in_blackout(candidate):
+                return candidate
+        raise ValueError("Blackout window tidak pernah berakhir")
+
+    def next_due(self):
+        """Waktu eksekusi berikutnya (sudah memperhitungkan blackout), None jika antrean kosong."""
+        self._discard_stale()
+        if not self._queue:
+            return None
+        return self.blackout_end(self._queue[0][0])
+
+    def pop_due(self, now=None):
+        """
+        Ambil semua report yang sudah jatuh tempo dan jadwalkan ulang.
+        Selama blackout tidak ada yang diambil; job tetap menunggu di antrean.
+        """
+        now = now or self.clock()
+        if self.in_blackout(now):
+            return []
+
+        due_names = []
+        while True:
+            self._discard_stale()
+            if not self._queue or self._queue[0][0] > now:
+                break
+            due, _, name = heapq.heappop(self._queue)
+            schedule = self._jobs[name][0]
+            due_names.append(name)
+            # Report yang ditunda tetap membawa slot aslinya, agar kunci lease sama di semua node
+            self.slots[name] = self._deferred.pop(name, due)
+            self._push(name, self._next_due(name, schedule, due, now), schedule)
+        return due_names
+
+    def warmup_at(self, due, lead):
+        """
+        Waktu mulai pemanasan cache untuk run pada `due`: `lead` sebelum run efektif
+        (setelah blackout). Jika waktu itu jatuh di blackout, jendela pemanasan dipindah ke
+        `lead` sebelum blackout dimulai, karena selama blackout server tidak boleh dibebani.
+        """
+        start = self.blackout_end(due) - lead
+        if not self.in_blackout(start):
+            return start
+        candidate = start.replace(second=0, microsecond=0)
+        for _ in range(MAX_LOOKAHEAD_MINUTES):
+            candidate -= datetime.timedelta(minutes=1)
+            if not self.in_blackout(candidate):
+                return candidate + datetime.timedelta(minutes=1) - lead
+        raise ValueError("Blackout window tidak pernah berakhir")
+
+    def pop_warmup(self, lead, now=None):
+        """
+        Report yang run berikutnya sudah masuk jendela pemanasan dan belum dipanaskan untuk
+        slot tersebut. Mengembalikan dict nama -> waktu run efektif. Selama blackout kosong.
+        """
+        now = now or self.clock()
+        if lead.total_seconds() <= 0 or self.in_blackout(now):
+            return {}
+        self._discard_stale()
+        names = {}
+        for due, counter, name in self._queue:
+            if self._jobs.get(name, (None, None))[1] != counter or self._warmed.get(name) == due:
+                continue
+            run_at = self.blackout_end(due)
+            if self.warmup_at(due, lead) <= now < run_at:
+                self._warmed[name] = due
+                names[name] = run_at
+        return names
+
+    def slot_of(self, name):
+        """Slot (epoch detik) yang terakhir diambil untuk report ini, kunci lease di mode cluster."""
+        due = self.slots.get(name)
+        return int(due.timestamp()) if due else None
+
+    def defer(self, name, until):
+        """Tunda satu report hingga waktu tertentu (mis. server belum pulih)."""
+        if name in self._jobs:
+            if name in self.slots:
+                self._deferred.setdefault(name, self.slots[name])
+            self._push(name, until, self._jobs[name][0])
+
+    def defer_until_epoch(self, names, epoch_seconds):
+        """Tunda beberapa report hingga waktu epoch (mis. retry_at dari circuit breaker)."""
+        until = datetime.datetime.fromtimestamp(epoch_seconds)
+        for name in names:
+            self.defer(name, until)
+        return until
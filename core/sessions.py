@@ -0,0 +1,158 @@
+# core/sessions.py
+import threading
+import weakref
+import requests
+
+class AuthStore:
+    """
+    State autentikasi yang dipakai bersama semua session: cookie (mis. cookie session
+    Superset) dan token CSRF, dibaca dan diubah di bawah satu lock.
+
+    Token CSRF Superset terikat pada cookie session, jadi keduanya hanya diganti bersama
+    saat login selesai (commit_login). `version` naik setiap ada perubahan, sehingga session
+    per thread tahu kapan harus menyalin ulang cookie; `logins` naik setiap login selesai,
+    sehingga login ulang cukup dilakukan satu thread meski banyak thread mendapat 401.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cookies = requests.cookies.RequestsCookieJar()
+        self._csrf_token = None
+        self.version = 0
+        self.logins = 0
+        # Naik setiap login gagal, agar thread yang menunggu login itu tidak mengulangnya satu per satu
+        self.failed_logins = 0
+        # Dipegang selama login ulang; thread lain yang butuh login ulang menunggu hasilnya
+        self.refresh_lock = threading.RLock()
+
+    @property
+    def csrf_token(self):
+        with self._lock:
+            return self._csrf_token
+
+    def commit_login(self, cookies, token):
+        """Ganti cookie dan token CSRF sekaligus dengan hasil login; mengembalikan (version, logins)."""
+        with self._lock:
+            self._cookies = cookies
+            self._csrf_token = token
+            self.version += 1
+            self.logins += 1
+            return self.version, self.logins
+
+    def login_failed(self):
+        with self._lock:
+            self.failed_logins += 1
+
+    def merge_cookies(self, cookies, logins, known_version):
+        """
+        Tambahkan cookie dari response (mis. session yang diperpanjang) ke store, kecuali
+        request-nya dikirim sebelum login terakhir. Mengembalikan versi baru jika session
+        pemanggil kini persis sama dengan store (tidak ada perubahan lain sejak
+        `known_version`), selain itu None.
+        """
+        with self._lock:
+            if logins != self.logins:
+                return None
+            current = self.version == known_version
+            self._cookies.update(cookies)
+            self.version += 1
+            return self.version if current else None
+
+    def snapshot(self):
+        """(version, logins, salinan cookie jar) yang konsisten."""
+        with self._lock:
+            return self.version, self.logins, self._cookies.copy()
+
+class SessionPool:
+    """
+    Satu requests.Session per thread (requests.Session tidak dijamin thread-safe), dengan
+    cookie yang disinkronkan dari AuthStore. Header session tidak pernah diubah; token CSRF
+    dikirim per request oleh CommandExecutor. Cookie baru dari response dikembalikan ke
+    store, sehingga perubahan di satu thread langsung berlaku untuk semua thread.
+
+    Selama login (begin_login sampai commit_login), cookie dan token thread tersebut
+    terpisah dari store: thread lain tetap memakai session lama sampai login selesai.
+    """
+    def __init__(self, auth):
+        self.auth = auth
+        self._local = threading.local()
+        self._sessions = weakref.WeakSet()
+        self._sessions_lock = threading.Lock()
+
+    def session(self):
+        """Session milik thread pemanggil, dengan cookie terbaru dari store."""
+        local = self._local
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+            local.version = None
+            local.pending_token = None
+            local.logging_in = False
+            with self._sessions_lock:
+                self._sessions.add(session)
+        if not local.logging_in and local.version != self.auth.version:
+            local.version, local.logins, session.cookies = self.auth.snapshot()
+        return session
+
+    @property
+    def csrf_token(self):
+        """Token CSRF untuk request thread ini (token login yang sedang berjalan, atau milik store)."""
+        self.session()
+        return self._local.pending_token if self._local.logging_in else self.auth.csrf_token
+
+    @property
+    def logins(self):
+        """Nomor login yang cookie-nya dipakai session thread ini."""
+        return getattr(self._local, "logins", None)
+
+    def begin_login(self):
+        """Mulai login di thread ini dengan cookie kosong, tanpa menyentuh store."""
+        session = self.session()
+        self._local.logging_in = True
+        self._local.pending_token = None
+        session.cookies = requests.cookies.RequestsCookieJar()
+
+    def set_login_token(self, token):
+        if not self._local.logging_in:
+            raise RuntimeError("Token CSRF hanya bisa diganti di dalam proses login (begin_login).")
+        self._local.pending_token = token
+
+    def commit_login(self):
+        """Terbitkan cookie dan token hasil login thread ini ke store untuk semua thread."""
+        session = self.session()
+        local = self._local
+        local.version, local.logins = self.auth.commit_login(session.cookies.copy(), local.pending_token)
+        local.logging_in = False
+        local.pending_token = None
+
+    def abort_login(self):
+        """
+        Buang login thread ini yang belum di-commit (mis. request login gagal): session kembali
+        memakai cookie dan token store, dan kegagalannya dicatat untuk thread yang menunggu.
+        Tidak melakukan apa pun jika tidak ada login yang berjalan.
+        """
+        local = self._local
+        if not getattr(local, "logging_in", False):
+            return
+        local.logging_in = False
+        local.pending_token = None
+        local.version = None # Cookie store disalin ulang pada request berikutnya
+        self.auth.login_failed()
+
+    def publish(self, response, logins):
+        """Kirim cookie yang di-set response (termasuk redirect) ke store untuk thread lain."""
+        if self._local.logging_in:
+            return
+        cookies = requests.cookies.RequestsCookieJar()
+        for hop in list(response.history) + [response]:
+            cookies.update(hop.cookies)
+        if not len(cookies):
+            return
+        # requests sudah memasukkan cookie ini ke session thread ini; jika ditolak store
+        # (response dari sebelum login terakhir), session disalin ulang pada request berikutnya
+        self._local.version = self.auth.merge_cookies(cookies, logins, self._local.version)
+
+    def close(self):
+        with self._sessions_lock:
+            sessions = list(self._sessions)
+        for session in sessions:
+            session.close()
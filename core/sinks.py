@@ -0,0 +1,214 @@
+# core/sinks.py
+import contextlib
+import csv
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# Jumlah baris yang dikonversi ke objek Python sekaligus saat bulk insert SQLite
+INSERT_BATCH_ROWS = 10000
+
+# Writer SQLite lain (thread/proses lain) ditunggu selama ini sebelum "database is locked"
+SQLITE_TIMEOUT_SECONDS = 300
+
+# File DuckDB hanya bisa dibuka satu proses penulis; penulis lain (proses engine, process
+# pool, node lain di mesin yang sama) ditunggu selama ini lewat file {database}.lock
+DUCKDB_LOCK_TIMEOUT_SECONDS = 300
+
+# Thread di proses ini menulis bergiliran sebelum berebut file lock antar proses
+_duckdb_lock = threading.Lock()
+
+@contextlib.contextmanager
+def _file_lock(path, timeout):
+    """Kunci eksklusif antar proses pada file `path` (dibuat jika belum ada), ditunggu paling lama `timeout` detik."""
+    deadline = time.monotonic() + timeout
+    with open(path, "a+") as f:
+        while True:
+            try:
+                if sys.platform == "win32":
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise RuntimeError(f"{path} masih dikunci proses lain setelah {timeout} detik")
+                time.sleep(0.1)
+        try:
+            yield
+        finally:
+            # Kunci juga dilepas OS saat file ditutup atau proses mati
+            if sys.platform == "win32":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+def _quote(identifier):
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+def _staging_name(name):
+    return f"{name}__loading"
+
+def _column_values(series):
+    """Nilai kolom sebagai objek Python untuk driver database (NaN/NaT -> NULL, datetime -> teks ISO)."""
+    if series.dtype.kind == "M":
+        series = series.astype("string")
+    values = series.astype(object)
+    missing = series.isna()
+    if missing.any():
+        values = values.where(~missing, None)
+    return values.tolist()
+
+def _sqlite_type(dtype):
+    if dtype.kind in "iub":
+        return "INTEGER"
+    if dtype.kind == "f":
+        return "REAL"
+    return "TEXT"
+
+def _frame_rows(df, batch_rows=INSERT_BATCH_ROWS):
+    """Baris DataFrame sebagai tuple, dikonversi per batch agar tidak ada salinan objek Python seukuran frame."""
+    for start in range(0, len(df), batch_rows):
+        chunk = df.iloc[start:start + batch_rows]
+        yield from zip(*(_column_values(chunk[column]) for column in chunk.columns))
+
+class DatabaseSink:
+    """
+    Tujuan tambahan hasil report selain file output: satu tabel per report di database lokal.
+
+    Tabel baru diisi di tabel staging lalu menggantikan tabel lama dalam satu transaksi,
+    sehingga pembaca database selalu melihat isi run sebelumnya atau run ini secara utuh.
+    write_frame() dan write_csv() mengembalikan jumlah baris yang dimuat.
+    """
+    engine = None
+
+    def __init__(self, path):
+        self.path = path
+
+    def write_frame(self, name, df):
+        raise NotImplementedError
+
+    def write_csv(self, name, csv_path):
+        raise NotImplementedError
+
+    def __str__(self):
+        return f"{self.engine}:{self.path}"
+
+class SQLiteSink(DatabaseSink):
+    engine = "sqlite"
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # isolation_level=None: transaksi diatur sendiri dengan BEGIN/COMMIT
+        return sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT_SECONDS, isolation_level=None)
+
+    def _swap_in(self, name, columns, rows):
+        table = _quote(name)
+        staging = _quote(_staging_name(name))
+        definition = ", ".join(f"{_quote(column)} {sql_type}" for column, sql_type in columns)
+        insert = f"INSERT INTO {staging} VALUES ({', '.join('?' * len(columns))})"
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(f"DROP TABLE IF EXISTS {staging}")
+                conn.execute(f"CREATE TABLE {staging} ({definition})")
+                count = conn.executemany(insert, rows).rowcount
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.execute(f"ALTER TABLE {staging} RENAME TO {table}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+        return max(count, 0)
+
+    def write_frame(self, name, df):
+        from core.frames import storage_frame
+
+        df = storage_frame(df)
+        columns = [(column, _sqlite_type(df[column].dtype)) for column in df.columns]
+        return self._swap_in(name, columns, _frame_rows(df))
+
+    def write_csv(self, name, csv_path):
+        # CSV output selalu UTF-8 (lihat copy_csv_bytes); semua kolom dimuat sebagai teks apa adanya
+        with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return 0
+            return self._swap_in(name, [(column, "TEXT") for column in header], reader)
+
+class DuckDBSink(DatabaseSink):
+    engine = "duckdb"
+
+    def _swap_in(self, name, select, frame=None):
+        if duckdb is None:
+            raise RuntimeError("database_engine = duckdb membutuhkan paket duckdb (pip install duckdb)")
+        table = _quote(name)
+        staging = _quote(_staging_name(name))
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with _duckdb_lock, _file_lock(f"{self.path}.lock", DUCKDB_LOCK_TIMEOUT_SECONDS):
+            conn = duckdb.connect(self.path)
+            try:
+                if frame is not None:
+                    conn.register("report_frame", frame)
+                conn.execute("BEGIN TRANSACTION")
+                try:
+                    conn.execute(f"DROP TABLE IF EXISTS {staging}")
+                    conn.execute(f"CREATE TABLE {staging} AS {select}")
+                    count = conn.execute(f"SELECT count(*) FROM {staging}").fetchone()[0]
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                    conn.execute(f"ALTER TABLE {staging} RENAME TO {table}")
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            finally:
+                conn.close()
+        return count
+
+    def write_frame(self, name, df):
+        from core.frames import storage_frame
+
+        # DuckDB membaca DataFrame langsung (kolom per kolom), tanpa konversi per baris
+        return self._swap_in(name, "SELECT * FROM report_frame", storage_frame(df))
+
+    def write_csv(self, name, csv_path):
+        literal = "'" + csv_path.replace("'", "''") + "'"
+        return self._swap_in(name, f"SELECT * FROM read_csv({literal}, header = true, all_varchar = true)")
+
+SINK_ENGINES = {
+    "sqlite": SQLiteSink,
+    "duckdb": DuckDBSink,
+}
+
+def sinks_from_config(config):
+    """
+    Sink tambahan dari [OUTPUT]: `database` (path file database, kosong = tidak ada) dan
+    `database_engine` (sqlite, duckdb, atau auto: duckdb untuk ekstensi .duckdb/.ddb).
+    """
+    path = config.get("OUTPUT", "database", fallback="").strip()
+    if not path:
+        return []
+    engine = config.get("OUTPUT", "database_engine", fallback="auto").strip().lower()
+    if engine == "auto":
+        engine = "duckdb" if path.lower().endswith((".duckdb", ".ddb")) else "sqlite"
+    if engine not in SINK_ENGINES:
+        raise ValueError(f"database_engine tidak dikenal: '{engine}' (pilihan: {', '.join(SINK_ENGINES)})")
+    return [SINK_ENGINES[engine](path)]
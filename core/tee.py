@@ -0,0 +1,244 @@
+# core/tee.py
+import datetime
+import gzip
+import os
+import queue
+import shutil
+import threading
+import time
+
+# Bytes yang dikumpulkan sebelum diteruskan ke file lokal dan semua tujuan lain
+TEE_CHUNK_SIZE = 1024 * 1024
+
+# Chunk yang boleh mengantre per tujuan; jika penuh, tujuan itu tertinggal dan menyusul dari file lokal
+TEE_QUEUE_CHUNKS = 16
+
+# Batas tunggu tujuan lain setelah file lokal selesai; tujuan yang belum selesai (mis. share
+# jaringan yang macet) dilaporkan dan dibiarkan selesai di background, report tidak ditahan
+TEE_TIMEOUT_SECONDS = 60
+
+def temp_path(path):
+    """File sementara untuk `path`, unik per proses dan thread agar penulis bersamaan tidak saling menimpa."""
+    return f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+
+class MirrorTarget:
+    """Salinan file output di folder lain (mis. share jaringan) dengan path relatif yang sama."""
+    label = "salinan"
+
+    def __init__(self, root, timeout=TEE_TIMEOUT_SECONDS):
+        self.root = root
+        self.timeout = timeout
+
+    def path_for(self, relative, now):
+        return os.path.join(self.root, relative)
+
+    def open(self, path):
+        return open(path, "wb")
+
+class ArchiveTarget(MirrorTarget):
+    """Arsip terkompresi (gzip) setiap run: {root}/{path relatif}-YYYYmmdd-HHMMSS-ffffff.{ext}.gz."""
+    label = "arsip"
+
+    def __init__(self, root, level=6, timeout=TEE_TIMEOUT_SECONDS):
+        super().__init__(root, timeout)
+        self.level = level
+
+    def path_for(self, relative, now):
+        stem, ext = os.path.splitext(relative)
+        # Mikrodetik: dua run di detik yang sama tidak saling menimpa arsip
+        return os.path.join(self.root, f"{stem}-{now:%Y%m%d-%H%M%S-%f}{ext}.gz")
+
+    def open(self, path):
+        return gzip.open(path, "wb", compresslevel=self.level)
+
+class _TargetWriter(threading.Thread):
+    """
+    Menulis satu tujuan di thread sendiri dari antrean chunk. Jika antrean penuh (tujuan
+    lambat), penulis lokal tidak menunggu: chunk berikutnya tidak dikirim lagi dan tujuan
+    ini menyusul dengan membaca sisa file lokal setelah file itu selesai ditulis.
+    """
+    def __init__(self, target, path):
+        super().__init__(name=f"tee-{os.path.basename(path)}", daemon=True)
+        self.target = target
+        self.path = path
+        # Satu slot cadangan: sentinel akhir selalu bisa masuk tanpa menunggu tujuan yang macet
+        self.chunks = queue.Queue(maxsize=TEE_QUEUE_CHUNKS + 1)
+        self.lag_offset = None # Posisi chunk pertama yang tidak terkirim
+        self.source_path = None # File lokal final, sumber untuk menyusul
+        self.error = None
+        self.caught_up = False
+
+    def feed(self, chunk, offset):
+        if self.lag_offset is not None:
+            return
+        # Hanya thread penulis lokal yang mengisi antrean, jadi slot cadangan tetap kosong
+        if self.chunks.qsize() >= TEE_QUEUE_CHUNKS:
+            self.lag_offset = offset
+            return
+        self.chunks.put_nowait(chunk)
+
+    def finish(self, source_path):
+        self.source_path = source_path
+        self.chunks.put_nowait(None)
+
+    def cancel(self):
+        self.error = self.error or RuntimeError("dibatalkan")
+        self.chunks.put_nowait(None)
+
+    def run(self):
+        tmp_path = temp_path(self.path)
+        out = None
+        finished = False
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            out = self.target.open(tmp_path)
+            while not finished:
+                chunk = self.chunks.get()
+                finished = chunk is None
+                if not finished:
+                    out.write(chunk)
+            if self.error is None and self.lag_offset is not None:
+                with open(self.source_path, "rb") as src:
+                    src.seek(self.lag_offset)
+                    shutil.copyfileobj(src, out, TEE_CHUNK_SIZE)
+                self.caught_up = True
+            out.close()
+            out = None
+            if self.error is None:
+                os.replace(tmp_path, self.path)
+                return
+        except Exception as e:
+            self.error = e
+            # Antrean tetap dikosongkan agar penulis lokal tidak pernah tertahan tujuan yang gagal
+            while not finished:
+                finished = self.chunks.get() is None
+        if out is not None:
+            try:
+                out.close()
+            except OSError:
+                pass
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    def note(self):
+        if self.is_alive():
+            return f"{self.target.label} ke {self.target.root} belum selesai setelah {self.target.timeout} detik (dilanjutkan di background)"
+        if self.error is not None:
+            return f"{self.target.label} ke {self.target.root} gagal: {self.error}"
+        return f"{self.target.label} {self.path}" + (" (menyusul dari file lokal)" if self.caught_up else "")
+
+class TeeOutput:
+    """
+    File biner tujuan write_frame/copy_csv_bytes yang menulis satu kali ke file lokal
+    (sementara, lalu os.replace) sekaligus ke tujuan lain (mirror, arsip) secara paralel.
+
+    File lokal selesai dan dipublikasikan lebih dulu (termasuk `publish()`, mis. pointer
+    `latest`); tujuan lain ditunggu setelahnya, paling lama `timeout` detik per tujuan.
+    Kegagalan atau keterlambatan satu tujuan tidak memengaruhi file lokal maupun tujuan
+    lain, dan dicatat di `notes`. Dipakai sebagai context manager: sukses = commit,
+    exception = batal.
+    """
+    mode = "wb" # Ditandai biner agar pandas tidak membungkusnya sebagai file teks
+
+    def __init__(self, path, targets=(), relative=None, now=None, publish=None):
+        self.path = path
+        self.publish = publish
+        self.tmp_path = temp_path(path)
+        self.notes = []
+        self._file = open(self.tmp_path, "wb")
+        self._buffer = bytearray()
+        self._position = 0
+        relative = relative or os.path.basename(path)
+        now = now or datetime.datetime.now()
+        self._writers = [_TargetWriter(target, target.path_for(relative, now)) for target in targets]
+        for writer in self._writers:
+            writer.start()
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def writable(self):
+        return True
+
+    def readable(self):
+        return False
+
+    def seekable(self):
+        return False
+
+    def tell(self):
+        return self._position + len(self._buffer)
+
+    def write(self, data):
+        self._buffer += data
+        if len(self._buffer) >= TEE_CHUNK_SIZE:
+            self._dispatch()
+        return len(data)
+
+    def flush(self):
+        # Sengaja tidak meneruskan buffer: chunk kecil hanya menambah antrean
+        pass
+
+    def _dispatch(self):
+        if not self._buffer:
+            return
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        self._file.write(chunk)
+        for writer in self._writers:
+            writer.feed(chunk, self._position)
+        self._position += len(chunk)
+
+    def close(self):
+        # pandas/pyarrow boleh menutup handle; commit/abort tetap ditentukan context manager
+        pass
+
+    def commit(self):
+        self._dispatch()
+        self._file.close()
+        os.replace(self.tmp_path, self.path)
+        for writer in self._writers:
+            writer.finish(self.path)
+        if self.publish is not None:
+            self.publish()
+        self._join_writers()
+        self.notes.extend(writer.note() for writer in self._writers)
+        return self.notes
+
+    def abort(self):
+        self._file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+        for writer in self._writers:
+            writer.cancel()
+        self._join_writers()
+
+    def _join_writers(self):
+        # Tujuan ditunggu bersamaan: batas waktu dihitung dari saat file lokal selesai
+        started = time.monotonic()
+        for writer in self._writers:
+            writer.join(max(0.0, writer.target.timeout - (time.monotonic() - started)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+def targets_from_config(config):
+    """
+    Tujuan tambahan dari [OUTPUT]: `mirror_dirs` (beberapa folder dipisah ';', mis. share
+    jaringan) dan `archive_dir` (arsip gzip per run, tingkat kompresi `archive_level`).
+    `mirror_timeout_seconds` membatasi tunggu setiap tujuan setelah file lokal selesai.
+    """
+    timeout = config.getfloat("OUTPUT", "mirror_timeout_seconds", fallback=TEE_TIMEOUT_SECONDS)
+    targets = [MirrorTarget(part.strip(), timeout) for part in config.get("OUTPUT", "mirror_dirs", fallback="").split(";") if part.strip()]
+    archive_dir = config.get("OUTPUT", "archive_dir", fallback="").strip()
+    if archive_dir:
+        targets.append(ArchiveTarget(archive_dir, config.getint("OUTPUT", "archive_level", fallback=6), timeout))
+    return targets
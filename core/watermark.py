@@ -0,0 +1,83 @@
+# core/watermark.py
+import copy
+import json
+import os
+
+def _watermark_path(state_dir, name):
+    return os.path.join(state_dir, "watermarks", f"{name}.json")
+
+def load_watermark(state_dir, name):
+    """Baca high-water mark terakhir untuk report, None jika belum pernah disimpan."""
+    try:
+        with open(_watermark_path(state_dir, name), "r", encoding="utf-8") as f:
+            return json.load(f).get("value")
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def save_watermark(state_dir, name, column, value):
+    """
+    Simpan high-water mark secara atomik (tulis ke file sementara lalu os.replace).
+    Satu file per report, sehingga aman dipanggil dari beberapa proses sekaligus.
+    """
+    path = _watermark_path(state_dir, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"column": column, "value": value}, f)
+    os.replace(tmp_path, path)
+
+def apply_watermark_filter(payload, column, value):
+    """
+    Kembalikan salinan payload Superset dengan filter `column > value`
+    di setiap query, sehingga server hanya mengirim baris yang lebih baru.
+    """
+    payload = copy.deepcopy(payload)
+    for query in payload.get("queries", []):
+        query.setdefault("filters", []).append({
+            "col": column,
+            "op": ">",
+            "val": value,
+        })
+    return payload
+
+def _csv_text(df, columns):
+    """Kolom seperti yang tertulis di file CSV (teks), supaya bisa dibandingkan dengan file lama."""
+    import io
+    import pandas as pd
+
+    return pd.read_csv(io.StringIO(df[columns].to_csv(index=False)), dtype=str, keep_default_na=False)
+
+def merge_with_existing(path, df, key=None):
+    """
+    Gabungkan baris baru dengan file output yang sudah ada (CSV atau Parquet).
+    Jika `key` diberikan, baris dengan key yang sama diganti oleh versi terbaru.
+
+    File CSV lama dibaca sebagai teks apa adanya (tanpa inferensi tipe), sehingga nilai
+    seperti '001' tidak berubah menjadi 1; key baris baru dibandingkan dalam bentuk teks
+    yang sama seperti saat ditulis ke CSV.
+    """
+    import pandas as pd
+    from core.output import read_frame
+
+    if not path or not os.path.exists(path):
+        return df
+
+    is_csv = not path.endswith(".parquet")
+    existing = read_frame(path, as_text=is_csv)
+    merged = pd.concat([existing, df], ignore_index=True)
+    if not key:
+        return merged
+
+    key = [key] if isinstance(key, str) else list(key)
+    if is_csv:
+        keys = pd.concat([existing[key], _csv_text(df, key)], ignore_index=True)
+    else:
+        keys = merged[key].astype(str)
+    return merged[~keys.duplicated(keep="last").to_numpy()].reset_index(drop=True)
+
+def max_watermark(df, column):
+    """Nilai maksimum kolom watermark dalam bentuk yang bisa diserialisasi ke JSON."""
+    if column not in df.columns or df[column].dropna().empty:
+        return None
+    value = df[column].max()
+    return value.item() if hasattr(value, "item") else value
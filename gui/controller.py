@@ -5,24 +5,39 @@ from PyQt6.QtCore import QThreadPool, QTimer, QDateTime
 from PyQt6.QtGui import QIcon, QAction
 import json
 import configparser
+import datetime
 import os
-import random
-from gui.model import ReportModel, CONFIG_FILE
-from gui.dialogs import AddEditReportDialog, EditConfigDialog, IntervalSettingsDialog, ServerSettingsDialog
-from gui.extractor import ExtractorWorker
+from gui.model import ReportModel, ReportListModel, CONFIG_FILE
+from gui.extractor import ExtractorWorker, WarmupWorker
+from gui.engine import ProcessExtractorWorker, engine_from_config
 from core.commands import CommandExecutor, LoginCommand, FetchCSRFTokenCommand
+from core.scheduler import Scheduler, load_blackouts, SCHEDULER_TICK_MS
 
 class Controller:
     def __init__(self, view):
         self.view = view
         self.model = ReportModel()
+        self.report_list_model = ReportListModel()
+        self.view.set_report_model(self.report_list_model)
         self.threadpool = QThreadPool()
         self.executor = CommandExecutor() 
+
+        # Ekstraksi di proses anak agar GUI tetap responsif; proses cadangan disiapkan setelah jendela tampil
+        engine_config = configparser.ConfigParser(interpolation=None)
+        engine_config.read(CONFIG_FILE)
+        self.engine = engine_from_config(engine_config)
+        if self.engine is not None:
+            QTimer.singleShot(2000, self.engine.prepare)
         
-        # Komponen auto interval
-        self.interval_timer = QTimer()
-        self.interval_timer.timeout.connect(self.auto_extract_and_reschedule)
+        # Komponen auto interval: scheduler per report yang diperiksa setiap SCHEDULER_TICK_MS
+        self.scheduler = None
+        self.scheduler_timer = QTimer()
+        self.scheduler_timer.timeout.connect(self.run_due_reports)
         self.is_auto_mode = False
+        self.is_extracting = False
+        self.is_warming = False # Pemanasan cache server menjelang run terjadwal sedang berjalan
+        self.warmup_lead = None
+        self._pending_reports = set() # Report run saat ini yang belum berhasil
         self.next_run_time = None # Variabel baru untuk menyimpan waktu eksekusi berikutnya
         
         # Timer baru untuk status server, memeriksa setiap detik
@@ -32,17 +47,21 @@ class Controller:
         
         # Pengaturan system tray
         self.setup_system_tray()
+
+        # Scheduler cadangan untuk menampilkan status blackout saat mode manual
+        self._status_scheduler = self._build_scheduler()
         
         self._connect_signals()
         self.refresh_report_list()
         self.load_interval_settings()
         self.update_status_display() # Panggilan awal
 
-    def _get_server_busy_minutes(self):
-        """Membaca durasi sibuk server dari config.ini, dengan nilai fallback."""
+    def _build_scheduler(self):
+        """Membuat scheduler dari [INTERVAL] dan blackout window di config.ini."""
         config = configparser.ConfigParser(interpolation=None)
         config.read(CONFIG_FILE)
-        return config.getint("SERVER", "busy_minutes", fallback=35)
+        interval_minutes = config.getint("INTERVAL", "interval_minutes", fallback=120)
+        return Scheduler(interval_minutes, load_blackouts(config, self.executor.load_history), history=self.executor.load_history)
 
     def update_status_display(self):
         """
@@ -50,16 +69,13 @@ class Controller:
         Memprioritaskan status sibuk server, kemudian hitungan mundur, lalu status default.
         """
         current_dt = QDateTime.currentDateTime()
-        hour = current_dt.time().hour()
-        minute = current_dt.time().minute()
-        server_busy_minutes = self._get_server_busy_minutes()
+        scheduler = self.scheduler or self._status_scheduler
         
         status_text_line_2 = ""
-        is_busy_schedule = (hour % 2 == 0)
 
-        # Prioritas 1: Tampilkan jika server sedang sibuk.
-        if is_busy_schedule and (0 <= minute < server_busy_minutes):
-            seconds_left = (server_busy_minutes - 1 - minute) * 60 + (59 - current_dt.time().second())
+        # Prioritas 1: Tampilkan jika server sedang sibuk (dalam blackout window).
+        if scheduler.in_blackout():
+            seconds_left = current_dt.secsTo(QDateTime(scheduler.blackout_end()))
             minutes_left = seconds_left // 60
             seconds_rem = seconds_left % 60
             status_text_line_2 = f"Server Sibuk. Buka dalam: {minutes_left:02d}:{seconds_rem:02d}"
@@ -154,6 +170,8 @@ class Controller:
                 return
                 
         self.stop_auto_interval()
+        if self.engine is not None:
+            self.engine.shutdown()
         if hasattr(self, 'tray_icon'):
             self.tray_icon.hide()
         self.view.close()
@@ -162,6 +180,8 @@ class Controller:
         self.view.btn_add.clicked.connect(self.add_report)
         self.view.btn_edit.clicked.connect(self.edit_report)
         self.view.btn_delete.clicked.connect(self.delete_report)
+        self.view.btn_import.clicked.connect(self.import_reports)
+        self.view.btn_export.clicked.connect(self.export_reports)
         self.view.btn_set_output.clicked.connect(self.set_output_folder)
         self.view.btn_extract.clicked.connect(self.handle_extract_button)
         self.view.btn_stop_auto.clicked.connect(self.stop_auto_interval)
@@ -169,15 +189,25 @@ class Controller:
         self.view.btn_concurrency_settings.clicked.connect(self.edit_concurrency_settings)
         self.view.btn_interval_settings.clicked.connect(self.edit_interval_settings)
         self.view.btn_server_settings.clicked.connect(self.edit_server_settings)
+        self.view.btn_load_profile.clicked.connect(self.show_load_profile)
         self.view.closeEvent = self.close_event
 
     def edit_server_settings(self):
         """Membuka dialog baru untuk mengedit pengaturan server."""
+        from gui.dialogs import ServerSettingsDialog
         dialog = ServerSettingsDialog(CONFIG_FILE, parent=self.view)
         if dialog.exec():
             self.view.log_box.append("⚙️ Pengaturan waktu proses server berhasil diperbarui.")
+            self._status_scheduler = self._build_scheduler()
+            if self.scheduler:
+                self.scheduler.blackouts = self._status_scheduler.blackouts
             self.update_status_display()
 
+    def show_load_profile(self):
+        """Tampilkan profil beban server hasil belajar (jam sibuk per jam dalam seminggu)."""
+        from gui.dialogs import LoadProfileDialog
+        LoadProfileDialog(self.executor.load_history, parent=self.view).exec()
+
     def close_event(self, event):
         """Handle window close event"""
         if hasattr(self, 'tray_icon') and self.tray_icon.isVisible():
@@ -198,13 +228,14 @@ class Controller:
 
     def edit_interval_settings(self):
         """Open interval settings dialog"""
+        from gui.dialogs import IntervalSettingsDialog
         dialog = IntervalSettingsDialog(CONFIG_FILE, parent=self.view)
         if dialog.exec():
             self.view.log_box.append("⚙️ Pengaturan interval berhasil diperbarui.")
             self.load_interval_settings()
 
     def start_auto_interval(self, interval_minutes, minimize_to_tray=False):
-        """Memulai ekstraksi auto interval dengan jeda acak awal satu kali."""
+        """Memulai mode auto: setiap report dijadwalkan sendiri oleh scheduler."""
         if self.is_auto_mode:
             self.view.log_box.append("⚠️ Auto interval sudah aktif.")
             return
@@ -212,15 +243,19 @@ class Controller:
         self.is_auto_mode = True
         self.view.set_auto_mode(True)
         self.view.update_status("Status: Auto Interval Aktif")
-        
-        initial_jitter_minutes = random.randint(1, 10)
-        self.view.log_box.append(f"🔄 Auto interval aktif! Ekstraksi pertama akan dimulai setelah jeda awal ~{initial_jitter_minutes} menit.")
-        
-        # Atur waktu eksekusi pertama
-        self.next_run_time = QDateTime.currentDateTime().addSecs(initial_jitter_minutes * 60)
-        
-        # Gunakan QTimer untuk memanggil ekstraksi pertama
-        QTimer.singleShot(initial_jitter_minutes * 60 * 1000, self.auto_extract_and_reschedule)
+
+        config = configparser.ConfigParser(interpolation=None)
+        config.read(CONFIG_FILE)
+        self.scheduler = Scheduler(interval_minutes, load_blackouts(config, self.executor.load_history), history=self.executor.load_history)
+        self.scheduler.sync(self.model.get_all_reports())
+        self.warmup_lead = datetime.timedelta(minutes=config.getint("SCHEDULE", "warmup_minutes", fallback=0))
+        self._update_next_run_time()
+        self.view.log_box.append(
+            f"🔄 Auto interval aktif! Setiap report dijadwalkan tiap {interval_minutes} menit "
+            f"(atau sesuai jadwal cron-nya) dengan waktu mulai yang disebar."
+        )
+
+        self.scheduler_timer.start(SCHEDULER_TICK_MS)
 
         if minimize_to_tray and hasattr(self, 'tray_icon'):
             self.hide_window()
@@ -231,48 +266,54 @@ class Controller:
             return
             
         self.is_auto_mode = False
-        self.interval_timer.stop()
+        self.scheduler_timer.stop()
+        self.scheduler = None
         self.next_run_time = None
         
         self.view.set_auto_mode(False)
         self.update_status_display()
         self.view.log_box.append("⏹️ Auto interval dihentikan.")
 
-    def auto_extract_and_reschedule(self):
-        """Menjalankan ekstraksi dan kemudian menjadwalkan ulang timer utama."""
-        if not self.is_auto_mode:
+    def _update_next_run_time(self):
+        next_due = self.scheduler.next_due() if self.scheduler else None
+        self.next_run_time = QDateTime(next_due) if next_due else None
+
+    def run_due_reports(self):
+        """Dipanggil timer scheduler: jalankan report yang sudah jatuh tempo."""
+        if not self.is_auto_mode or not self.scheduler:
             return
 
-        # 1. Jalankan ekstraksi saat ini
-        self.check_server_and_extract()
-        
-        # 2. Jadwalkan ulang timer utama untuk siklus berikutnya
-        config = configparser.ConfigParser(interpolation=None)
-        config.read(CONFIG_FILE)
-        interval_minutes = config["INTERVAL"].getint("interval_minutes", 120)
-        
-        self.interval_timer.start(interval_minutes * 60 * 1000)
-        
-        # 3. Hitung dan simpan waktu eksekusi berikutnya untuk ditampilkan
-        self.next_run_time = QDateTime.currentDateTime().addSecs(interval_minutes * 60)
-        self.view.log_box.append(f"Ekstraksi berikutnya dijadwalkan dalam {interval_minutes} menit.")
+        # Report yang jatuh tempo saat ekstraksi lain (atau pemanasan cache) berjalan tetap menunggu di antrean
+        if not self.is_extracting and not self.is_warming:
+            reports = self.model.get_all_reports()
+            self.scheduler.sync(reports)
+            due_names = self.scheduler.pop_due()
+            if due_names:
+                current_dt = QDateTime.currentDateTime()
+                self.view.log_box.append(
+                    f"🤖 [AUTO] Memulai ekstraksi otomatis {len(due_names)} report - {current_dt.toString('dd/MM/yyyy hh:mm:ss')}"
+                )
+                self.start_extraction(due_names, slots={name: self.scheduler.slot_of(name) for name in due_names})
+            else:
+                self._start_warmup(reports)
 
-    def check_server_and_extract(self):
-        """Memicu ekstraksi, tetapi memeriksa dulu apakah server sibuk."""
-        current_dt = QDateTime.currentDateTime()
-        hour = current_dt.time().hour()
-        minute = current_dt.time().minute()
-        server_busy_minutes = self._get_server_busy_minutes()
+        self._update_next_run_time()
 
-        is_busy_schedule = (hour % 2 == 0)
+    def _start_warmup(self, reports):
+        """Panaskan cache server untuk report yang run berikutnya sudah dekat ([SCHEDULE] warmup_minutes)."""
+        if not self.warmup_lead:
+            return
+        deadlines = self.scheduler.pop_warmup(self.warmup_lead)
+        if not deadlines:
+            return
+        self.is_warming = True
+        worker = WarmupWorker({name: reports[name] for name in deadlines}, self.model.get_output_dir(), self.executor, deadlines)
+        worker.signals.message.connect(self.view.log_box.append)
+        worker.signals.finished.connect(self._on_warmup_finished)
+        self.threadpool.start(worker)
 
-        if is_busy_schedule and (0 <= minute < server_busy_minutes):
-            seconds_to_wait = (server_busy_minutes - minute) * 60 - current_dt.time().second()
-            self.view.log_box.append(f"⏰ Server sedang memproses data. Ekstraksi ditunda selama ~{seconds_to_wait // 60 + 1} menit.")
-            QTimer.singleShot(seconds_to_wait * 1000, self.start_extraction)
-        else:
-            self.view.log_box.append(f"🤖 [AUTO] Memulai ekstraksi otomatis - {current_dt.toString('dd/MM/yyyy hh:mm:ss')}")
-            self.start_extraction()
+    def _on_warmup_finished(self):
+        self.is_warming = False
 
     def handle_extract_button(self):
         """Handle extract button click"""
@@ -297,27 +338,49 @@ class Controller:
             self.model._load_config()
 
     def edit_config(self):
+        from gui.dialogs import EditConfigDialog
         dialog = EditConfigDialog(CONFIG_FILE, parent=self.view)
         if dialog.exec():
             self.view.log_box.append("⚙️ Config.ini berhasil diperbarui.")
             self.model._load_config()
 
     def refresh_report_list(self):
-        self.view.list_reports.clear()
-        for name in self.model.get_report_list():
-            self.view.list_reports.addItem(name)
+        self.report_list_model.set_names(self.model.get_report_list())
 
     def get_selected_report_name(self):
-        selected_items = self.view.list_reports.selectedItems()
-        return selected_items[0].text() if selected_items else None
+        return self.view.selected_report_name()
+
+    def import_reports(self):
+        path, _ = QFileDialog.getOpenFileName(self.view, "Import Report JSON", "", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            count = self.model.import_reports(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self.view, "Import Gagal", f"Gagal mengimpor report: {e}")
+            return
+        self.refresh_report_list()
+        self.view.log_box.append(f"[+] {count} report diimpor dari {path}.")
+
+    def export_reports(self):
+        path, _ = QFileDialog.getSaveFileName(self.view, "Export Report JSON", "request.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            self.model.save_reports(path)
+        except OSError as e:
+            QMessageBox.warning(self.view, "Export Gagal", f"Gagal mengekspor report: {e}")
+            return
+        self.view.log_box.append(f"[📁] Katalog report diekspor ke {path}.")
 
     def add_report(self):
+        from gui.dialogs import AddEditReportDialog
         dialog = AddEditReportDialog(self.view)
         if dialog.exec():
             name, url, payload = dialog.get_data()
             if name and url and payload is not None:
                 self.model.add_report(name, url, payload)
-                self.refresh_report_list()
+                self.report_list_model.add_name(name)
                 self.view.log_box.append(f"[+] Report '{name}' ditambahkan.")
 
     def edit_report(self):
@@ -326,6 +389,7 @@ class Controller:
             QMessageBox.information(self.view, "Pilih Report", "Silakan pilih report yang ingin diedit.")
             return
 
+        from gui.dialogs import AddEditReportDialog
         old_data = self.model.get_report(selected)
         dialog = AddEditReportDialog(
             self.view, report_name=selected, request_url=old_data["request_url"],
@@ -336,7 +400,7 @@ class Controller:
             new_name, new_url, new_payload = dialog.get_data()
             if new_name and new_url and new_payload is not None:
                 self.model.edit_report(selected, new_name, new_url, new_payload)
-                self.refresh_report_list()
+                self.report_list_model.rename(selected, new_name)
                 self.view.log_box.append(f"[~] Report '{selected}' diedit.")
 
     def delete_report(self):
@@ -349,7 +413,7 @@ class Controller:
                                        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if confirm == QMessageBox.StandardButton.Yes:
             self.model.delete_report(selected)
-            self.refresh_report_list()
+            self.report_list_model.remove_name(selected)
             self.view.log_box.append(f"[-] Report '{selected}' dihapus.")
 
     def set_output_folder(self):
@@ -358,7 +422,14 @@ class Controller:
             self.model.save_output_dir(folder)
             self.view.log_box.append(f"[📁] Folder output diatur ke: {folder}")
 
-    def start_extraction(self):
+    def start_extraction(self, report_names=None, slots=None):
+        if self.is_extracting:
+            self.view.log_box.append("⚠️ Ekstraksi sedang berjalan.")
+            return
+        if self.is_warming:
+            self.view.log_box.append("⚠️ Pemanasan cache server sedang berjalan, coba lagi sebentar lagi.")
+            return
+
         if not os.path.exists("config.ini"):
             self.view.log_box.append("[ERROR] File config.ini tidak ditemukan!")
             return
@@ -369,6 +440,8 @@ class Controller:
             return
             
         reports = self.model.get_all_reports()
+        if report_names:
+            reports = {name: info for name, info in reports.items() if name in report_names}
         if not reports:
             self.view.log_box.append("⚠️ Tidak ada report untuk diekstrak.")
             return
@@ -376,18 +449,47 @@ class Controller:
         if not self.is_auto_mode:
             self.view.log_box.clear()
         self.view.progress_bar.setValue(0)
+        self.view.clear_report_progress()
         self.view.btn_extract.setEnabled(False)
+        self.is_extracting = True
+        self._pending_reports = set(reports)
 
-        worker = ExtractorWorker(reports, self.model.get_output_dir(), self.executor)
+        if self.engine is not None:
+            worker = ProcessExtractorWorker(self.engine, reports, self.model.get_output_dir(), self.executor, slots=slots)
+        else:
+            worker = ExtractorWorker(reports, self.model.get_output_dir(), self.executor, slots=slots)
         worker.signals.progress.connect(self.view.progress_bar.setValue)
+        worker.signals.report_progress.connect(self.view.update_report_progress)
         worker.signals.message.connect(self.view.log_box.append)
+        worker.signals.report_finished.connect(self._on_report_finished)
         worker.signals.finished.connect(self._on_extraction_finished)
 
         self.threadpool.start(worker)
 
+    def _on_report_finished(self, name, success):
+        if success:
+            self._pending_reports.discard(name)
+
     def _on_extraction_finished(self):
+        self.is_extracting = False
         self.view.btn_extract.setEnabled(True)
         self.view.log_box.append("✅ Proses ekstraksi selesai.")
+        self._defer_until_server_recovers()
+
+    def _defer_until_server_recovers(self):
+        """
+        Jika circuit breaker terbuka, report yang gagal dijadwalkan ulang tepat saat
+        breaker boleh dicoba lagi (half-open), bukan menunggu interval berikutnya.
+        """
+        retry_at = self.executor.breakers.retry_at()
+        if not (self.is_auto_mode and self.scheduler and self._pending_reports and retry_at):
+            return
+        until = self.scheduler.defer_until_epoch(self._pending_reports, retry_at)
+        self.view.log_box.append(
+            f"🔌 Server tidak sehat (circuit breaker terbuka). {len(self._pending_reports)} report "
+            f"dicoba lagi pada {until:%H:%M:%S}."
+        )
+        self._update_next_run_time()
 
     def get_login_credentials(self):
         config = configparser.ConfigParser(interpolation=None, strict=False)
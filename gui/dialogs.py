@@ -1,7 +1,8 @@
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QLineEdit, QTextEdit, QLabel, QPushButton, QMessageBox, QHBoxLayout,
-    QComboBox, QCheckBox, QSpinBox
+    QComboBox, QCheckBox, QSpinBox, QTableWidget, QTableWidgetItem, QHeaderView
 )
+from PyQt6.QtGui import QColor
 import json
 import configparser
 
@@ -355,3 +356,63 @@ class ServerSettingsDialog(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Gagal menyimpan config: {e}")
 
+
+class LoadProfileDialog(QDialog):
+    """
+    Profil beban server hasil belajar (core/load_profile.py): latensi rata-rata per jam
+    dalam seminggu. Jam sibuk (dihindari scheduler) ditandai merah, jam tanpa sampel cukup abu-abu.
+    """
+    DAYS = ["Sen", "Sel", "Rab", "Kam", "Jum", "Sab", "Min"]
+
+    def __init__(self, history, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Profil Beban Server")
+        self.setMinimumSize(900, 330)
+
+        layout = QVBoxLayout()
+        if history is None:
+            layout.addWidget(QLabel("Belajar jam sibuk belum aktif. Set learn_busy_windows = true di section [SCHEDULE] config.ini."))
+            self.setLayout(layout)
+            return
+
+        profile = history.profile()
+        busy = sum(1 for info in profile if info["busy"])
+        learned = history.has_data()
+        summary = (
+            f"{busy} jam sibuk dari {sum(1 for info in profile if info['samples'] >= history.min_samples)} jam yang sudah punya "
+            f"minimal {history.min_samples} sampel. Sel: latensi rata-rata (detik) / tingkat error."
+            if learned else
+            f"Riwayat belum cukup (minimal {history.min_samples} sampel per jam); aturan busy_minutes jam genap masih dipakai."
+        )
+        layout.addWidget(QLabel(summary))
+
+        table = QTableWidget(len(self.DAYS), 24)
+        table.setVerticalHeaderLabels(self.DAYS)
+        table.setHorizontalHeaderLabels([f"{hour:02d}" for hour in range(24)])
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        for hour, info in enumerate(profile):
+            day, hour_of_day = divmod(hour, 24)
+            text = "" if info["latency"] is None else f"{info['latency']:.1f}"
+            if info["error_rate"]:
+                text += f"\n{info['error_rate'] * 100:.0f}%"
+            item = QTableWidgetItem(text)
+            item.setToolTip(f"{self.DAYS[day]} {hour_of_day:02d}:00 - {info['samples']} sampel")
+            if info["busy"]:
+                item.setBackground(QColor("#ff8a80"))
+            elif info["stale"]:
+                # Sibuk, tetapi lama tanpa sampel baru: dijalankan lagi untuk dipelajari ulang
+                item.setBackground(QColor("#ffd180"))
+                item.setToolTip(f"{item.toolTip()}, blackout kedaluwarsa (dicoba ulang)")
+            elif info["samples"] < history.min_samples:
+                item.setBackground(QColor("#eeeeee"))
+            else:
+                item.setBackground(QColor("#b9f6ca"))
+            table.setItem(day, hour_of_day, item)
+        table.resizeRowsToContents()
+        layout.addWidget(table)
+
+        btn_close = QPushButton("Tutup")
+        btn_close.clicked.connect(self.accept)
+        layout.addWidget(btn_close)
+        self.setLayout(layout)
@@ -0,0 +1,201 @@
+import atexit
+import configparser
+import multiprocessing
+import threading
+from PyQt6.QtCore import QRunnable, Qt
+from gui.extractor import ExtractorSignals, ExtractorWorker
+from core.cluster import default_node_id
+from core.commands import CommandExecutor
+
+# Interval pemeriksaan apakah proses anak masih hidup saat menunggu event
+POLL_SECONDS = 0.5
+
+def engine_main(conn):
+    """
+    Titik masuk proses anak: tunggu satu job (reports, output_dir, slots, snapshot breaker, node_id),
+    jalankan ExtractorWorker, teruskan semua sinyalnya sebagai event lewat pipe, lalu keluar.
+    """
+    try:
+        job = conn.recv()
+    except EOFError:
+        return
+    if job is None:
+        return
+    reports, output_dir, slots, breakers, node_id = job
+    send_lock = threading.Lock()
+
+    def send(*event):
+        # Sinyal dipancarkan dari banyak thread worker; pipe tidak aman dipakai bersamaan
+        with send_lock:
+            try:
+                conn.send(event)
+            except (OSError, EOFError):
+                pass
+
+    executor = CommandExecutor()
+    executor.breakers.restore(breakers)
+    worker = ExtractorWorker(reports, output_dir, executor, slots=slots, node_id=node_id)
+    # Proses anak tidak punya event loop Qt: sinyal harus langsung memanggil handler di thread pengirim
+    direct = Qt.ConnectionType.DirectConnection
+    worker.signals.message.connect(lambda text: send("message", text), type=direct)
+    worker.signals.progress.connect(lambda value: send("progress", value), type=direct)
+    worker.signals.report_progress.connect(lambda name, info: send("report_progress", name, info), type=direct)
+    worker.signals.report_finished.connect(lambda name, success: send("report_finished", name, success), type=direct)
+    worker.signals.finished.connect(lambda: send("finished", executor.breakers.snapshot()), type=direct)
+    worker.run()
+    conn.close()
+
+class ExtractionEngine:
+    """
+    Pengelola proses anak untuk ekstraksi, agar decode JSON dan pandas tidak berebut GIL
+    dengan event loop Qt dan crash di engine tidak ikut menjatuhkan GUI dan scheduler.
+
+    Setiap proses anak hanya menjalankan satu run lalu keluar, sehingga seluruh memori run
+    dikembalikan ke OS. Satu proses cadangan disiapkan di muka (import modul sudah selesai)
+    agar run berikutnya bisa langsung mulai.
+    """
+    def __init__(self):
+        self._context = multiprocessing.get_context("spawn")
+        self._standby = None
+        self._running = set()
+        self._lock = threading.Lock()
+        self.closed = False
+        # Proses anak bukan daemon (boleh membuat process pool sendiri), jadi harus dihentikan saat keluar
+        atexit.register(self.shutdown)
+
+    def _spawn(self):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=engine_main, args=(child_conn,), name="extraction-engine")
+        process.start()
+        child_conn.close()
+        return process, parent_conn
+
+    def prepare(self):
+        """Siapkan proses cadangan jika belum ada."""
+        with self._lock:
+            if self.closed or (self._standby is not None and self._standby[0].is_alive()):
+                return
+            self._standby = self._spawn()
+
+    def take(self):
+        """Ambil proses cadangan (atau buat baru) untuk satu run."""
+        with self._lock:
+            if self.closed:
+                raise RuntimeError("Engine ekstraksi sudah dihentikan")
+            standby, self._standby = self._standby, None
+            if standby is None or not standby[0].is_alive():
+                standby = self._spawn()
+            self._running.add(standby)
+            return standby
+
+    def release(self, handle):
+        """Tunggu proses run selesai keluar, lalu siapkan cadangan untuk run berikutnya."""
+        process, conn = handle
+        conn.close()
+        process.join(timeout=30)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+        with self._lock:
+            self._running.discard(handle)
+        self.prepare()
+
+    def shutdown(self):
+        with self._lock:
+            self.closed = True
+            handles = list(self._running) + ([self._standby] if self._standby else [])
+            self._standby = None
+        for process, conn in handles:
+            conn.close()
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+def engine_from_config(config):
+    """ExtractionEngine jika [SETTINGS] extraction_process aktif (default), selain itu None."""
+    if not config.getboolean('SETTINGS', 'extraction_process', fallback=True):
+        return None
+    return ExtractionEngine()
+
+class ProcessExtractorWorker(QRunnable):
+    """
+    Pengganti ExtractorWorker dengan sinyal yang sama, tetapi ekstraksi dijalankan di proses
+    anak milik `engine`. Thread pool GUI hanya meneruskan event dari pipe ke sinyal Qt.
+    Jika proses anak mati di tengah run, report yang belum selesai dijalankan ulang di
+    proses baru, paling banyak `[SETTINGS] extraction_restarts` kali.
+    """
+    def __init__(self, engine, reports, output_dir, executor: CommandExecutor, slots=None):
+        super().__init__()
+        self.signals = ExtractorSignals()
+        self.engine = engine
+        self.reports = reports
+        self.output_dir = output_dir
+        self.executor = executor
+        self.slots = slots or {}
+        config = configparser.ConfigParser(interpolation=None, strict=False)
+        config.read('config.ini')
+        self.max_restarts = config.getint('SETTINGS', 'extraction_restarts', fallback=2)
+        # Id node mode cluster dibuat di proses ini, bukan di proses anak: proses anak pengganti
+        # memakai id yang sama sehingga bisa mengambil kembali lease proses anak yang mati
+        self.node_id = default_node_id()
+
+    def run(self):
+        remaining = dict(self.reports)
+        restarts = 0
+        try:
+            while remaining:
+                handle = self.engine.take()
+                try:
+                    completed, exitcode = self._run_child(handle, remaining)
+                finally:
+                    self.engine.release(handle)
+                if completed or self.engine.closed:
+                    break
+                if restarts >= self.max_restarts:
+                    self.signals.message.emit(f"💥 <font color=\"red\">Proses ekstraksi berhenti tak terduga (exit code {exitcode}). {len(remaining)} report ditandai gagal.</font>")
+                    for name in remaining:
+                        self.signals.report_finished.emit(name, False)
+                    break
+                restarts += 1
+                self.signals.message.emit(f"💥 <font color=\"red\">Proses ekstraksi berhenti tak terduga (exit code {exitcode}). Memulai ulang untuk {len(remaining)} report tersisa ({restarts}/{self.max_restarts})...</font>")
+        except Exception as e:
+            self.signals.message.emit(f"💥 <font color=\"red\">ERROR: {e}</font>")
+        finally:
+            self._reload_load_history()
+            self.signals.finished.emit()
+
+    def _run_child(self, handle, remaining):
+        """Kirim job ke proses anak dan teruskan event-nya. Mengembalikan (selesai normal, exit code)."""
+        process, conn = handle
+        conn.send((remaining, self.output_dir, {name: self.slots.get(name) for name in remaining},
+                   self.executor.breakers.snapshot(), self.node_id))
+        while True:
+            try:
+                if not conn.poll(POLL_SECONDS):
+                    if not process.is_alive():
+                        return False, process.exitcode
+                    continue
+                event = conn.recv()
+            except (EOFError, OSError):
+                process.join(timeout=5)
+                return False, process.exitcode
+            kind = event[0]
+            if kind == "message":
+                self.signals.message.emit(event[1])
+            elif kind == "progress":
+                self.signals.progress.emit(event[1])
+            elif kind == "report_progress":
+                self.signals.report_progress.emit(event[1], event[2])
+            elif kind == "report_finished":
+                remaining.pop(event[1], None)
+                self.signals.report_finished.emit(event[1], event[2])
+            elif kind == "finished":
+                # Status circuit breaker dari proses anak dipakai controller untuk menunda report gagal
+                self.executor.breakers.restore(event[1])
+                return True, None
+
+    def _reload_load_history(self):
+        # Riwayat beban dicatat dan disimpan proses anak; scheduler di proses ini membaca ulang file-nya
+        if self.executor.load_history is not None:
+            self.executor.load_history.load()
@@ -6,55 +6,393 @@ from core.commands import (
     LoginCommand,
     FetchReportCommand,
     SaveReportCommand,
+    SubmitReportQueryCommand,
+    WarmReportCacheCommand,
+    is_direct_csv_url,
+    process_raw_report,
 )
+from core.async_queries import AsyncQueryPoller
+from core.batching import plan_batches, merge_payloads, split_result
+from core.watermark import load_watermark, apply_watermark_filter
+from core.cluster import LeaseHeartbeat, leases_from_config
+from core.progress import ProgressTracker
+from core.output import OutputLayout
+from core.profiling import RunTracer
+from core.admission import MemoryBudget, SizeHistory
 import concurrent.futures
+import multiprocessing
+import os
+import queue
 import threading
 import time
 
 class ExtractorSignals(QObject):
-    progress = pyqtSignal(int)  # Emit persen
+    progress = pyqtSignal(int)  # Emit persen (dibobot ukuran report)
+    report_progress = pyqtSignal(str, object)  # Nama report, dict bytes/baris/throughput/ETA
     message = pyqtSignal(str)   # Emit log/status
     finished = pyqtSignal()     # Emit saat selesai
     report_finished = pyqtSignal(str, bool) # Nama report, status berhasil/gagal
 
 class ReportWorker:
-    def __init__(self, executor, name, info, output_dir, signals: ExtractorSignals):
+    def __init__(self, executor, name, info, output_dir, signals: ExtractorSignals, process_pool=None,
+                 leases=None, done_hold_seconds=0, progress=None, layout=None, slot=None, budget=None):
         super().__init__()
         self.executor = executor
         self.name = name
         self.info = info
         self.output_dir = output_dir
         self.signals = signals
-        
+        self.process_pool = process_pool
+        self.leases = leases
+        self.done_hold_seconds = done_hold_seconds
+        self.progress = progress
+        self.layout = layout
+        self.slot = slot # Slot jadwal (epoch detik) untuk kunci lease di mode cluster
+        self.submitted_at = None # Diisi ExtractorWorker saat submit, untuk span antrean
+        # State query async: diisi oleh submit_async() dan event job dari AsyncQueryPoller
+        self.claimed = False
+        self.payload = None
+        self.job = None
+        self.job_event = None
+        self.submit_error = None
+        self.cache_hit = None # Status cache server hasil report (True/False/None), untuk ringkasan run
+        self.budget = budget # MemoryBudget (core/admission.py), None jika admission control mati
+        self.reservation = None
+        self.bytes_received = 0
+
+    def is_async_candidate(self):
+        return not is_direct_csv_url(self.info["request_url"])
+
+    def _claim(self):
+        # Mode cluster: hanya satu node yang boleh mengerjakan report ini
+        if self.claimed:
+            return True
+        if self.leases is not None and not self.leases.claim(self.name, self.slot):
+            self.signals.message.emit(f"⏭️ Report '{self.name}' dilewati: sedang/sudah dikerjakan node lain.")
+            # Tidak dihitung berhasil: node ini tidak tahu apakah node lain menyelesaikannya
+            if self.progress is not None:
+                self.progress.finish(self.name, False)
+            return False
+        self.claimed = True
+        return True
+
+    def _build_payload(self, announce=True):
+        if self.payload is not None:
+            return self.payload
+        payload = self.info["payload"]
+        watermark = self.info.get("watermark")
+        if watermark:
+            last_mark = load_watermark(self.executor.state_dir, self.name)
+            if last_mark is not None and not self._has_previous_output():
+                # Delta hanya bisa digabung ke file lama; tanpa file itu, riwayat harus diambil ulang
+                if announce:
+                    self.signals.message.emit(f"🔖 Report '{self.name}': output sebelumnya tidak ditemukan, watermark diabaikan dan seluruh data diambil ulang.")
+                last_mark = None
+            if last_mark is not None:
+                payload = apply_watermark_filter(payload, watermark["column"], last_mark)
+                if announce:
+                    self.signals.message.emit(f"🔖 Report '{self.name}': hanya mengambil baris dengan {watermark['column']} > {last_mark}")
+        self.payload = payload
+        return payload
+
+    def _has_previous_output(self):
+        if self.layout is None:
+            return True
+        return self.layout.latest_path(self.name, self.layout.format) is not None
+
+    def submit_async(self):
+        """
+        Kirim query ke server tanpa menunggu hasilnya. Mengembalikan True jika report
+        menunggu event job dari AsyncQueryPoller, False jika bisa langsung diproses
+        (dilewati, hasil langsung tersedia, atau submit gagal).
+        """
+        if not self._claim():
+            return False
+        try:
+            self.job = self.executor.execute_command(
+                SubmitReportQueryCommand(), self.name, self.info["request_url"], self._build_payload()
+            )
+        except Exception as e:
+            # Error dilaporkan oleh process() seperti error fetch biasa
+            self.submit_error = e
+            return False
+        if self.job["is_async_job"]:
+            self.signals.message.emit(f"📨 Query report '{self.name}' dikirim (job {self.job['job_id']}), menunggu hasil dari server...")
+            return True
+        return False
+
+    def admit(self, start):
+        """
+        Panggil start() begitu budget memori memberi jatah untuk report ini (langsung jika
+        admission control mati). Tidak memblokir: report yang belum muat mengantre di budget,
+        bukan di thread pool, lalu dimulai oleh thread yang melepas jatah.
+        """
+        if self.budget is None:
+            return start()
+        estimate = self.budget.estimate(self.name, self.info["request_url"])
+
+        def admitted(reservation):
+            self.reservation = reservation
+            start()
+
+        self.budget.admit(self.name, estimate, admitted, lambda: self._announce_wait(estimate))
+
     def process(self):
+        outcome = None
+        try:
+            outcome = self._process()
+            return outcome
+        finally:
+            # Jatah memori dipegang sampai decode/simpan di process pool selesai
+            _when_done([outcome], self._release)
+
+    def _release(self):
+        if self.reservation is not None:
+            self.budget.release(self.reservation)
+
+    def _announce_wait(self, estimate):
+        self.signals.message.emit(
+            f"⏸️ Report '{self.name}' menunggu budget memori (perkiraan {estimate / 2**20:.0f} MB, "
+            f"terpakai {self.budget.in_use / 2**20:.0f}/{self.budget.limit_bytes / 2**20:.0f} MB)."
+        )
+
+    def track_bytes(self, received, total):
+        """Perbarui jatah memori dari Content-Length, atau dari bytes yang sudah diterima jika tanpa Content-Length."""
+        self.bytes_received = received
+        if self.reservation is None:
+            return
+        needed = self.budget.estimate(self.name, self.info["request_url"], total or received)
+        if needed > self.reservation.nbytes or (total and needed != self.reservation.nbytes):
+            self.reservation.update(needed)
+
+    def _process(self):
         current_thread_id = threading.current_thread().name
+        if not self._claim():
+            return (self.name, False, "skipped")
+
         self.signals.message.emit(f"[DEBUG] Memulai proses '{self.name}' di thread: {current_thread_id}")
+        tracer = self.executor.tracer
+        if self.submitted_at is not None:
+            tracer.add_span("queue", "queue", self.submitted_at, tracer.mark(), report=self.name)
         try:
             # Tidak perlu update config.ini di sini, cukup gunakan output_dir yang sudah diset
             # Proses fetch dan save report
+            if self.submit_error is not None:
+                raise self.submit_error
+            payload = self._build_payload()
+            result_url = None
+            response = None
+            if self.job is not None and self.job["is_async_job"]:
+                if self.job_event.get("status") != "done":
+                    errors = "; ".join(e.get("message", str(e)) for e in self.job_event.get("errors") or [])
+                    raise RuntimeError(f"Query async gagal ({self.job_event.get('status')}): {errors or 'tanpa detail'}")
+                result_url = self.job_event.get("result_url") or self.job.get("result_url")
+            elif self.job is not None:
+                # Server menjawab 200 saat submit; body diunduh di sini, di bawah budget memori
+                response = self.job.pop("response")
+
             self.signals.message.emit(f"⏳ Mengambil data untuk report: '{self.name}'...")
+            if self.progress is not None:
+                self.progress.start(self.name)
+
+            def on_bytes(received, total):
+                if self.progress is not None:
+                    self.progress.bytes_progress(self.name, received, total)
+                self.track_bytes(received, total)
+
             report_data = self.executor.execute_command(
-                FetchReportCommand(), self.name, self.info["request_url"], self.info["payload"]
+                FetchReportCommand(), self.name, self.info["request_url"], payload,
+                raw=self.process_pool is not None, encoding=self.info.get("encoding"), progress=on_bytes,
+                result_url=result_url, response=response
             )
             self.signals.message.emit(f"✅ Data report '{self.name}' berhasil diambil. Menyimpan ke folder output...")
+            return self.save(report_data)
+        except Exception as e:
+            return self.fail(e)
 
-            # Asumsi SaveReportCommand menangani output_dir secara internal atau melalu executor
-            msg = self.executor.execute_command(SaveReportCommand(), self.name, report_data) 
-            self.signals.message.emit(f"✅ {msg}") # Pesan sukses dari SaveReportCommand
-            return (self.name, True, msg) 
+    def save(self, report_data):
+        """
+        Simpan data report yang sudah diambil lalu tandai selesai. Error diteruskan ke pemanggil.
+        Mengembalikan (nama, berhasil, pesan), atau Future berisi hasil itu jika penyimpanan
+        masih berjalan di process pool.
+        """
+        tracer = self.executor.tracer
+        watermark = self.info.get("watermark")
+        diff = self.info.get("diff")
+        if isinstance(report_data, dict) and report_data.get("is_raw_json", False):
+            # Decode JSON dan penulisan CSV dikerjakan di process pool agar tidak menahan GIL thread I/O.
+            # Thread I/O tidak ikut menunggu: hasilnya Future yang selesai bersama process pool
+            started = tracer.mark()
+            outcome = concurrent.futures.Future()
+
+            def saved(future):
+                if started is not None:
+                    tracer.add_span("decode+save (process pool)", "save", started, tracer.mark(), report=self.name)
+                try:
+                    msg, rows_written, self.cache_hit = future.result()
+                    outcome.set_result(self._saved(msg, rows_written))
+                except Exception as e:
+                    outcome.set_result(self.fail(e))
+
+            self.process_pool.submit(process_raw_report, self.name, report_data, watermark, diff).add_done_callback(saved)
+            return outcome
+
+        # Asumsi SaveReportCommand menangani output_dir secara internal atau melalu executor
+        save_command = SaveReportCommand()
+        with tracer.span("save", "save", report=self.name):
+            msg = self.executor.execute_command(save_command, self.name, report_data, watermark=watermark, diff=diff)
+        self.cache_hit = save_command.cache_hit
+        return self._saved(msg, save_command.rows_written)
+
+    def _saved(self, msg, rows_written):
+        self.signals.message.emit(f"✅ {msg}") # Pesan sukses dari SaveReportCommand
+        if self.budget is not None:
+            self.budget.record(self.name, self.bytes_received)
+        if self.progress is not None:
+            self.progress.finish(self.name, True, rows_written)
+        if self.leases is not None:
+            self.leases.complete(self.name, self.done_hold_seconds)
+        return (self.name, True, msg)
+
+    def fail(self, e):
+        if self.job is not None and self.job.get("response") is not None:
+            # Body 200 dari submit yang belum sempat diunduh
+            self.job.pop("response").close()
+        error_message = f"❌ <font color=\"red\">Error saat ekstrak '{self.name}': {e}</font>"
+        self.signals.message.emit(error_message)
+        if self.progress is not None:
+            self.progress.finish(self.name, False)
+        if self.leases is not None:
+            # Lepas lease agar node lain bisa mencoba ulang
+            self.leases.release(self.name)
+        return (self.name, False, str(e))
+
+class BatchWorker:
+    """
+    Beberapa report dengan datasource yang sama (lihat core/batching.py) diambil dengan
+    satu request chart-data; `result` response dipecah kembali ke masing-masing report.
+    process() mengembalikan list hasil (nama, berhasil, pesan) per report.
+    """
+    def __init__(self, workers):
+        self.workers = workers
+        self.executor = workers[0].executor
+        self.signals = workers[0].signals
+        self.progress = workers[0].progress
+        self.name = " + ".join(worker.name for worker in workers)
+        self.submitted_at = None
+
+    def is_async_candidate(self):
+        # Batch selalu diambil sinkron; query async tetap dikirim per report
+        return False
+
+    def admit(self, start):
+        """Seperti ReportWorker.admit, dengan satu jatah untuk seluruh batch."""
+        budget = self.workers[0].budget
+        if budget is None:
+            return start()
+        # Response gabungan di-decode sekaligus
+        estimate = sum(budget.estimate(worker.name, worker.info["request_url"]) for worker in self.workers)
+
+        def admitted(reservation):
+            for worker in self.workers:
+                worker.reservation = reservation
+            start()
+
+        budget.admit(self.name, estimate, admitted, lambda: self.workers[0]._announce_wait(estimate))
+
+    def process(self):
+        results = []
+        try:
+            results = self._process()
+            return results
+        finally:
+            _when_done(results, self.workers[0]._release)
+
+    def _process(self):
+        members = [worker for worker in self.workers if worker._claim()]
+        results = [(worker.name, False, "skipped") for worker in self.workers if not worker.claimed]
+        if len(members) <= 1:
+            # Jatah batch sudah dipegang dan dilepas process(); jangan lewat process() member
+            return results + [worker._process() for worker in members]
+
+        tracer = self.executor.tracer
+        if self.submitted_at is not None:
+            tracer.add_span("queue", "queue", self.submitted_at, tracer.mark(), report=self.name)
+        try:
+            payload, spans = merge_payloads([worker._build_payload() for worker in members])
+            names = ", ".join(f"'{worker.name}'" for worker in members)
+            self.signals.message.emit(f"⏳ Mengambil {len(members)} report dalam satu request ({len(payload['queries'])} query): {names}...")
+            if self.progress is not None:
+                for worker in members:
+                    self.progress.start(worker.name)
+
+            # Semua report di batch berbagi satu response, jadi progres bytes-nya sama
+            def on_bytes(received, total):
+                if self.progress is not None:
+                    for worker in members:
+                        self.progress.bytes_progress(worker.name, received, total)
+                # Ukuran response dibagi rata untuk riwayat ukuran per report
+                members[0].track_bytes(received, total)
+                for worker in members:
+                    worker.bytes_received = received // len(members)
+            data = self.executor.execute_command(
+                FetchReportCommand(), self.name, members[0].info["request_url"], payload, progress=on_bytes
+            )
         except Exception as e:
-            error_message = f"❌ <font color=\"red\">Error saat ekstrak '{self.name}': {e}</font>"
-            self.signals.message.emit(error_message)
-            return (self.name, False, str(e))
+            # Request gabungan gagal (mis. satu query ditolak server atau response terlalu besar):
+            # setiap report diambil sendiri agar satu query bermasalah tidak menggagalkan semuanya
+            self.signals.message.emit(f"⚠️ Request gabungan {self.name} gagal ({e}); report diambil satu per satu.")
+            return results + [worker._process() for worker in members]
+
+        for worker, span in zip(members, spans):
+            try:
+                results.append(worker.save(split_result(data, span)))
+            except Exception as e:
+                results.append(worker.fail(e))
+        return results
+
+def _when_done(outcomes, callback):
+    """Panggil callback() setelah semua Future di `outcomes` selesai (langsung jika tidak ada)."""
+    futures = [outcome for outcome in outcomes if isinstance(outcome, concurrent.futures.Future)]
+    if not futures:
+        return callback()
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def done(_):
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            callback()
+
+    for future in futures:
+        future.add_done_callback(done)
+
+def _exit_with_parent():
+    """
+    Initializer process pool: proses worker ikut keluar jika proses induknya mati mendadak
+    (mis. proses engine ekstraksi yang crash), agar tidak tertinggal sebagai proses yatim.
+    """
+    parent = multiprocessing.parent_process()
+    if parent is None:
+        return
+
+    def watch():
+        parent.join()
+        os._exit(1)
+
+    threading.Thread(target=watch, name="parent-watch", daemon=True).start()
 
 # Global lock untuk mengakses config.ini
 thread_config_lock = threading.Lock()
 
 class ExtractorWorker(QRunnable):
-    def __init__(self, reports, output_dir, executor: CommandExecutor):
+    def __init__(self, reports, output_dir, executor: CommandExecutor, slots=None, node_id=None):
         super().__init__()
         self.signals = ExtractorSignals()
         self.reports = reports
+        self.slots = slots or {} # nama -> slot jadwal (epoch detik), hanya untuk run terjadwal
         self.output_dir = output_dir
         self.executor = executor
         
@@ -68,54 +406,202 @@ class ExtractorWorker(QRunnable):
             self.signals.message.emit(f"<font color=\"red\">[ERROR] Gagal membaca max_workers dari config.ini: {str(e)}. Menggunakan default 5.</font>")
             self.max_workers = 5 # Default jika konfigurasi gagal
 
+        # Jumlah proses untuk decode/konversi (0 = dikerjakan di thread I/O seperti biasa)
+        self.process_workers = config.getint('SETTINGS', 'process_workers', fallback=0)
+
+        # Mode cluster: beberapa node berbagi job lewat lease di folder bersama
+        # node_id dari proses induk (proses engine) agar tetap sama setelah proses anak di-restart
+        self.leases = leases_from_config(config, node_id)
+        self.done_hold_seconds = config.getint('CLUSTER', 'done_hold_seconds', fallback=600)
+
+        # Layout output, untuk memeriksa apakah file hasil run sebelumnya masih ada (ekstraksi delta)
+        self.layout = OutputLayout.from_config(config, output_dir)
+
+        # Profiling opsional, dibaca ulang setiap run dari [PROFILING]
+        self.tracer = RunTracer.from_config(config)
+
+        # Query async Superset: semua query dikirim di awal, thread hanya dipakai saat transfer hasil
+        self.async_queries = config.getboolean('SERVER', 'async_queries', fallback=False)
+        self.async_poll_seconds = config.getfloat('SERVER', 'async_poll_seconds', fallback=1.0)
+        self.async_timeout_seconds = config.getint('SERVER', 'async_timeout_seconds', fallback=1800)
+
+        # Report dengan datasource sama digabung menjadi satu request multi-query
+        self.batch_queries = config.getboolean('SERVER', 'batch_queries', fallback=False)
+        self.batch_max_queries = config.getint('SERVER', 'batch_max_queries', fallback=10)
+
+        # Admission control: report baru menunggu jika perkiraan memori report yang berjalan melebihi budget
+        self.memory_budget_mb = config.getint('SETTINGS', 'memory_budget_mb', fallback=0)
+        self.memory_factor = config.getfloat('SETTINGS', 'memory_factor', fallback=8.0)
+        self.budget = None
+
     def run(self):
+        process_pool = None
+        heartbeat = None
+        poller = None
+        tracer = self.tracer
+        self.executor.tracer = tracer
+        tracer.start()
+        # Satu profiler untuk seluruh proses, bukan satu per thread worker
+        tracer.enable_profiler()
         try:
             self.signals.message.emit("Fetching CSRF token...")
-            self.executor.execute_command(FetchCSRFTokenCommand())
+            with tracer.span("csrf_token", "login"):
+                self.executor.execute_command(FetchCSRFTokenCommand())
             self.signals.message.emit("CSRF token berhasil diambil.")
             self.signals.message.emit("⚡️ Memulai login...")
             username, password = self.read_login_credentials()
             if not username or not password:
+                 self.executor.sessions.abort_login()
                  self.signals.message.emit("<font color=\"red\">[ERROR] Username atau password tidak ditemukan di config.ini. Silakan cek bagian [LOGIN].</font>")
                  self.signals.finished.emit()
                  return
 
-            self.executor.execute_command(LoginCommand(), username, password)
+            with tracer.span("login", "login"):
+                self.executor.execute_command(LoginCommand(), username, password)
             self.signals.message.emit("Login berhasil!")
 
+            if self.process_workers > 0:
+                process_pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.process_workers, initializer=_exit_with_parent)
+
+            # Progres per report (bytes/baris) digabung menjadi satu persentase berbobot
+            tracker = ProgressTracker(
+                self.reports.keys(),
+                on_report=self.signals.report_progress.emit,
+                on_overall=self.signals.progress.emit,
+            )
+
+            if self.memory_budget_mb > 0:
+                sizes = SizeHistory(os.path.join(self.executor.state_dir, "report_sizes.json"))
+                self.budget = MemoryBudget(self.memory_budget_mb * 2**20, sizes, self.memory_factor)
+                self.signals.message.emit(f"🧠 Budget memori ekstraksi: {self.memory_budget_mb} MB.")
+
             report_workers = []
             for name, info in self.reports.items():
                 # Teruskan objek sinyal ExtractorWorker ke setiap ReportWorker
-                report_workers.append(ReportWorker(self.executor, name, info, self.output_dir, self.signals))
+                report_workers.append(ReportWorker(
+                    self.executor, name, info, self.output_dir, self.signals, process_pool,
+                    self.leases, self.done_hold_seconds, tracker, self.layout, self.slots.get(name), self.budget
+                ))
 
             total = len(report_workers)
-            completed = 0
+
+            # Unit kerja thread pool: satu ReportWorker, atau BatchWorker untuk report yang digabung
+            units = report_workers
+            if self.batch_queries:
+                by_name = {worker.name: worker for worker in report_workers}
+                units = []
+                for names in plan_batches(self.reports, self.batch_max_queries):
+                    if len(names) == 1:
+                        units.append(by_name[names[0]])
+                    else:
+                        units.append(BatchWorker([by_name[name] for name in names]))
+                        self.signals.message.emit(f"📦 {len(names)} report dengan datasource sama digabung dalam satu request: {', '.join(names)}")
             
-            self.signals.message.emit(f"🚀 Mulai mengekstrak {total} report dengan {min(self.max_workers, total)} threads paralel...")
+            self.signals.message.emit(f"🚀 Mulai mengekstrak {total} report dengan {min(self.max_workers, len(units))} threads paralel...")
+            if process_pool is not None:
+                self.signals.message.emit(f"🧮 Decode dan konversi dijalankan di {self.process_workers} proses terpisah.")
+            if self.leases is not None:
+                heartbeat = LeaseHeartbeat(self.leases)
+                heartbeat.start()
+                self.signals.message.emit(f"🌐 Mode cluster aktif sebagai node '{self.leases.node_id}'.")
             
             with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit semua tugas sekaligus
-                future_to_worker = {executor.submit(worker.process): worker for worker in report_workers}
+                # Future yang selesai dikumpulkan di queue, karena report async baru di-submit
+                # ke thread pool (dari thread poller) setelah hasil query-nya siap di server
+                completed = queue.Queue()
+
+                def submit(worker):
+                    worker.submitted_at = tracer.mark()
+                    # Report masuk thread pool setelah mendapat jatah memori; yang belum muat
+                    # mengantre di budget dan di-submit oleh thread yang melepas jatah
+                    worker.admit(lambda: executor.submit(tracer.profile_call, worker.process).add_done_callback(completed.put))
+
+                if self.async_queries:
+                    poller = AsyncQueryPoller(self.executor, self.async_poll_seconds, self.async_timeout_seconds)
+                    poller.start()
+
+                for worker in units:
+                    if poller is not None and worker.is_async_candidate() and worker.submit_async():
+                        submitted_at = tracer.mark()
+
+                        def on_job_done(event, worker=worker, submitted_at=submitted_at):
+                            if submitted_at is not None:
+                                tracer.add_span("async query", "server", submitted_at, tracer.mark(), report=worker.name)
+                            worker.job_event = event
+                            submit(worker)
+
+                        poller.watch(worker.job["job_id"], on_job_done)
+                    else:
+                        submit(worker)
                 
                 # Proses hasil selesai
-                for future in concurrent.futures.as_completed(future_to_worker):
-                    name, success, message = future.result()
-                    completed += 1
-                    
-                    # ReportWorker sekarang memancarkan pesannya sendiri.
-                    # ExtractorWorker cukup mengupdate progress dan status report selesai.
-                    self.signals.report_finished.emit(name, success) # Memancarkan status selesai report individual
-
-                    # Update progress bar
-                    progress = int((completed / total) * 100)
-                    self.signals.progress.emit(progress)
+                pending = len(units)
+                while pending:
+                    outcome = completed.get().result()
+                    pending -= 1
+                    # BatchWorker mengembalikan satu hasil per report di dalam batch
+                    for result in (outcome if isinstance(outcome, list) else [outcome]):
+                        if isinstance(result, concurrent.futures.Future):
+                            # Masih disimpan di process pool; hasilnya masuk antrean yang sama saat selesai
+                            result.add_done_callback(completed.put)
+                            pending += 1
+                            continue
+                        name, success, message = result
+                        # ReportWorker sekarang memancarkan pesannya sendiri, termasuk progres bytes/baris.
+                        # ExtractorWorker cukup memancarkan status report selesai.
+                        self.signals.report_finished.emit(name, success) # Memancarkan status selesai report individual
+
+            self.signals.progress.emit(100)
             
             self.signals.message.emit(f"🎉 Semua {total} report selesai diekstrak.")
+            self._emit_cache_summary(report_workers)
             
         except Exception as e:
             self.signals.message.emit(f"💥 <font color=\"red\">ERROR: {e}</font>") # Pesan kesalahan global dalam warna merah
         finally:
+            if poller is not None:
+                poller.stop()
+            if heartbeat is not None:
+                heartbeat.stop()
+            if process_pool is not None:
+                process_pool.shutdown()
+            tracer.disable_profiler()
+            self._write_profile(tracer)
+            self._save_load_history()
+            self._save_report_sizes()
+            self.executor.tracer = RunTracer()
             self.signals.finished.emit()
+
+    def _emit_cache_summary(self, report_workers):
+        # Hanya report yang status cache-nya dilaporkan server (chart-data JSON) yang dihitung
+        hits = sum(1 for worker in report_workers if worker.cache_hit is True)
+        misses = sum(1 for worker in report_workers if worker.cache_hit is False)
+        if hits + misses:
+            self.signals.message.emit(f"🗄️ Cache server: {hits} hit, {misses} miss ({hits * 100 // (hits + misses)}% hit).")
+
+    def _save_load_history(self):
+        if self.executor.load_history is None:
+            return
+        try:
+            self.executor.load_history.save()
+        except OSError as e:
+            self.signals.message.emit(f"<font color=\"red\">[ERROR] Gagal menyimpan riwayat beban server: {e}</font>")
+
+    def _save_report_sizes(self):
+        if self.budget is None:
+            return
+        try:
+            self.budget.sizes.save()
+        except OSError as e:
+            self.signals.message.emit(f"<font color=\"red\">[ERROR] Gagal menyimpan riwayat ukuran report: {e}</font>")
+
+    def _write_profile(self, tracer):
+        try:
+            trace_path = tracer.finish(self.output_dir)
+            if trace_path:
+                self.signals.message.emit(f"📊 Profil run disimpan ke {trace_path}")
+        except Exception as e:
+            self.signals.message.emit(f"<font color=\"red\">[ERROR] Gagal menyimpan profil run: {e}</font>")
             
     def read_login_credentials(self):
         config = configparser.ConfigParser(interpolation=None, strict=False)
@@ -134,3 +620,59 @@ class ExtractorWorker(QRunnable):
         except Exception as e:
             self.signals.message.emit(f"[ERROR] Gagal membaca kredensial login dari config.ini: {str(e)}")
             return "", ""
+
+class WarmupWorker(ExtractorWorker):
+    """
+    Pemanasan cache server menjelang run terjadwal. Query report dikirim dengan konkurensi
+    rendah (`[SCHEDULE] warmup_workers`) saat server longgar, tanpa mengunduh hasilnya,
+    sehingga run berikutnya dilayani dari cache Superset.
+    `deadlines` = nama -> waktu run; report yang sudah jatuh tempo tidak dipanaskan lagi.
+    """
+    def __init__(self, reports, output_dir, executor: CommandExecutor, deadlines=None):
+        super().__init__(reports, output_dir, executor)
+        self.deadlines = deadlines or {}
+        config = configparser.ConfigParser(interpolation=None, strict=False)
+        config.read('config.ini')
+        self.warmup_workers = max(1, config.getint('SCHEDULE', 'warmup_workers', fallback=2))
+
+    def run(self):
+        try:
+            names = [name for name, info in self.reports.items() if not is_direct_csv_url(info["request_url"])]
+            if not names:
+                return
+            self.executor.execute_command(FetchCSRFTokenCommand())
+            username, password = self.read_login_credentials()
+            if not username or not password:
+                self.executor.sessions.abort_login()
+                self.signals.message.emit("<font color=\"red\">[ERROR] Pemanasan cache dibatalkan: username atau password tidak ditemukan di config.ini.</font>")
+                return
+            self.executor.execute_command(LoginCommand(), username, password)
+
+            self.signals.message.emit(f"🔥 Memanaskan cache server untuk {len(names)} report ({self.warmup_workers} paralel)...")
+            warmers = [
+                ReportWorker(self.executor, name, self.reports[name], self.output_dir, self.signals, layout=self.layout)
+                for name in names
+            ]
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.warmup_workers) as executor:
+                outcomes = list(executor.map(self._warm, warmers))
+            warmed = outcomes.count(True)
+            self.signals.message.emit(f"🔥 Pemanasan cache selesai: {warmed}/{len(names)} report dipanaskan.")
+        except Exception as e:
+            self.signals.message.emit(f"<font color=\"red\">[ERROR] Pemanasan cache gagal: {e}</font>")
+        finally:
+            self._save_load_history()
+            self.signals.finished.emit()
+
+    def _warm(self, worker):
+        deadline = self.deadlines.get(worker.name)
+        if deadline is not None and time.time() >= deadline.timestamp():
+            return None
+        try:
+            # Payload harus sama persis dengan run berikutnya (termasuk filter watermark) agar cache key cocok
+            self.executor.execute_command(
+                WarmReportCacheCommand(), worker.name, worker.info["request_url"], worker._build_payload(announce=False)
+            )
+            return True
+        except Exception as e:
+            self.signals.message.emit(f"⚠️ Pemanasan cache '{worker.name}' gagal: {e}")
+            return False
@@ -0,0 +1,101 @@
+from PyQt6.QtCore import QThreadPool, QTimer
+import configparser
+import datetime
+import re
+from gui.model import ReportModel, CONFIG_FILE
+from gui.extractor import ExtractorWorker, WarmupWorker
+from gui.engine import ProcessExtractorWorker, engine_from_config
+from core.commands import CommandExecutor
+from core.scheduler import Scheduler, load_blackouts, SCHEDULER_TICK_MS
+
+class HeadlessRunner:
+    """
+    Menjalankan scheduler dan ekstraksi tanpa jendela (untuk node server / mode cluster).
+    Log dicetak ke stdout sebagai teks biasa.
+    """
+    def __init__(self):
+        self.model = ReportModel()
+        self.threadpool = QThreadPool()
+        self.executor = CommandExecutor()
+        self.is_extracting = False
+        self.is_warming = False
+        self._pending_reports = set()
+
+        config = configparser.ConfigParser(interpolation=None)
+        config.read(CONFIG_FILE)
+        interval_minutes = config.getint("INTERVAL", "interval_minutes", fallback=120)
+        self.scheduler = Scheduler(interval_minutes, load_blackouts(config, self.executor.load_history), history=self.executor.load_history)
+        self.warmup_lead = datetime.timedelta(minutes=config.getint("SCHEDULE", "warmup_minutes", fallback=0))
+        # Crash di engine ekstraksi (proses anak) tidak menghentikan scheduler
+        self.engine = engine_from_config(config)
+
+        self.scheduler_timer = QTimer()
+        self.scheduler_timer.timeout.connect(self.run_due_reports)
+
+    def log(self, message):
+        # Buang tag HTML (<font ...>) yang dipakai untuk log GUI
+        text = re.sub(r"<[^>]+>", "", message)
+        print(f"[{datetime.datetime.now():%Y-%m-%d %H:%M:%S}] {text}", flush=True)
+
+    def start(self):
+        if self.engine is not None:
+            self.engine.prepare()
+        self.scheduler.sync(self.model.get_all_reports())
+        self.log(f"🔄 Mode headless aktif. Ekstraksi berikutnya: {self.scheduler.next_due()}")
+        self.scheduler_timer.start(SCHEDULER_TICK_MS)
+        self.run_due_reports()
+
+    def run_due_reports(self):
+        if self.is_extracting or self.is_warming:
+            return
+
+        # Muat ulang request.json agar perubahan report ikut terjadwal tanpa restart
+        self.model._load_reports()
+        reports = self.model.get_all_reports()
+        self.scheduler.sync(reports)
+        due_names = self.scheduler.pop_due()
+        if not due_names:
+            self._start_warmup(reports)
+            return
+
+        self.log(f"🤖 [AUTO] Memulai ekstraksi otomatis {len(due_names)} report")
+        self.is_extracting = True
+        self._pending_reports = set(due_names)
+        due_reports = {name: reports[name] for name in due_names}
+        slots = {name: self.scheduler.slot_of(name) for name in due_names}
+        if self.engine is not None:
+            worker = ProcessExtractorWorker(self.engine, due_reports, self.model.get_output_dir(), self.executor, slots=slots)
+        else:
+            worker = ExtractorWorker(due_reports, self.model.get_output_dir(), self.executor, slots=slots)
+        worker.signals.message.connect(self.log)
+        worker.signals.report_finished.connect(self._on_report_finished)
+        worker.signals.finished.connect(self._on_extraction_finished)
+        self.threadpool.start(worker)
+
+    def _start_warmup(self, reports):
+        # Panaskan cache server untuk report yang run berikutnya sudah dekat
+        if not self.warmup_lead:
+            return
+        deadlines = self.scheduler.pop_warmup(self.warmup_lead)
+        if not deadlines:
+            return
+        self.is_warming = True
+        worker = WarmupWorker({name: reports[name] for name in deadlines}, self.model.get_output_dir(), self.executor, deadlines)
+        worker.signals.message.connect(self.log)
+        worker.signals.finished.connect(self._on_warmup_finished)
+        self.threadpool.start(worker)
+
+    def _on_warmup_finished(self):
+        self.is_warming = False
+
+    def _on_report_finished(self, name, success):
+        if success:
+            self._pending_reports.discard(name)
+
+    def _on_extraction_finished(self):
+        self.is_extracting = False
+        retry_at = self.executor.breakers.retry_at()
+        if self._pending_reports and retry_at:
+            until = self.scheduler.defer_until_epoch(self._pending_reports, retry_at)
+            self.log(f"🔌 Server tidak sehat (circuit breaker terbuka). {len(self._pending_reports)} report dicoba lagi pada {until:%H:%M:%S}.")
+        self.log(f"✅ Proses ekstraksi selesai. Ekstraksi berikutnya: {self.scheduler.next_due()}")
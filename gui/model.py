@@ -1,11 +1,19 @@
 # gui/model.py
+import hashlib
 import json
 import os
 import configparser
-import copy
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from core.catalog import ReportCatalog
 
 REQUEST_FILE = "request.json"
 CONFIG_FILE = "config.ini"
+CATALOG_FILE = "reports.db"
+
+def _fingerprint(definition):
+    """Hash definisi report, tidak bergantung pada urutan key maupun format file."""
+    canonical = json.dumps(definition, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
 
 class ReportModel:
     def __init__(self):
@@ -39,50 +47,136 @@ class ReportModel:
             self.config.write(f)
 
     def _load_reports(self):
+        if not hasattr(self, "catalog"):
+            self.catalog = ReportCatalog(CATALOG_FILE)
+
+        # request.json dibaca ulang setiap kali file tersebut berubah
+        try:
+            mtime = str(os.path.getmtime(REQUEST_FILE))
+        except FileNotFoundError:
+            return
+        if self.catalog.get_meta("request_json_mtime") == mtime:
+            return
         try:
-            with open(REQUEST_FILE, "r") as f:
-                self.reports = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+            with open(REQUEST_FILE, "r", encoding="utf-8") as f:
+                reports = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
             print(f"[WARNING] Gagal load request.json: {e}")
-            self.reports = {}
+            self.catalog.set_meta("request_json_mtime", mtime)
+            return
 
+        # Hanya report yang baru/berubah di file sejak sinkron terakhir yang diimpor.
+        # Report yang dihapus/di-rename lewat aplikasi tetapi masih sama di file tidak
+        # dimunculkan kembali.
+        synced = json.loads(self.catalog.get_meta("request_json_snapshot", "null") or "null")
+        snapshot = {name: _fingerprint(definition) for name, definition in reports.items()}
+        if synced is None:
+            changed = reports
+        else:
+            changed = {name: reports[name] for name, digest in snapshot.items() if synced.get(name) != digest}
+        count = self.catalog.bulk_import(changed)
+        if count:
+            print(f"[INFO] {count} report diimpor dari request.json ke katalog")
+        self._mark_synced(snapshot, mtime)
 
-    def save_reports(self):
-        with open(REQUEST_FILE, "w") as f:
-            json.dump(self.reports, f, indent=4)
+    def _mark_synced(self, snapshot, mtime):
+        self.catalog.set_meta("request_json_snapshot", json.dumps(snapshot))
+        self.catalog.set_meta("request_json_mtime", mtime)
+
+    def save_reports(self, path=REQUEST_FILE):
+        """Ekspor seluruh katalog ke file JSON (format request.json)."""
+        self.catalog.export_json(path)
+        if path == REQUEST_FILE:
+            # Hasil ekspor sendiri tidak perlu diimpor ulang
+            snapshot = {name: _fingerprint(definition) for name, definition in self.catalog.all().items()}
+            self._mark_synced(snapshot, os.path.getmtime(REQUEST_FILE))
+
+    def import_reports(self, path):
+        """Impor massal definisi report dari file JSON. Mengembalikan jumlah report."""
+        return self.catalog.import_json(path)
 
     def get_report_list(self):
-        return list(self.reports.keys())
+        return self.catalog.names()
 
     def get_report(self, name):
-        return self.reports.get(name, None)
+        return self.catalog.get(name)
 
     def add_report(self, name, request_url, payload):
-        self.reports[name] = {
+        self.catalog.upsert(name, {
             "request_url": request_url,
             "payload": payload
-        }
-        self.save_reports()
+        })
 
     def edit_report(self, old_name, new_name, request_url, payload):
-        if old_name != new_name:
-            self.reports.pop(old_name, None)
-        self.reports[new_name] = {
+        # Pertahankan opsi tambahan report (mis. watermark) yang tidak ada di dialog
+        old_report = self.catalog.get(old_name) or {}
+        self.catalog.rename(old_name, new_name, {
+            **old_report,
             "request_url": request_url,
             "payload": payload
-        }
-        self.save_reports()
+        })
 
     def delete_report(self, name):
-        if name in self.reports:
-            del self.reports[name]
-            self.save_reports()
+        self.catalog.delete(name)
 
     def get_all_reports(self):
-        return copy.deepcopy(self.reports)
+        return self.catalog.all()
     
     def get_output_dir(self):
         return self.output_dir
     
     def get_base_url(self):
-        return self.base_url
\ No newline at end of file
+        return self.base_url
+
+class ReportListModel(QAbstractListModel):
+    """
+    Model Qt untuk daftar nama report. Perubahan dilakukan per baris
+    (insert/remove/rename) sehingga view tidak perlu dibangun ulang.
+    """
+    def __init__(self, names=None, parent=None):
+        super().__init__(parent)
+        self._names = list(names or [])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return self._names[index.row()]
+        return None
+
+    def set_names(self, names):
+        self.beginResetModel()
+        self._names = list(names)
+        self.endResetModel()
+
+    def add_name(self, name):
+        if name in self._names:
+            return
+        row = len(self._names)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._names.append(name)
+        self.endInsertRows()
+
+    def remove_name(self, name):
+        if name not in self._names:
+            return
+        row = self._names.index(name)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self._names.pop(row)
+        self.endRemoveRows()
+
+    def rename(self, old_name, new_name):
+        if old_name == new_name:
+            return
+        # Nama baru yang sudah ada akan ditimpa oleh report hasil edit
+        self.remove_name(new_name)
+        if old_name not in self._names:
+            self.add_name(new_name)
+            return
+        row = self._names.index(old_name)
+        self._names[row] = new_name
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
@@ -1,7 +1,13 @@
 from PyQt6.QtWidgets import *
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QSortFilterProxyModel
 from PyQt6.QtGui import QIcon
 
+def _format_bytes(value):
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -9,10 +15,22 @@ class MainWindow(QMainWindow):
         self.setMinimumSize(800, 650)
         
         # Elements
-        self.list_reports = QListWidget()
+        # Daftar report memakai model/view + proxy filter (cepat untuk ribuan report)
+        self.report_filter_model = QSortFilterProxyModel()
+        self.report_filter_model.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.list_reports = QListView()
+        self.list_reports.setModel(self.report_filter_model)
+        self.list_reports.setUniformItemSizes(True)
+        self.list_reports.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.filter_reports = QLineEdit()
+        self.filter_reports.setPlaceholderText("Cari report...")
+        self.filter_reports.setClearButtonEnabled(True)
+        self.filter_reports.textChanged.connect(self.report_filter_model.setFilterFixedString)
         self.btn_add = QPushButton("Add Link")
         self.btn_edit = QPushButton("Edit Link")
         self.btn_delete = QPushButton("Delete Link")
+        self.btn_import = QPushButton("Import JSON")
+        self.btn_export = QPushButton("Export JSON")
         self.btn_extract = QPushButton("Mulai Ekstraksi")
         self.btn_stop_auto = QPushButton("Stop Auto Interval")
         self.btn_set_output = QPushButton("Pilih Folder Output")
@@ -20,7 +38,17 @@ class MainWindow(QMainWindow):
         self.btn_concurrency_settings = QPushButton("⚙️ Concurrent Settings")
         self.btn_interval_settings = QPushButton("⏰ Interval Settings")
         self.btn_server_settings = QPushButton("⚙️ Waktu Proses Server")
+        self.btn_load_profile = QPushButton("📈 Profil Beban Server")
         self.progress_bar = QProgressBar()
+
+        # Progres per report: bytes diterima, baris ditulis, kecepatan, ETA
+        self.report_progress_table = QTableWidget(0, 5)
+        self.report_progress_table.setHorizontalHeaderLabels(["Report", "Diterima", "Baris", "Kecepatan", "ETA"])
+        self.report_progress_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.report_progress_table.verticalHeader().setVisible(False)
+        self.report_progress_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.report_progress_table.setMaximumHeight(160)
+        self._report_progress_rows = {}
         self.log_box = QTextEdit()
         self.log_box.setReadOnly(True)
         
@@ -44,6 +72,7 @@ class MainWindow(QMainWindow):
         layout.addLayout(status_layout)
         
         layout.addWidget(QLabel("Daftar Link"))
+        layout.addWidget(self.filter_reports)
         layout.addWidget(self.list_reports)
 
         hlayout = QHBoxLayout()
@@ -51,6 +80,8 @@ class MainWindow(QMainWindow):
         hlayout.addWidget(self.btn_add)
         hlayout.addWidget(self.btn_edit)
         hlayout.addWidget(self.btn_delete)
+        hlayout.addWidget(self.btn_import)
+        hlayout.addWidget(self.btn_export)
         layout.addLayout(hlayout)
 
         hlayout2 = QHBoxLayout()
@@ -58,6 +89,7 @@ class MainWindow(QMainWindow):
         hlayout2.addWidget(self.btn_concurrency_settings)
         hlayout2.addWidget(self.btn_interval_settings)
         hlayout2.addWidget(self.btn_server_settings)
+        hlayout2.addWidget(self.btn_load_profile)
         layout.addLayout(hlayout2)
         
         # Extract buttons layout
@@ -67,6 +99,7 @@ class MainWindow(QMainWindow):
         layout.addLayout(extract_layout)
         
         layout.addWidget(self.progress_bar)
+        layout.addWidget(self.report_progress_table)
         layout.addWidget(QLabel("Log"))
         layout.addWidget(self.log_box)
 
@@ -74,6 +107,41 @@ class MainWindow(QMainWindow):
         container.setLayout(layout)
         self.setCentralWidget(container)
 
+    def set_report_model(self, model):
+        self.report_filter_model.setSourceModel(model)
+
+    def selected_report_name(self):
+        indexes = self.list_reports.selectionModel().selectedIndexes()
+        return indexes[0].data() if indexes else None
+
+    def clear_report_progress(self):
+        self.report_progress_table.setRowCount(0)
+        self._report_progress_rows = {}
+
+    def update_report_progress(self, name, info):
+        """Perbarui satu baris tabel progres dari snapshot ProgressTracker."""
+        row = self._report_progress_rows.get(name)
+        if row is None:
+            row = self.report_progress_table.rowCount()
+            self.report_progress_table.insertRow(row)
+            self._report_progress_rows[name] = row
+            self.report_progress_table.setItem(row, 0, QTableWidgetItem(name))
+
+        received = _format_bytes(info["bytes_received"])
+        if info["bytes_total"]:
+            received = f"{received} / {_format_bytes(info['bytes_total'])} ({info['percent']}%)"
+        rows = "" if info["rows_written"] is None else f"{info['rows_written']:,}"
+        speed = f"{_format_bytes(info['throughput'])}/s" if info["bytes_received"] else ""
+        if info["done"]:
+            eta = "✅ Selesai" if info["success"] else "❌ Gagal"
+        elif info["eta_seconds"] is not None:
+            eta = f"{int(info['eta_seconds']) // 60:02d}:{int(info['eta_seconds']) % 60:02d}"
+        else:
+            eta = "-"
+
+        for column, text in enumerate((received, rows, speed, eta), start=1):
+            self.report_progress_table.setItem(row, column, QTableWidgetItem(text))
+
     def update_status(self, status_text, next_run_text=""):
         """Update status labels"""
         if not status_text.strip().startswith("Status:"):
@@ -1,6 +1,8 @@
 import sys
 import os
-import tempfile
+import argparse
+import configparser
+import multiprocessing
 from PyQt6.QtWidgets import QApplication, QMessageBox
 
 if sys.platform == 'win32':
@@ -8,56 +10,140 @@ if sys.platform == 'win32':
 else:
     import fcntl
 
-from gui.view import MainWindow
-from gui.controller import Controller
-
 lock_file_handle = None
 
-def acquire_lock():
+LOCK_FILE_NAME = '.linkdownloader.lock'
+
+def _read_lock_pid(lock_file_path):
+    try:
+        with open(lock_file_path, 'r') as f:
+            return int(f.read().strip() or 0) or None
+    except (IOError, OSError, ValueError):
+        return None
+
+def acquire_lock(profile_dir=None):
     """
     Acquires a lock using a lock file. This is more reliable than a socket,
     especially after being packaged with PyInstaller.
+
+    The lock is scoped to the profile directory (the current directory by
+    default), so independent profiles with their own config.ini/request.json
+    can run side by side. The owner's PID is written into the lock file for
+    the error message only: the OS releases the lock itself when its owner
+    exits, so a lock that cannot be taken is always held by a live process.
     
     Returns:
         bool: True if the lock was acquired, False otherwise.
     """
     global lock_file_handle
     
-    lock_file_path = os.path.join(tempfile.gettempdir(), 'linkdownloader.lock')
+    lock_file_path = os.path.join(profile_dir or os.getcwd(), LOCK_FILE_NAME)
 
     try:
-        lock_file_handle = open(lock_file_path, 'w')
+        # 'a+' so a failed attempt does not truncate the PID of the running owner.
+        # The file is never removed: deleting it while another process holds (or is
+        # about to take) the lock would let two instances lock different files.
+        lock_file_handle = open(lock_file_path, 'a+')
+        lock_file_handle.seek(0)
 
         if sys.platform == 'win32':
             fd = lock_file_handle.fileno()
             msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
         else:
             fcntl.flock(lock_file_handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
-            
+
+        lock_file_handle.seek(0)
+        lock_file_handle.truncate()
+        lock_file_handle.write(str(os.getpid()))
+        lock_file_handle.flush()
         return True
     except (IOError, OSError) as e:
-        print(f"Another instance is already running. Lock could not be acquired: {e}")
         if lock_file_handle:
             lock_file_handle.close()
         lock_file_handle = None
+
+        owner_pid = _read_lock_pid(lock_file_path)
+        print(f"Another instance (PID {owner_pid or 'unknown'}) is already running for this profile. "
+              f"Lock could not be acquired: {e}")
         return False
 
+def use_profile(profile_dir):
+    """
+    Switches to the given profile directory. config.ini, request.json and the
+    relative output/state folders are all resolved from the working directory.
+    """
+    profile_dir = os.path.abspath(profile_dir)
+    os.makedirs(profile_dir, exist_ok=True)
+    os.chdir(profile_dir)
+    return profile_dir
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Metabase/Superset CSV Downloader")
+    parser.add_argument(
+        "--headless", action="store_true",
+        help="Run the scheduler without a window and log to stdout (for server/cluster nodes)."
+    )
+    parser.add_argument(
+        "--profile", metavar="DIR", default=None,
+        help="Profile directory holding config.ini, request.json and the output folder "
+             "(default: current directory). Each profile has its own instance lock."
+    )
+    # Unknown arguments are left for Qt (e.g. -platform)
+    args, _ = parser.parse_known_args(argv[1:])
+    return args
+
+def run_headless():
+    """
+    Runs the scheduler without a GUI. In cluster mode several nodes may run
+    side by side (even on one machine), coordinated by the shared lease directory
+    instead of the single-instance lock.
+    """
+    from PyQt6.QtCore import QCoreApplication
+
+    app = QCoreApplication(sys.argv)
+
+    config = configparser.ConfigParser(interpolation=None)
+    config.read('config.ini')
+    if not config.getboolean("CLUSTER", "enabled", fallback=False) and not acquire_lock():
+        sys.exit(1)
+
+    from gui.headless import HeadlessRunner
+
+    runner = HeadlessRunner()
+    runner.start()
+    sys.exit(app.exec())
+
 def main():
     """
     The main function to start the application.
     """
+    args = parse_args(sys.argv)
+    if args.profile:
+        use_profile(args.profile)
+
+    if args.headless:
+        run_headless()
+        return
+
+    # QApplication must exist before any QMessageBox can be shown
+    app = QApplication(sys.argv)
+
     if not acquire_lock():
         error_dialog = QMessageBox()
         error_dialog.setIcon(QMessageBox.Icon.Critical)
         error_dialog.setText("Application Already Running")
         error_dialog.setInformativeText(
-            "Another instance of the Metabase/Superset CSV Downloader is already running."
+            "Another instance of the Metabase/Superset CSV Downloader is already running "
+            f"for this profile:\n{os.getcwd()}"
         )
         error_dialog.setWindowTitle("Error - Already Running")
         error_dialog.exec()
         sys.exit(1)
 
-    app = QApplication(sys.argv)
+    # The main window, controller and requests are only imported once the
+    # lock is held, so a second instance fails fast without paying for it.
+    from gui.view import MainWindow
+    from gui.controller import Controller
     
     try:
         view = MainWindow()
@@ -74,5 +160,7 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Required for ProcessPoolExecutor in PyInstaller builds on Windows
+    multiprocessing.freeze_support()
     main()
 